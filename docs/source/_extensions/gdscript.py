@@ -9,10 +9,24 @@
     :license: MIT.
 
     modified by Daniel J. Ramirez <djrmuv@gmail.com> based on the original python.py pygment
+
+    As a Sphinx extension, the highlighted code blocks are cached on disk
+    next to the doctrees, keyed by the code, the version of this lexer and
+    the highlighting style, so unchanged blocks are not lexed again by the
+    next builds.  Blocks Sphinx warns about while highlighting them, for
+    example when it falls back to plain text, are not cached, so the warning
+    is given by every build.  Only the `gdscript_highlight_cache_size`
+    most recently used blocks are kept.  Set `gdscript_highlight_cache = False`
+    to disable it.
 """
 
+import hashlib
+import logging
+import os
 import re
+import tempfile
 
+import pygments
 from pygments.lexer import (
     RegexLexer,
     include,
@@ -32,7 +46,11 @@ from pygments.token import (
     Punctuation,
 )
 
-__all__ = ["GDScriptLexer"]
+__all__ = ["GDScriptLexer", "HighlightCache"]
+
+# Changes with the rules of the lexer, which invalidates the cached blocks.
+with open(__file__, "rb") as _source:
+    LEXER_VERSION = hashlib.sha1(_source.read()).hexdigest()[:12]
 
 line_re = re.compile(".*?\n")
 
@@ -340,8 +358,143 @@ class GDScriptLexer(RegexLexer):
     }
 
 
+class HighlightCache:
+    """
+    Highlighted code blocks stored one file per block in `directory`.
+
+    Each file is written to a temporary name and then renamed, so processes
+    building in parallel never read a partial block, and the last of two
+    processes writing the same block simply replaces an identical file.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    @staticmethod
+    def make_key(source, *parameters):
+        digest = hashlib.sha256(source.encode("utf-8"))
+        for parameter in (LEXER_VERSION, pygments.__version__) + parameters:
+            digest.update(b"\0" + str(parameter).encode("utf-8"))
+        return digest.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], key[2:])
+
+    def get(self, key):
+        path = self.path(key)
+        try:
+            with open(path, encoding="utf-8") as cached:
+                highlighted = cached.read()
+            # The modification time records the last use, see prune.
+            os.utime(path)
+            return highlighted
+        except OSError:
+            return None
+
+    def put(self, key, highlighted):
+        path = self.path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(descriptor, "w", encoding="utf-8") as output:
+                output.write(highlighted)
+            os.replace(temporary, path)
+        except OSError:
+            pass
+
+    def prune(self, max_entries):
+        """Removes the least recently used blocks beyond the first `max_entries`."""
+        entries = []
+        try:
+            for group in os.scandir(self.directory):
+                if group.is_dir():
+                    entries.extend(
+                        (entry.stat().st_mtime, entry.path) for entry in os.scandir(group.path)
+                    )
+        except OSError:
+            return
+        entries.sort(reverse=True)
+        for _, path in entries[max_entries:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+# The logger of sphinx.highlighting, which warns when a block does not lex.
+HIGHLIGHT_LOGGER = logging.getLogger("sphinx.sphinx.highlighting")
+
+
+class WarningRecorder(logging.Filter):
+    """Records whether a warning was logged while it is attached to a logger."""
+
+    def __init__(self):
+        super().__init__()
+        self.warned = False
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            self.warned = True
+        return True
+
+
+def style_name(highlighter):
+    style = highlighter.formatter_args.get("style")
+    return getattr(style, "__module__", "") + "." + getattr(style, "__qualname__", str(style))
+
+
+def cache_highlighter(highlighter, cache):
+    """Wraps `highlight_block` of a Sphinx PygmentsBridge to go through `cache` for GDScript."""
+    highlight_block = highlighter.highlight_block
+
+    def cached_highlight_block(source, lang, opts=None, force=False, location=None, **kwargs):
+        if lang not in GDScriptLexer.aliases or opts:
+            return highlight_block(source, lang, opts, force, location, **kwargs)
+        key = cache.make_key(
+            source, lang, highlighter.dest, style_name(highlighter), force, sorted(kwargs.items())
+        )
+        highlighted = cache.get(key)
+        if highlighted is None:
+            recorder = WarningRecorder()
+            HIGHLIGHT_LOGGER.addFilter(recorder)
+            try:
+                highlighted = highlight_block(source, lang, opts, force, location, **kwargs)
+            finally:
+                HIGHLIGHT_LOGGER.removeFilter(recorder)
+            # Leave out the blocks Sphinx warned about, such as a fallback to
+            # plain text, so the warning is given again by the next builds.
+            if not recorder.warned:
+                cache.put(key, highlighted)
+        return highlighted
+
+    highlighter.highlight_block = cached_highlight_block
+
+
+def get_cache_directory(app):
+    return os.path.join(app.doctreedir, "gdscript-highlight")
+
+
+def init_highlight_cache(app):
+    if not app.config.gdscript_highlight_cache:
+        return
+    cache = HighlightCache(get_cache_directory(app))
+    for attribute in ("highlighter", "dark_highlighter"):
+        highlighter = getattr(app.builder, attribute, None)
+        if highlighter is not None:
+            cache_highlighter(highlighter, cache)
+
+
+def prune_highlight_cache(app, exception):
+    if exception is None and app.config.gdscript_highlight_cache:
+        HighlightCache(get_cache_directory(app)).prune(app.config.gdscript_highlight_cache_size)
+
+
 def setup(sphinx):
     sphinx.add_lexer("gdscript", GDScriptLexer())
+    sphinx.add_config_value("gdscript_highlight_cache", True, "")
+    sphinx.add_config_value("gdscript_highlight_cache_size", 20000, "")
+    sphinx.connect("builder-inited", init_highlight_cache)
+    sphinx.connect("build-finished", prune_highlight_cache)
 
     return {
         "parallel_read_safe": True,
@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+"""
+    gdscript_domain
+    ~~~~~~~~~~~~~~~
+
+    Sphinx domain for the API reference of GDScript projects, used by the
+    pages gdscript2rest writes with --sphinx-domain.
+
+    Directives:
+
+        .. gdscript:class:: Player
+        .. gdscript:method:: Player.jump(height: float = 2) -> void
+        .. gdscript:property:: Player.health
+           :type: int
+        .. gdscript:signal:: Player.hit(damage, source)
+        .. gdscript:enum:: Player.State
+        .. gdscript:constant:: Player.SPEED
+           :type: float
+           :value: 200
+
+    Roles: :gdscript:class:, :gdscript:meth:, :gdscript:prop:,
+    :gdscript:signal:, :gdscript:enum: and :gdscript:const:.  A target
+    without a class is looked up in the class of the current page first.
+
+    `gdscript:class` only marks the current class and its position on the
+    page, the class heading is written by the page itself.
+
+    Objects are kept in a dictionary keyed by their full name, so each lookup
+    is a single hash access whatever the size of the project.  The objects
+    read by parallel processes are merged by document, and are written to
+    objects.inv for intersphinx.
+"""
+
+import re
+
+from docutils import nodes
+from docutils.parsers.rst import directives
+from sphinx import addnodes
+from sphinx.directives import ObjectDescription
+from sphinx.domains import Domain, ObjType
+from sphinx.roles import XRefRole
+from sphinx.util import logging
+from sphinx.util.docutils import SphinxDirective
+from sphinx.util.nodes import make_id, make_refnode
+
+logger = logging.getLogger(__name__)
+
+# Matches Owner.name(arguments) -> type, the owner, arguments and type being optional.
+SIGNATURE_PATTERN = re.compile(
+    r"^\s*(?:(?P<owner>[\w.]+)\.)?(?P<name>\w+)\s*"
+    r"(?:\((?P<arguments>.*)\))?\s*(?:->\s*(?P<returns>.+?))?\s*$"
+)
+
+# Types that are not linked.
+UNLINKED_TYPES = ("var", "void", "null", "")
+
+
+class GDScriptObject(ObjectDescription):
+    """Describes a method, property, signal, enum or constant of a class."""
+
+    option_spec = {
+        "noindex": directives.flag,
+        "static": directives.flag,
+        "virtual": directives.flag,
+        "type": directives.unchanged,
+        "value": directives.unchanged,
+    }
+
+    def handle_signature(self, sig, signode):
+        match = SIGNATURE_PATTERN.match(sig)
+        if match is None:
+            raise ValueError("invalid GDScript signature: " + sig)
+        owner = match.group("owner") or self.env.ref_context.get("gdscript:class", "")
+        name = match.group("name")
+
+        prefix = self.objtype
+        for qualifier in ("static", "virtual"):
+            if qualifier in self.options:
+                prefix = qualifier + " " + prefix
+        signode += addnodes.desc_annotation(prefix + " ", prefix + " ")
+        if match.group("owner"):
+            signode += addnodes.desc_addname(owner + ".", owner + ".")
+        signode += addnodes.desc_name(name, name)
+
+        if match.group("arguments") is not None:
+            parameters = addnodes.desc_parameterlist()
+            for argument in split_arguments(match.group("arguments")):
+                parameter = addnodes.desc_parameter()
+                argument_name, _, rest = argument.partition(":")
+                parameter += nodes.Text(argument_name.strip())
+                if rest:
+                    type_name, equals, default = rest.partition("=")
+                    parameter += nodes.Text(": ")
+                    parameter += self.make_type(type_name.strip())
+                    if equals:
+                        parameter += nodes.Text(" = " + default.strip())
+                parameters += parameter
+            signode += parameters
+        if match.group("returns"):
+            returns = addnodes.desc_returns()
+            returns += self.make_type(match.group("returns"))
+            signode += returns
+        if self.options.get("type"):
+            signode += nodes.Text(": ")
+            signode += self.make_type(self.options["type"])
+        if self.options.get("value"):
+            value = " = " + self.options["value"]
+            signode += addnodes.desc_annotation(value, value)
+        return owner + "." + name if owner else name
+
+    def make_type(self, type_name):
+        if type_name in UNLINKED_TYPES:
+            return nodes.Text(type_name)
+        reference = addnodes.pending_xref(
+            "", refdomain="gdscript", reftype="class", reftarget=type_name, refwarn=False
+        )
+        reference["gdscript:class"] = self.env.ref_context.get("gdscript:class")
+        reference["gdscript:godot"] = True
+        reference += nodes.Text(type_name)
+        return reference
+
+    def add_target_and_index(self, name, sig, signode):
+        node_id = make_id(self.env, self.state.document, "gdscript-" + self.objtype, name)
+        signode["ids"].append(node_id)
+        self.state.document.note_explicit_target(signode)
+        self.env.get_domain("gdscript").note_object(name, self.objtype, node_id, location=signode)
+        owner, _, short_name = name.rpartition(".")
+        text = "{} ({} of {})".format(short_name, self.objtype, owner) if owner else name
+        self.indexnode["entries"].append(("single", text, node_id, "", None))
+
+
+class GDScriptClass(SphinxDirective):
+    """Marks the current class and registers it, without output of its own."""
+
+    required_arguments = 1
+    option_spec = {"noindex": directives.flag}
+
+    def run(self):
+        name = self.arguments[0].strip()
+        self.env.ref_context["gdscript:class"] = name
+        if "noindex" in self.options:
+            return []
+        node_id = make_id(self.env, self.state.document, "gdscript-class", name)
+        target = nodes.target("", "", ids=[node_id], ismod=True)
+        self.set_source_info(target)
+        self.state.document.note_explicit_target(target)
+        self.env.get_domain("gdscript").note_object(name, "class", node_id, location=target)
+        index = addnodes.index(entries=[("single", name + " (class)", node_id, "", None)])
+        return [target, index]
+
+
+class GDScriptXRefRole(XRefRole):
+    def process_link(self, env, refnode, has_explicit_title, title, target):
+        refnode["gdscript:class"] = env.ref_context.get("gdscript:class")
+        return title, target
+
+
+class GDScriptDomain(Domain):
+    """GDScript language domain."""
+
+    name = "gdscript"
+    label = "GDScript"
+    object_types = {
+        "class": ObjType("class", "class"),
+        "method": ObjType("method", "meth"),
+        "property": ObjType("property", "prop"),
+        "signal": ObjType("signal", "signal"),
+        "enum": ObjType("enum", "enum"),
+        "constant": ObjType("constant", "const"),
+    }
+    directives = {
+        "class": GDScriptClass,
+        "method": GDScriptObject,
+        "property": GDScriptObject,
+        "signal": GDScriptObject,
+        "enum": GDScriptObject,
+        "constant": GDScriptObject,
+    }
+    roles = {
+        "class": GDScriptXRefRole(),
+        "meth": GDScriptXRefRole(),
+        "prop": GDScriptXRefRole(),
+        "signal": GDScriptXRefRole(),
+        "enum": GDScriptXRefRole(),
+        "const": GDScriptXRefRole(),
+    }
+    initial_data = {
+        # full name -> (docname, node id, object type)
+        "objects": {},
+        # name of an inner class -> its full name, Outer.Inner
+        "short_names": {},
+    }
+    data_version = 1
+
+    @property
+    def objects(self):
+        return self.data.setdefault("objects", {})
+
+    @property
+    def short_names(self):
+        return self.data.setdefault("short_names", {})
+
+    def note_object(self, name, objtype, node_id, location=None):
+        if name in self.objects:
+            docname = self.objects[name][0]
+            logger.warning(
+                "duplicate GDScript object description of %s, other instance in %s",
+                name,
+                docname,
+                location=location,
+            )
+        self.objects[name] = (self.env.docname, node_id, objtype)
+        if objtype == "class" and "." in name:
+            self.short_names.setdefault(name.rpartition(".")[2], name)
+
+    def clear_doc(self, docname):
+        for name, (object_docname, _, _) in list(self.objects.items()):
+            if object_docname == docname:
+                del self.objects[name]
+        for short_name, name in list(self.short_names.items()):
+            if name not in self.objects:
+                del self.short_names[short_name]
+
+    def merge_domaindata(self, docnames, otherdata):
+        for name, entry in otherdata["objects"].items():
+            if entry[0] in docnames:
+                self.objects[name] = entry
+        for short_name, name in otherdata["short_names"].items():
+            if name in self.objects:
+                self.short_names.setdefault(short_name, name)
+
+    def find_object(self, owner, target, objtypes):
+        """
+        Returns the full name of the object `target` refers to from the class
+        `owner`, or None.  Looks up the target as written, then in the owner,
+        then as the name of an inner class.
+        """
+        candidates = [target]
+        if owner and "." not in target:
+            candidates.append(owner + "." + target)
+        if target in self.short_names:
+            candidates.append(self.short_names[target])
+        for name in candidates:
+            entry = self.objects.get(name)
+            if entry is not None and (objtypes is None or entry[2] in objtypes):
+                return name
+        return None
+
+    def resolve_xref(self, env, fromdocname, builder, typ, target, node, contnode):
+        name = self.find_object(node.get("gdscript:class"), target, self.objtypes_for_role(typ))
+        if name is None:
+            if typ == "class" and node.get("gdscript:godot"):
+                return self.make_godot_link(env, target, contnode)
+            return None
+        docname, node_id, _ = self.objects[name]
+        return make_refnode(builder, fromdocname, docname, node_id, contnode, name)
+
+    def resolve_any_xref(self, env, fromdocname, builder, target, node, contnode):
+        name = self.find_object(node.get("gdscript:class"), target, None)
+        if name is None:
+            return []
+        docname, node_id, objtype = self.objects[name]
+        return [
+            (
+                "gdscript:" + self.role_for_objtype(objtype),
+                make_refnode(builder, fromdocname, docname, node_id, contnode, name),
+            )
+        ]
+
+    def make_godot_link(self, env, target, contnode):
+        """Links a type of a signature that is not a class of the project to the Godot documentation."""
+        extlink = (env.config.extlinks or {}).get("godot_class")
+        if not extlink:
+            return None
+        return nodes.reference(
+            "", "", contnode, internal=False, refuri=extlink[0] % target.lower()
+        )
+
+    def get_objects(self):
+        for name, (docname, node_id, objtype) in self.objects.items():
+            yield name, name, objtype, docname, node_id, 1
+
+
+def split_arguments(text):
+    """Splits the arguments of a signature on the commas outside of brackets."""
+    arguments = []
+    depth = 0
+    start = 0
+    for index, character in enumerate(text):
+        if character in "([{":
+            depth += 1
+        elif character in ")]}":
+            depth -= 1
+        elif character == "," and depth == 0:
+            arguments.append(text[start:index])
+            start = index + 1
+    arguments.append(text[start:])
+    return [argument.strip() for argument in arguments if argument.strip()]
+
+
+def setup(app):
+    app.add_domain(GDScriptDomain)
+
+    return {
+        "version": "1",
+        "env_version": 1,
+        "parallel_read_safe": True,
+        "parallel_write_safe": True,
+    }
@@ -0,0 +1,449 @@
+# -*- coding: utf-8 -*-
+"""
+    gdscript_reference
+    ~~~~~~~~~~~~~~~~~~
+
+    Sphinx extension rendering the API reference of a Godot project straight
+    from the reference.json written by the Godot collector, without writing
+    the .rst files of gdscript2rest and parsing them again:
+
+        .. gdscript-reference:: ../reference.json
+           :classes: Player Enemy
+
+    The path is relative to the document and may also be a newline-delimited
+    JSON file or a shard directory.  Without :classes:, every class of the
+    reference is rendered on the page.
+
+    The pages have the layout of the files gdscript2rest writes, but their
+    sections, tables, lists and links are built as docutils nodes from the
+    GDScriptClasses objects.  Only the descriptions, which are reStructuredText
+    written by the authors of the scripts, are parsed.
+
+    The classes are loaded once per build and kept in the build environment
+    between incremental builds, keyed by the modification time and size of
+    the reference files.  When a file changes only its classes whose data
+    changed are built again, and the documents using it are read again.
+"""
+
+import os
+
+from docutils import nodes
+from docutils.parsers.rst import Directive, directives
+from docutils.statemachine import StringList
+from sphinx import addnodes
+from sphinx.errors import ExtensionError
+
+from gdscript2rest.src import make_restructured
+from gdscript2rest.src.gdscript_objects import GDScriptClasses
+from gdscript2rest.src.godot_api import DEFAULT_GODOT_VERSION, GodotAPI
+from gdscript2rest.src.json_stream import get_reference_files, get_stamp
+from gdscript2rest.src.make_restructured import (ReferenceResolver,
+                                                 make_class_label,
+                                                 set_godot_api)
+from gdscript2rest.src.merge import load_reference
+
+# Resolvers of the references in descriptions, by reference path, built once
+# per process as they only depend on the classes.
+_resolvers = {}
+
+
+class CachedReference:
+    def __init__(self, stamps, reference):
+        """
+        The classes of a reference file kept in the build environment.
+
+        Keyword Arguments:
+        stamps: tuple                -- the modification time and size of each
+                                        file of the reference
+        reference: LoadedReference   -- the classes loaded from it
+        """
+        self.stamps = stamps
+        self.reference = reference
+        self.classes = GDScriptClasses(reference.classes)
+
+
+def get_reference(env, path):
+    """
+    Returns the CachedReference of the reference file at `path`, loading it
+    again if it changed since the environment was saved.
+    """
+    references = env.gdscript_references
+    files = get_reference_files(path)
+    stamps = tuple(get_stamp(file_path) for file_path in files)
+    cached = references.get(path)
+    if cached is None or cached.stamps != stamps:
+        try:
+            reference = load_reference(
+                path, previous=cached.reference if cached is not None else None
+            )
+        except (OSError, ValueError, KeyError) as error:
+            raise ExtensionError("Could not load {}: {}".format(path, error))
+        cached = references[path] = CachedReference(stamps, reference)
+    for file_path in files:
+        env.note_dependency(file_path)
+    return cached
+
+
+def get_resolver(path, cached):
+    resolver_stamps, resolver = _resolvers.get(path, (None, None))
+    if resolver_stamps != cached.stamps:
+        resolver = ReferenceResolver(cached.classes)
+        _resolvers[path] = (cached.stamps, resolver)
+    return resolver
+
+
+class GDScriptReference(Directive):
+    required_arguments = 1
+    has_content = False
+    option_spec = {"classes": directives.unchanged}
+
+    def run(self):
+        env = self.state.document.settings.env
+        _, path = env.relfn2path(self.arguments[0], env.docname)
+        path = os.path.normpath(path)
+        cached = get_reference(env, path)
+        names = (self.options.get("classes") or "").split()
+        classes = cached.classes
+        if names:
+            missing = [name for name in names if classes.get_class(name) is None]
+            if missing:
+                raise self.error("Classes not found in the reference: " + ", ".join(missing))
+            selected = [classes.get_class(name) for name in names]
+        else:
+            selected = list(classes)
+
+        builder = ClassNodeBuilder(self, classes, get_resolver(path, cached), env.config)
+        result = []
+        for gdscript in selected:
+            result.extend(builder.make_class(gdscript))
+        return result
+
+
+class ClassNodeBuilder:
+    def __init__(self, directive, classes, resolver, config):
+        """
+        Builds the docutils nodes of the class pages.
+
+        Keyword Arguments:
+        directive: Directive         -- the directive the nodes are built for,
+                                        which parses the descriptions
+        classes: GDScriptClasses     -- every class of the reference
+        resolver: ReferenceResolver  -- resolves the references in descriptions
+        config: Config               -- the Sphinx configuration
+        """
+        self.directive = directive
+        self.document = directive.state.document
+        self.classes = classes
+        self.resolver = resolver
+        extlink = config.extlinks.get("godot_class") if config.extlinks else None
+        self.godot_url = extlink[0] if extlink else ""
+
+    def make_class(self, gdscript):
+        """Returns the section of a class page, with its inner classes."""
+        title = gdscript.name
+        if "abstract" in gdscript.metadata.tags:
+            title += " (abstract)"
+        section = self.make_section(title, "class_" + gdscript.name)
+
+        if gdscript.extends:
+            paragraph = nodes.paragraph()
+            paragraph += nodes.strong("Extends:", "Extends:")
+            paragraph += nodes.Text(" ")
+            for index, name in enumerate(gdscript.get_extends_tree(self.classes)):
+                if index:
+                    paragraph += nodes.Text(" < ")
+                paragraph += self.make_type(name)
+            section += paragraph
+            description = self.make_description(gdscript.description, gdscript.name)
+            if description:
+                section += self.make_section("Description", "", description)
+
+        section.extend(self.make_class_sections(gdscript, gdscript.name))
+        if gdscript.sub_classes:
+            sub_classes = self.make_section("Sub-classes", "")
+            for sub_class in gdscript.sub_classes:
+                inner = self.make_section(
+                    sub_class.name, make_class_label(gdscript.name + "." + sub_class.name)
+                )
+                inner.extend(self.make_class_sections(sub_class, sub_class.name))
+                sub_classes += inner
+            section += sub_classes
+        return [section]
+
+    def make_class_sections(self, gdscript, class_name):
+        sections = []
+        for attribute, title, make_content in [
+            ("members", "Properties", self.make_property_table),
+            ("functions", "Methods", self.make_method_table),
+            ("signals", "Signals", self.make_signals),
+            ("enums", "Enumerations", self.make_enums),
+            ("constants", "Constants", self.make_constants),
+            ("members", "Property Descriptions", self.make_members),
+            ("functions", "Method Descriptions", self.make_functions),
+        ]:
+            elements = getattr(gdscript, attribute)
+            if elements:
+                sections.append(
+                    self.make_section(title, "", make_content(elements, class_name))
+                )
+        return sections
+
+    def make_property_table(self, members, class_name):
+        rows = []
+        for member in members:
+            rows.append(
+                [
+                    [nodes.strong("export", "export")] if member.is_exported else [],
+                    [self.make_ref(member.name.lower(), "class_{}_property_{}".format(class_name, member.name))],
+                    [self.make_type(member.type)],
+                    [nodes.literal("", str(member.default_value))] if member.default_value else [],
+                ]
+            )
+        return [make_table(rows)]
+
+    def make_method_table(self, functions, class_name):
+        rows = []
+        for function in functions:
+            call = [
+                self.make_ref(function.name, "class_{}_method_{}".format(class_name, function.name)),
+                nodes.Text(" "),
+                nodes.strong("(", "("),
+                nodes.Text(" "),
+            ]
+            call.extend(self.make_arguments(function.arguments))
+            call += [nodes.Text(" "), nodes.strong(")", ")")]
+            rows.append([call, [self.make_type(function.return_type)]])
+        return [make_table(rows)]
+
+    def make_members(self, members, class_name):
+        content = []
+        for member in members:
+            content.append(self.make_target("class_{}_property_{}".format(class_name, member.name)))
+            content.append(
+                make_bullet(
+                    [nodes.strong(member.name, member.name), nodes.Text(" : "), self.make_type(member.type)]
+                )
+            )
+            rows = []
+            if member.default_value is not None:
+                rows.append(
+                    [
+                        [nodes.emphasis("Default", "Default")],
+                        [nodes.literal("", str(member.default_value))]
+                        if member.default_value != ""
+                        else [nodes.emphasis("", "member has no default setting")],
+                    ]
+                )
+            if member.setter:
+                rows.append([[nodes.emphasis("Setter", "Setter")], [nodes.Text(member.setter + "(val)")]])
+            if member.getter:
+                rows.append([[nodes.emphasis("Getter", "Getter")], [nodes.Text(member.getter + "()")]])
+            if rows:
+                content.append(make_table(rows))
+            content.extend(self.make_description(member.description, class_name))
+            content.append(nodes.transition())
+        content.pop()
+        return content
+
+    def make_functions(self, functions, class_name):
+        content = []
+        for function in functions:
+            content.append(self.make_target("class_{}_method_{}".format(class_name, function.name)))
+            line = [
+                nodes.Text(function.kind.name + " "),
+                nodes.strong(function.name + "(", function.name + "("),
+                nodes.Text(" "),
+            ]
+            line.extend(self.make_arguments(function.arguments))
+            line += [nodes.Text(" "), nodes.strong(")", ")")]
+            if function.return_type:
+                line += [nodes.Text(" -> "), self.make_type(function.return_type)]
+            content.append(make_bullet(line))
+            content.extend(self.make_description(function.description, class_name))
+            content.append(nodes.transition())
+        content.pop()
+        return content
+
+    def make_signals(self, signals, class_name):
+        content = []
+        for signal in signals:
+            content.append(self.make_target("class_{}_signal_{}".format(class_name, signal.name)))
+            paragraph = nodes.paragraph()
+            paragraph += nodes.strong(signal.name, signal.name)
+            paragraph += nodes.Text(" ")
+            paragraph += nodes.strong("(", "(")
+            paragraph += nodes.Text(" {} ".format(", ".join(signal.arguments)))
+            paragraph += nodes.strong(")", ")")
+            content.append(paragraph)
+            content.extend(self.make_description(signal.description, class_name))
+            content.append(nodes.transition())
+        content.pop()
+        return content
+
+    def make_enums(self, enums, class_name):
+        content = []
+        for enum in enums:
+            content.append(self.make_target("enum_{}_{}".format(class_name, enum.name)))
+            for value in enum.values:
+                content.append(self.make_target("class_{}_constant_{}".format(class_name, value)))
+            paragraph = nodes.paragraph()
+            paragraph += nodes.Text("enum ")
+            paragraph += nodes.strong(enum.name, enum.name)
+            paragraph += nodes.Text(" :")
+            content.append(paragraph)
+            items = nodes.bullet_list()
+            for name, value in enum.values.items():
+                item = nodes.paragraph()
+                item += nodes.strong(name, name)
+                item += nodes.Text(" = ")
+                item += nodes.strong(str(value), str(value))
+                items += nodes.list_item("", item)
+            content.append(items)
+            content.extend(self.make_description(enum.description, class_name))
+            content.append(nodes.transition())
+        content.pop()
+        return content
+
+    def make_constants(self, constants, class_name):
+        content = [
+            self.make_target("class_{}_constant_{}".format(class_name, constant.name))
+            for constant in constants
+        ]
+        items = nodes.bullet_list()
+        for constant in constants:
+            item = nodes.paragraph()
+            item += nodes.strong(constant.name, constant.name)
+            item += nodes.Text(" :{} = ".format(constant.type))
+            item += nodes.strong(str(constant.default_value), str(constant.default_value))
+            item += nodes.Text(" --- ")
+            description = self.make_description(constant.description.replace("\n", ""), class_name)
+            list_item = nodes.list_item("", item)
+            if description and isinstance(description[0], nodes.paragraph):
+                item.extend(description.pop(0).children)
+            list_item.extend(description)
+            items += list_item
+        content.append(items)
+        return content
+
+    def make_arguments(self, arguments):
+        result = []
+        for index, argument in enumerate(arguments):
+            if index:
+                result.append(nodes.Text(", "))
+            result.append(nodes.Text(argument.name + ": "))
+            result.append(self.make_type(argument.type))
+            if argument.default != "":
+                result.append(nodes.Text(" = {}".format(argument.default)))
+        return result
+
+    def make_type(self, name):
+        """Returns a link to the page of a type, like make_restructured.make_link."""
+        if name in ("var", "void", "null"):
+            return nodes.Text(name)
+        if name.lower() in make_restructured.api_ref:
+            if not self.godot_url:
+                return nodes.literal(name, name)
+            return nodes.reference(name, name, refuri=self.godot_url % name.lower(), internal=False)
+        return self.make_ref(name, make_class_label(name))
+
+    def make_ref(self, text, label):
+        """Returns a reference to a label, like the :ref: role with an explicit title."""
+        reference = addnodes.pending_xref(
+            "",
+            refdomain="std",
+            reftype="ref",
+            reftarget=label.lower(),
+            refexplicit=True,
+            refwarn=True,
+            refdoc=self.document.settings.env.docname,
+        )
+        reference += nodes.inline(text, text, classes=["xref", "std", "std-ref"])
+        return reference
+
+    def make_target(self, label):
+        target = nodes.target("", "", names=[nodes.fully_normalize_name(label)])
+        self.document.note_explicit_target(target)
+        return target
+
+    def make_section(self, title, label, content=()):
+        section = nodes.section()
+        if label:
+            section["names"].append(nodes.fully_normalize_name(label))
+            self.document.note_explicit_target(section)
+        else:
+            section["names"].append(nodes.fully_normalize_name(title))
+            self.document.note_implicit_target(section)
+        section += nodes.title(title, title)
+        section.extend(content)
+        return section
+
+    def make_description(self, description, class_name):
+        """Parses the reStructuredText of a description, after resolving its references."""
+        text = self.resolver.resolve(description, class_name)
+        if not text.strip():
+            return []
+        container = nodes.Element()
+        self.directive.state.nested_parse(
+            StringList(text.split("\n"), self.directive.state.document.current_source),
+            self.directive.content_offset,
+            container,
+        )
+        return container.children
+
+
+def make_bullet(inline_nodes):
+    paragraph = nodes.paragraph()
+    paragraph.extend(inline_nodes)
+    return nodes.bullet_list("", nodes.list_item("", paragraph))
+
+
+def make_table(rows):
+    """Returns a table with one row per list of cells, each cell a list of inline nodes."""
+    columns = max(len(row) for row in rows)
+    table = nodes.table()
+    group = nodes.tgroup(cols=columns)
+    table += group
+    for _ in range(columns):
+        group += nodes.colspec(colwidth=1)
+    body = nodes.tbody()
+    group += body
+    for cells in rows:
+        row = nodes.row()
+        for cell in cells:
+            entry = nodes.entry()
+            if cell:
+                paragraph = nodes.paragraph()
+                paragraph.extend(cell)
+                entry += paragraph
+            row += entry
+        body += row
+    return table
+
+
+def init_environment(app, env, docnames):
+    if not hasattr(env, "gdscript_references"):
+        env.gdscript_references = {}
+
+
+def merge_info(app, env, docnames, other):
+    """Keeps the references loaded while reading documents in parallel processes."""
+    env.gdscript_references.update(getattr(other, "gdscript_references", {}))
+
+
+def set_api(app):
+    set_godot_api(GodotAPI.for_version(app.config.gdscript_reference_godot_version))
+
+
+def setup(app):
+    app.add_config_value("gdscript_reference_godot_version", DEFAULT_GODOT_VERSION, "env")
+    app.add_directive("gdscript-reference", GDScriptReference)
+    app.connect("builder-inited", set_api)
+    app.connect("env-before-read-docs", init_environment)
+    app.connect("env-merge-info", merge_info)
+
+    return {
+        "version": "1",
+        "env_version": 1,
+        "parallel_read_safe": True,
+        "parallel_write_safe": True,
+    }
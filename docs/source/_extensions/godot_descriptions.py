@@ -11,12 +11,18 @@
 
     based on the work of Takayuki Shimizukawa on OpenGraph support for Sphinx,
     see: https://github.com/sphinx-contrib/ogp
+
+    The description of a page is made each time the page is read, from the
+    start of its doctree only, and kept in the build environment.  Pages that
+    are written again without being read again reuse it.
 """
 
 import re
 from docutils import nodes
 from sphinx import addnodes
 
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
 
 class DescriptionGenerator:
     def __init__(self, document, pagename="", n_sections_max=3, max_length=220):
@@ -36,7 +42,8 @@ class DescriptionGenerator:
             or self.current_length > self.max_length
             or self.n_sections > self.n_sections_max
         ):
-            return
+            # Enough text was collected, skip the rest of the document
+            raise nodes.StopTraversal
 
         if isinstance(node, addnodes.compact_paragraph) and node.get("toctree"):
             raise nodes.SkipChildren
@@ -72,16 +79,11 @@ class DescriptionGenerator:
         pass
 
     def format_description(self, desc):
-        # Replace newlines with spaces
-        desc = re.sub("\r|\n", " ", desc)
-
-        # Replace multiple spaces with single spaces
-        desc = re.sub("\\s+", " ", desc)
+        # Replace newlines and runs of spaces with single spaces
+        desc = WHITESPACE_PATTERN.sub(" ", desc)
 
         # Escape double quotes for HTML
-        desc = re.sub('"', "&quot;", desc)
-
-        return desc
+        return desc.replace('"', "&quot;")
 
     def create_description(self, cutoff_suffix="..."):
         text = " ".join(self.text_list)
@@ -95,26 +97,62 @@ class DescriptionGenerator:
         return text
 
 
+def make_description(doctree, pagename):
+    generator = DescriptionGenerator(doctree, pagename)
+    doctree.walkabout(generator)
+    return generator.create_description()
+
+
+def init_descriptions(app, env, docnames):
+    if not hasattr(env, "godot_descriptions"):
+        env.godot_descriptions = {}
+
+
+def read_description(app, doctree):
+    """
+    Makes the description of a page that was read.  A page is also read again
+    when a page it depends on changed, so the description is always made anew.
+    """
+    env = app.env
+    env.godot_descriptions[env.docname] = make_description(doctree, env.docname)
+
+
+def merge_descriptions(app, env, docnames, other):
+    for docname in docnames:
+        if docname in other.godot_descriptions:
+            env.godot_descriptions[docname] = other.godot_descriptions[docname]
+
+
+def remove_descriptions(app, env):
+    for docname in list(env.godot_descriptions):
+        if docname not in env.all_docs:
+            del env.godot_descriptions[docname]
+
+
 def generate_description(app, pagename, templatename, context, doctree):
     if not doctree:
         return
 
-    generator = DescriptionGenerator(doctree, pagename)
-    doctree.walkabout(generator)
-
-    description = (
-        '<meta name="description" content="' + generator.create_description() + '">\n'
-    )
+    description = getattr(app.env, "godot_descriptions", {}).get(pagename)
+    if description is None:
+        description = make_description(doctree, pagename)
 
-    context["metatags"] += description
+    context["metatags"] += '<meta name="description" content="' + description + '">\n'
 
 
 def setup(app):
-    # Hook into Sphinx for all pages to
-    # generate meta description tag and add to meta tag list
+    # Make the description of each page when it is read, and add it to the
+    # meta tag list of the page when it is written
+    app.connect("env-before-read-docs", init_descriptions)
+    app.connect("doctree-read", read_description)
+    app.connect("env-merge-info", merge_descriptions)
+    app.connect("env-updated", remove_descriptions)
     app.connect("html-page-context", generate_description)
 
     return {
+        # Versions the env.godot_descriptions data, so Sphinx reads every page
+        # again instead of reusing an environment pickled without it.
+        "env_version": 1,
         "parallel_read_safe": True,
         "parallel_write_safe": True,
     }
\ No newline at end of file
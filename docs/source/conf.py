@@ -41,6 +41,8 @@ exclude_patterns = ['_build', 'Thumbs.db', '.DS_Store']
 needs_sphinx = '3.0'
 
 sys.path.append(os.path.abspath("_extensions"))
+# gdscript2rest itself, for the gdscript_reference extension
+sys.path.append(os.path.abspath("../../gdscript-rest-maker/src"))
 
 extensions = [
     'sphinx_tabs.tabs',
@@ -94,6 +96,12 @@ if not os.getenv("SPHINX_NO_GDSCRIPT"):
 # if not os.getenv("SPHINX_NO_SEARCH"):
 #     extensions.append("sphinx_search.extension")
 
+if not os.getenv("SPHINX_NO_GDSCRIPT_DOMAIN"):
+    extensions.append("gdscript_domain")
+
+if not os.getenv("SPHINX_NO_GDSCRIPT_REFERENCE"):
+    extensions.append("gdscript_reference")
+
 if not os.getenv("SPHINX_NO_DESCRIPTIONS"):
     extensions.append("godot_descriptions")
 
@@ -0,0 +1,8 @@
+"""
+Benchmarks for gdscript2rest.
+
+Run a benchmark as a module from the gdscript-rest-maker directory with the
+package importable, e.g.
+
+    PYTHONPATH=src python -m benchmarks.descriptions
+"""
@@ -0,0 +1,86 @@
+"""
+Compares the decode time and peak memory of the JSON decoders of
+json_decoder on a large synthetic reference, and checks they decode it to
+the same data.  "text" is the former loader, which read the file into one
+string and passed it to json.loads.
+
+Each decode runs in a new process, so its peak resident memory, mapped
+pages included, is measured from the same starting point.
+
+    PYTHONPATH=src python -m benchmarks.decoders [--classes 12000] [--repeat 3] \
+        [--input reference.json]
+"""
+
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from argparse import ArgumentParser, Namespace
+from importlib.util import find_spec
+from typing import List, Optional, Tuple
+
+from gdscript2rest.src.json_decoder import DECODERS, get_decoder
+from gdscript2rest.src.manifest import hash_data
+from gdscript2rest.src.profiling import _format_bytes, get_peak_memory
+
+from .synthetic import add_shape_arguments, get_shape, make_reference
+
+
+def decode(path: str, backend: str) -> Tuple[float, int, str]:
+    """Returns the time to decode the file, the peak memory it added and the hash of the data."""
+    before: int = get_peak_memory() or 0
+    start: float = time.perf_counter()
+    if backend == "text":
+        with open(path, "r") as json_file:
+            data: dict = json.loads(json_file.read())
+    else:
+        data = get_decoder(backend).read(path)
+    seconds: float = time.perf_counter() - start
+    peak: int = (get_peak_memory() or 0) - before
+    return seconds, peak, hash_data(data)
+
+
+def measure(path: str, backend: str, repeat: int) -> Tuple[float, int, str]:
+    context = multiprocessing.get_context("spawn")
+    results: List[Tuple[float, int, str]] = []
+    for _ in range(repeat):
+        with context.Pool(1) as pool:
+            results.append(pool.apply(decode, (path, backend)))
+    return (
+        min(result[0] for result in results),
+        max(result[1] for result in results),
+        results[0][2],
+    )
+
+
+def main():
+    parser: ArgumentParser = ArgumentParser(description=__doc__)
+    add_shape_arguments(parser)
+    parser.set_defaults(classes=12000)
+    parser.add_argument("--input", type=str, default="", help="Decode this file instead of a synthetic reference.")
+    parser.add_argument("--repeat", type=int, default=3)
+    args: Namespace = parser.parse_args()
+
+    backends: List[str] = ["text", "json"] + [
+        name for name in DECODERS if name != "json" and find_spec(name)
+    ]
+    with tempfile.TemporaryDirectory(prefix="gdscript2rest-bench-") as directory:
+        path: str = args.input
+        if not path:
+            path = os.path.join(directory, "reference.json")
+            with open(path, "w") as reference_file:
+                json.dump(make_reference(get_shape(args)), reference_file, indent=2)
+        print("{}, {}".format(os.path.basename(path), _format_bytes(os.path.getsize(path))))
+        print("{:<10} {:>10} {:>14}".format("decoder", "seconds", "peak memory"))
+
+        expected: Optional[str] = None
+        for backend in backends:
+            seconds, peak, data_hash = measure(path, backend, args.repeat)
+            print("{:<10} {:>10.3f} {:>14}".format(backend, seconds, _format_bytes(peak)))
+            expected = expected or data_hash
+            assert data_hash == expected, backend + " decoded different data"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Compares the description normalizer of gdscript_objects with the per-line
+regex implementation it replaced, and checks that both return the same
+results.
+
+    PYTHONPATH=src python -m benchmarks.descriptions [--lines 20000] [--repeat 5]
+"""
+
+import random
+import re
+import timeit
+from argparse import ArgumentParser, Namespace
+from typing import List, Tuple
+
+from gdscript2rest.src import gdscript_objects
+from gdscript2rest.src.gdscript_objects import (Metadata, extract_metadata,
+                                                extract_metadata_batch)
+from gdscript2rest.src.utils import build_re_pattern
+
+LINES: List[str] = [
+    " Moves the body along the given vector.",
+    " The [Vector2] is scaled by [member speed] and the delta time.",
+    "",
+    "    indented code sample  ",
+    " trailing whitespace \t",
+    " @tags - virtual, Abstract",
+    "@category Physics",
+    "\t",
+    " ",
+]
+
+
+def legacy_extract_metadata(description: str) -> Tuple[str, Metadata]:
+    """The implementation of extract_metadata before the normalizer."""
+    tags: List[str] = []
+    category: str = ""
+
+    lines: List[str] = description.split("\n")
+    description_trimmed: List[str] = []
+    pattern_tags = build_re_pattern("tags")
+    pattern_category = build_re_pattern("category")
+
+    for _, line in enumerate(lines):
+        line_stripped: str = line.strip().lower()
+
+        match_tags = re.match(pattern_tags, line_stripped)
+        match_category = re.match(pattern_category, line_stripped)
+        if match_tags:
+            tags = match_tags.group(1).split(",")
+            tags = list(map(lambda t: t.strip(), tags))
+        elif match_category:
+            category = match_category.group(1)
+        else:
+            description_trimmed.append(re.sub('^ ', '', line).rstrip())
+
+    metadata: Metadata = Metadata(tags, category)
+
+    rebuilt_description: str = "\n".join(description_trimmed)
+    description_double_breaks_only: str = re.sub(r"(?<!\n)\n(?!\n)", " ", rebuilt_description)
+
+    return description_double_breaks_only, metadata
+
+
+def make_description(line_count: int, with_metadata: bool = True) -> str:
+    lines: List[str] = LINES if with_metadata else LINES[:5] + LINES[7:]
+    return "\n".join(random.choice(lines) for _ in range(line_count))
+
+
+def check(descriptions: List[str]):
+    for description in descriptions:
+        expected: Tuple[str, Metadata] = legacy_extract_metadata(description)
+        assert extract_metadata(description) == expected, repr(description)
+    gdscript_objects._normalized_descriptions.clear()
+    assert extract_metadata_batch(descriptions) == [
+        legacy_extract_metadata(description) for description in descriptions
+    ]
+
+
+def measure(label: str, function, repeat: int) -> float:
+    def run():
+        gdscript_objects._normalized_descriptions.clear()
+        function()
+
+    best: float = min(timeit.repeat(run, number=1, repeat=repeat))
+    print("{:<48} {:10.2f} ms".format(label, best * 1000))
+    return best
+
+
+def main():
+    parser: ArgumentParser = ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=20000, help="Lines in the long descriptions.")
+    parser.add_argument("--descriptions", type=int, default=2000, help="Short descriptions in a class.")
+    parser.add_argument("--repeat", type=int, default=5)
+    args: Namespace = parser.parse_args()
+    random.seed(0)
+
+    check([make_description(random.randrange(12)) for _ in range(2000)])
+    check(["", "\n", "a\n", "\nb", " \n \n", "@category", " \u3000x\r\n y", "x\x00y"])
+
+    for with_metadata in (False, True):
+        description: str = make_description(args.lines, with_metadata)
+        title: str = "{} lines, {} metadata".format(
+            args.lines, "with" if with_metadata else "no"
+        )
+        legacy: float = measure(
+            "legacy, " + title, lambda: legacy_extract_metadata(description), args.repeat
+        )
+        current: float = measure(
+            "normalizer, " + title, lambda: extract_metadata(description), args.repeat
+        )
+        print("{:<48} {:10.1f}x".format("speedup", legacy / current))
+
+    short: List[str] = [
+        make_description(random.randrange(1, 6), False) for _ in range(args.descriptions)
+    ]
+    title = "{} short descriptions".format(args.descriptions)
+    legacy = measure(
+        "legacy, " + title, lambda: [legacy_extract_metadata(d) for d in short], args.repeat
+    )
+    current = measure(
+        "normalizer batch, " + title, lambda: extract_metadata_batch(short), args.repeat
+    )
+    print("{:<48} {:10.1f}x".format("speedup", legacy / current))
+
+
+if __name__ == "__main__":
+    main()
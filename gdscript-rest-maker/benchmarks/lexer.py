@@ -0,0 +1,83 @@
+"""
+Measures the throughput of the GDScript lexer of the documentation, in tokens
+per second, on the scripts of godot-scripts/, and the time to highlight the
+same blocks with and without the highlighting cache.
+
+    PYTHONPATH=src python -m benchmarks.lexer [--copies 20] [--repeat 5]
+"""
+
+import glob
+import os
+import sys
+import tempfile
+import timeit
+from argparse import ArgumentParser, Namespace
+from typing import List
+
+from pygments import highlight
+from pygments.formatters import HtmlFormatter
+
+ROOT: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+sys.path.insert(0, os.path.join(ROOT, "docs", "source", "_extensions"))
+
+from gdscript import GDScriptLexer, HighlightCache  # noqa: E402
+
+
+def load_corpus(directory: str) -> List[str]:
+    paths: List[str] = sorted(glob.glob(os.path.join(directory, "**", "*.gd"), recursive=True))
+    if not paths:
+        raise SystemExit("No GDScript files in " + directory)
+    sources: List[str] = []
+    for path in paths:
+        with open(path, encoding="utf-8") as script:
+            sources.append(script.read())
+    return sources
+
+
+def measure(label: str, function, repeat: int) -> float:
+    best: float = min(timeit.repeat(function, number=1, repeat=repeat))
+    print("{:<48} {:10.2f} ms".format(label, best * 1000))
+    return best
+
+
+def main():
+    parser: ArgumentParser = ArgumentParser(description=__doc__)
+    parser.add_argument("--corpus", default=os.path.join(ROOT, "godot-scripts"), help="Directory of .gd files.")
+    parser.add_argument("--copies", type=int, default=20, help="Copies of the corpus lexed in a run.")
+    parser.add_argument("--repeat", type=int, default=5)
+    args: Namespace = parser.parse_args()
+
+    lexer: GDScriptLexer = GDScriptLexer()
+    blocks: List[str] = load_corpus(args.corpus) * args.copies
+    token_count: int = sum(1 for block in blocks for _ in lexer.get_tokens(block))
+    line_count: int = sum(block.count("\n") for block in blocks)
+    print("{} blocks, {} lines, {} tokens".format(len(blocks), line_count, token_count))
+
+    lexing: float = measure(
+        "lexing", lambda: [list(lexer.get_tokens(block)) for block in blocks], args.repeat
+    )
+    print("{:<48} {:10.0f} tokens/s".format("throughput", token_count / lexing))
+
+    formatter: HtmlFormatter = HtmlFormatter(style="default")
+    uncached: float = measure(
+        "highlighting, no cache",
+        lambda: [highlight(block, lexer, formatter) for block in blocks],
+        args.repeat,
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache: HighlightCache = HighlightCache(directory)
+
+        def highlight_cached():
+            for block in blocks:
+                key: str = cache.make_key(block, "gdscript", "html", "default")
+                if cache.get(key) is None:
+                    cache.put(key, highlight(block, lexer, formatter))
+
+        highlight_cached()
+        cached: float = measure("highlighting, warm cache", highlight_cached, args.repeat)
+    print("{:<48} {:10.1f}x".format("speedup", uncached / cached))
+
+
+if __name__ == "__main__":
+    main()
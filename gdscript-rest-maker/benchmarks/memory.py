@@ -0,0 +1,82 @@
+"""
+Measures the memory held by the GDScriptClasses built from a synthetic
+reference, once the decoded JSON has been released, and the peak memory of
+loading it.  Results can be saved as JSON and compared with a previous run.
+
+    PYTHONPATH=src python -m benchmarks.memory --classes 50000 --output after.json \
+        --compare before.json
+"""
+
+import gc
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from argparse import ArgumentParser, Namespace
+from typing import Dict
+
+from gdscript2rest.src import gdscript_objects
+from gdscript2rest.src.gdscript_objects import GDScriptClasses
+
+from .synthetic import ReferenceShape, add_shape_arguments, get_shape, make_reference
+
+
+def measure(shape: ReferenceShape) -> Dict[str, float]:
+    with tempfile.TemporaryDirectory(prefix="gdscript2rest-bench-") as directory:
+        path: str = os.path.join(directory, "reference.json")
+        with open(path, "w") as reference_file:
+            json.dump(make_reference(shape), reference_file)
+        gc.collect()
+
+        tracemalloc.start()
+        start: float = time.perf_counter()
+        with open(path, "r") as json_file:
+            data: dict = json.loads(json_file.read())
+        json_size: int = tracemalloc.get_traced_memory()[0]
+        classes: GDScriptClasses = GDScriptClasses.from_dict_list(data["classes"])
+        seconds: float = time.perf_counter() - start
+        del data
+        gdscript_objects._normalized_descriptions.clear()
+        gc.collect()
+        model_size, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "classes": len(classes),
+        "json_bytes": json_size,
+        "model_bytes": model_size,
+        "peak_bytes": peak,
+        "bytes_per_class": model_size / len(classes),
+        "seconds": seconds,
+    }
+
+
+def main():
+    parser: ArgumentParser = ArgumentParser(description=__doc__)
+    parser.add_argument("--output", type=str, help="Path to save the results to as JSON.")
+    parser.add_argument("--compare", type=str, help="Results of a previous run to compare with.")
+    add_shape_arguments(parser)
+    args: Namespace = parser.parse_args()
+    shape: ReferenceShape = get_shape(args)
+
+    result: Dict[str, float] = measure(shape)
+    for key in ("json_bytes", "model_bytes", "peak_bytes"):
+        print("{:<16} {:10.1f} MB".format(key, result[key] / 1e6))
+    print("{:<16} {:10.0f} B".format("bytes_per_class", result["bytes_per_class"]))
+    print("{:<16} {:10.2f} s".format("load time", result["seconds"]))
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump({"shape": vars(shape), "result": result}, output, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r") as baseline_file:
+            baseline: Dict[str, float] = json.load(baseline_file)["result"]
+        print("\nCompared with {}".format(args.compare))
+        for key in ("model_bytes", "peak_bytes", "seconds"):
+            print("{:<16} {:10.2f}x".format(key, result[key] / baseline[key]))
+
+
+if __name__ == "__main__":
+    main()
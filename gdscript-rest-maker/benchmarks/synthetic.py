@@ -0,0 +1,207 @@
+"""
+Generates synthetic reference.json data in the format dumped by Godot's
+GDScript language server.
+
+    PYTHONPATH=src python -m benchmarks.synthetic --classes 1000 -o reference.json
+
+With --shards, the output is a shard directory laid out like the one the Godot
+collector writes: one compact JSON file per class and a project.json manifest.
+"""
+
+import hashlib
+import json
+import os
+import random
+from argparse import ArgumentParser, Namespace
+from dataclasses import asdict, dataclass
+from typing import List
+
+TYPES: List[str] = [
+    "int", "float", "bool", "String", "Vector2", "Vector3", "Array",
+    "Dictionary", "Node", "Node2D", "Resource", "Color", "var",
+]
+
+WORDS: List[str] = (
+    "the node moves along a path while the timer counts down and each signal "
+    "is emitted once per frame so the player can react to every change"
+).split()
+
+
+@dataclass
+class ReferenceShape:
+    """The size parameters of a synthetic reference."""
+
+    classes: int = 1000
+    methods: int = 8
+    members: int = 6
+    signals: int = 2
+    enums: int = 1
+    constants: int = 2
+    inner_depth: int = 1
+    inheritance_depth: int = 4
+    description_lines: int = 3
+    seed: int = 0
+
+
+def make_reference(shape: ReferenceShape) -> dict:
+    """Returns the data of a reference.json file with the given shape."""
+    generator: _Generator = _Generator(shape)
+    return {
+        "name": "Synthetic",
+        "description": "Synthetic project with {} classes".format(shape.classes),
+        "version": "1.0.0",
+        "classes": [generator.make_class(index) for index in range(shape.classes)],
+    }
+
+
+class _Generator:
+    def __init__(self, shape: ReferenceShape):
+        self.shape: ReferenceShape = shape
+        self.random: random.Random = random.Random(shape.seed)
+
+    def make_description(self) -> str:
+        lines: List[str] = []
+        for _ in range(self.shape.description_lines):
+            words: List[str] = self.random.choices(WORDS, k=self.random.randint(4, 12))
+            if self.random.random() < 0.2:
+                words.append("[Class{}]".format(self.random.randrange(self.shape.classes)))
+            lines.append(" " + " ".join(words))
+            if self.random.random() < 0.2:
+                lines.append("")
+        return "\n".join(lines)
+
+    def make_class(self, index: int, depth: int = 0, name: str = "") -> dict:
+        name = name or "Class{}".format(index)
+        # An inheritance depth of 0 or 1 makes every class extend a built-in class.
+        if depth == 0 and self.shape.inheritance_depth > 1 and index % self.shape.inheritance_depth:
+            extends: str = "Class{}".format(index - 1)
+        else:
+            extends = self.random.choice(["Node", "Node2D", "Resource", "Reference"])
+        sub_classes: List[dict] = []
+        if depth < self.shape.inner_depth:
+            sub_classes.append(self.make_class(index, depth + 1, name + "Inner"))
+
+        return {
+            "name": name,
+            "path": "res://src/{}.gd".format(name),
+            "extends_class": [extends],
+            "extends_file": "",
+            "icon": "",
+            "signature": "class {}".format(name),
+            "description": self.make_description(),
+            "methods": [self.make_method(i) for i in range(self.shape.methods)],
+            "static_functions": [],
+            "members": [self.make_member(i) for i in range(self.shape.members)],
+            "constants": [self.make_constant(i) for i in range(self.shape.constants)]
+            + [self.make_enum(i) for i in range(self.shape.enums)],
+            "signals": [self.make_signal(i) for i in range(self.shape.signals)],
+            "sub_classes": sub_classes,
+        }
+
+    def make_method(self, index: int) -> dict:
+        arguments: List[dict] = []
+        for position in range(self.random.randint(0, 3)):
+            argument: dict = {"name": "arg_{}".format(position), "type": self.random.choice(TYPES)}
+            if self.random.random() < 0.3:
+                argument["default_value"] = "0"
+            arguments.append(argument)
+        return_type: str = self.random.choice(TYPES + ["null"])
+        return {
+            "name": "method_{}".format(index),
+            "return_type": return_type,
+            "rpc_mode": 0,
+            "signature": "func method_{}({}) -> {}".format(
+                index, ", ".join(a["name"] for a in arguments), return_type
+            ),
+            "description": self.make_description(),
+            "arguments": arguments,
+        }
+
+    def make_member(self, index: int) -> dict:
+        data_type: str = self.random.choice(TYPES)
+        return {
+            "name": "member_{}".format(index),
+            "data_type": data_type,
+            "default_value": self.random.choice(["", "0", "1.5", "Vector2( 0, 0 )"]),
+            "setter": self.random.choice(["", "set_member_{}".format(index)]),
+            "getter": self.random.choice(["", "get_member_{}".format(index)]),
+            "export": self.random.random() < 0.5,
+            "signature": "var member_{}: {}".format(index, data_type),
+            "description": self.make_description(),
+        }
+
+    def make_constant(self, index: int) -> dict:
+        return {
+            "name": "CONSTANT_{}".format(index),
+            "value": index,
+            "data_type": "int",
+            "signature": "const CONSTANT_{} = {}".format(index, index),
+            "description": self.make_description(),
+        }
+
+    def make_enum(self, index: int) -> dict:
+        return {
+            "name": "Enum{}".format(index),
+            "value": {"VALUE_{}".format(i): i for i in range(4)},
+            "data_type": "Dictionary",
+            "signature": "const Enum{} = {{...}}".format(index),
+            "description": self.make_description(),
+        }
+
+    def make_signal(self, index: int) -> dict:
+        arguments: List[str] = ["value_{}".format(i) for i in range(self.random.randint(0, 2))]
+        return {
+            "name": "signal_{}".format(index),
+            "signature": "signal signal_{}({})".format(index, ", ".join(arguments)),
+            "description": self.make_description(),
+            "arguments": arguments,
+        }
+
+
+def add_shape_arguments(parser: ArgumentParser):
+    defaults: dict = asdict(ReferenceShape())
+    for name, default in defaults.items():
+        parser.add_argument(
+            "--" + name.replace("_", "-"), type=int, default=default,
+            help="Default: {}.".format(default),
+        )
+
+
+def get_shape(args: Namespace) -> ReferenceShape:
+    return ReferenceShape(**{name: getattr(args, name) for name in asdict(ReferenceShape())})
+
+
+def write_shards(reference: dict, dirpath: str):
+    """Writes the reference as a shard directory, named as the collector names them."""
+    os.makedirs(dirpath, exist_ok=True)
+    manifest: dict = {key: value for key, value in reference.items() if key != "classes"}
+    manifest["shards"] = []
+    for gdscript in reference["classes"]:
+        path: str = gdscript.get("path") or gdscript["name"]
+        shard: str = "{}-{}.json".format(
+            os.path.splitext(os.path.basename(path))[0],
+            hashlib.md5(path.encode("utf-8")).hexdigest()[:8],
+        )
+        manifest["shards"].append(shard)
+        with open(os.path.join(dirpath, shard), "w") as output:
+            json.dump(gdscript, output, separators=(",", ":"))
+    with open(os.path.join(dirpath, "project.json"), "w") as output:
+        json.dump(manifest, output, separators=(",", ":"))
+
+
+def main():
+    parser: ArgumentParser = ArgumentParser(description=__doc__)
+    parser.add_argument("-o", "--output", type=str, default="reference.json")
+    parser.add_argument("--shards", action="store_true", help="Write a shard directory to --output.")
+    add_shape_arguments(parser)
+    args: Namespace = parser.parse_args()
+    reference: dict = make_reference(get_shape(args))
+    if args.shards:
+        write_shards(reference, args.output)
+        return
+    with open(args.output, "w") as output:
+        json.dump(reference, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+Compares the property and method tables built on GridTable with the
+implementations they replaced, and checks that both render the same lines.
+The member descriptions, whose small tables are still formatted directly,
+are timed too, to check they did not get slower.  Legacy and current runs
+alternate, and the best time of each is kept.
+
+    PYTHONPATH=src python -m benchmarks.tables [--rows 2000] [--repeat 5]
+"""
+
+import random
+import timeit
+from argparse import ArgumentParser, Namespace
+from typing import Dict, List, Tuple
+
+from gdscript2rest.src.gdscript_objects import (Argument, Function,
+                                                FunctionTypes, Member)
+from gdscript2rest.src.make_restructured import (ReferenceResolver,
+                                                 make_arguments,
+                                                 make_func_table, make_link,
+                                                 make_members, make_prop_table)
+
+TYPES: List[str] = ["int", "float", "String", "Vector2", "Node", "PlayerState", "var"]
+
+
+def legacy_prop_table(props: List[Member], class_name: str) -> List[str]:
+    """The implementation of make_prop_table before GridTable."""
+    table_items: List[Dict] = []
+    exp_length: int = 0
+    type_length: int = 0
+    name_length: int = 0
+    default_length: int = 7
+    for prop in props:
+        prop_exported = "**export**" if prop.is_exported else ""
+        prop_type: str = make_link(prop.type)
+        prop_name: str = ":ref:`{}<class_{}_property_{}>`".format(
+            prop.name.lower(), class_name, prop.name.lower()
+        )
+        prop_def: str = "``{}``".format(prop.default_value) if prop.default_value else ""
+        table_items.append(
+            {"exported": prop_exported, "type": prop_type, "name": prop_name, "default": prop_def}
+        )
+
+    for item in table_items:
+        e_len = len(item["exported"]) + 2
+        t_len = len(item["type"]) + 2
+        n_len = len(item["name"]) + 2
+        d_len = len(item["default"]) + 2
+        if e_len > exp_length: exp_length = e_len
+        if t_len > type_length: type_length = t_len
+        if n_len > name_length: name_length = n_len
+        if d_len > default_length: default_length = d_len
+
+    table_separator: str = "+{}+{}+{}+{}+".format(
+        "-" * exp_length, "-" * name_length, "-" * type_length, "-" * default_length
+    )
+
+    table: List[str] = []
+    table.append(table_separator)
+    for row in table_items:
+        item_row: str = "| {} | {} | {} | {} |".format(
+            row["exported"] + " " * (exp_length - len(row["exported"]) - 2),
+            row["name"] + " " * (name_length - len(row["name"]) - 2),
+            row["type"] + " " * (type_length - len(row["type"]) - 2),
+            row["default"] + " " * (default_length - len(row["default"]) - 2),
+        )
+        table.append(item_row)
+        table.append(table_separator)
+    return table
+
+
+def legacy_func_table(funcs: List[Function], class_name: str) -> List[str]:
+    """The implementation of make_func_table before GridTable."""
+    table_items: List[Dict] = []
+    ret_type_len: int = 0
+    func_call_len: int = 0
+    for func in funcs:
+        if func.return_type == "null" or func.return_type == "void":
+            ret_type = func.return_type
+        else:
+            ret_type = make_link(func.return_type)
+        func_call: List[str] = [
+            ":ref:`{}<class_{}_method_{}>` **(** ".format(func.name, class_name, func.name)
+        ]
+        if func.arguments:
+            func_call.extend(make_arguments(func.arguments))
+        func_call.append(" **)**")
+        table_items.append({"func_call": "".join(func_call), "ret_type": ret_type})
+
+    for item in table_items:
+        c_len = len(item["func_call"]) + 2
+        r_len = len(item["ret_type"]) + 2
+        if c_len > func_call_len: func_call_len = c_len
+        if r_len > ret_type_len: ret_type_len = r_len
+
+    table_separator: str = "+{}+{}+".format("-" * func_call_len, "-" * ret_type_len)
+    table: List[str] = [table_separator]
+    for row in table_items:
+        table.append(
+            "| {} | {} |".format(
+                row["func_call"] + " " * (func_call_len - len(row["func_call"]) - 2),
+                row["ret_type"] + " " * (ret_type_len - len(row["ret_type"]) - 2),
+            )
+        )
+        table.append(table_separator)
+    return table
+
+
+def legacy_members(
+    members: List[Member], class_name: str, resolver: ReferenceResolver
+) -> List[str]:
+    """The implementation of make_members before GridTable."""
+    members_lines: List[str] = []
+    for member in members:
+        no_default: bool = member.default_value == None
+        member_default: str = None if no_default else "``{}``".format(member.default_value)
+        if member_default == "````":
+            member_default = "*member has no default setting*"
+        no_getter: bool = member.getter == ""
+        member_getter: str = None if no_getter else "{}()".format(member.getter)
+        no_setter: bool = member.setter == ""
+        member_setter: str = None if no_setter else "{}(val)".format(member.setter)
+        member_lines: List[str] = []
+        member_lines.append(".. _class_{}_property_{}:\n".format(class_name, member.name))
+        member_lines.append("- **{}** : {}\n".format(member.name, make_link(member.type)))
+
+        if not (no_default and no_getter and no_setter):
+            def_len = len(member_default) if member_default else 0
+            set_len = len(member_setter) if member_setter else 0
+            get_len = len(member_getter) if member_getter else 0
+
+            table_arg_width = max(def_len, set_len, get_len)
+            table_seperator = "+-----------+-{}-+".format("-" * table_arg_width)
+            member_lines.append(table_seperator)
+            if not no_default:
+                member_lines.append("| *Default* | {} |".format(
+                    member_default + " " * (table_arg_width - len(member_default))))
+                member_lines.append(table_seperator)
+            if not no_setter:
+                member_lines.append("| *Setter*  | {} |".format(
+                    member_setter + " " * (table_arg_width - len(member_setter))))
+                member_lines.append(table_seperator)
+            if not no_getter:
+                member_lines.append("| *Getter*  | {} |".format(
+                    member_getter + " " * (table_arg_width - len(member_getter))))
+                member_lines.append(table_seperator)
+            member_lines.append("\n")
+
+        member_lines.append("{}\n".format(resolver.resolve(member.description, class_name)))
+        member_lines.append("----\n")
+        members_lines.extend(member_lines)
+
+    members_lines.pop()
+    return members_lines
+
+
+def make_members_list(count: int) -> List[Member]:
+    return [
+        Member(
+            "var member_{}".format(index),
+            "member_{}".format(index) + "_x" * random.randrange(8),
+            "Description of member {}.".format(index),
+            random.choice(TYPES),
+            random.choice(["", None, "0", "Vector2( 0, 0 )", "PlayerState.new()"]),
+            random.random() < 0.5,
+            random.choice(["", "set_value"]),
+            random.choice(["", "get_value_with_a_long_name"]),
+        )
+        for index in range(count)
+    ]
+
+
+def make_functions_list(count: int) -> List[Function]:
+    return [
+        Function(
+            "func method_{}()".format(index),
+            "method_{}".format(index),
+            "",
+            FunctionTypes.METHOD,
+            random.choice(TYPES + ["null"]),
+            [
+                Argument("arg_{}".format(position), random.choice(TYPES), random.choice(["", "1"]))
+                for position in range(random.randrange(4))
+            ],
+            0,
+        )
+        for index in range(count)
+    ]
+
+
+def measure(legacy, current, repeat: int) -> Tuple[float, float]:
+    """
+    Returns the best times of `legacy` and `current`, run in turns so that
+    changes in the load of the machine affect both alike.
+    """
+    legacy_times: List[float] = []
+    current_times: List[float] = []
+    for _ in range(repeat):
+        legacy_times.append(timeit.timeit(legacy, number=1))
+        current_times.append(timeit.timeit(current, number=1))
+    return min(legacy_times), min(current_times)
+
+
+def main():
+    parser: ArgumentParser = ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2000, help="Rows in each table.")
+    parser.add_argument("--repeat", type=int, default=5)
+    args: Namespace = parser.parse_args()
+    random.seed(0)
+
+    members: List[Member] = make_members_list(args.rows)
+    functions: List[Function] = make_functions_list(args.rows)
+    resolver: ReferenceResolver = ReferenceResolver([])
+    cases = [
+        (
+            "properties",
+            lambda: legacy_prop_table(members, "Bench"),
+            lambda: make_prop_table(members, "Bench"),
+        ),
+        (
+            "methods",
+            lambda: legacy_func_table(functions, "Bench"),
+            lambda: make_func_table(functions, "Bench"),
+        ),
+        (
+            "member descriptions",
+            lambda: legacy_members(members, "Bench", resolver),
+            lambda: make_members(members, "Bench", resolver),
+        ),
+    ]
+    for name, legacy, current in cases:
+        assert legacy() == current(), name
+        title: str = "{} rows, {}".format(args.rows, name)
+        legacy_time, current_time = measure(legacy, current, args.repeat)
+        print("{:<40} {:10.2f} ms".format("legacy, " + title, legacy_time * 1000))
+        print("{:<40} {:10.2f} ms".format("current, " + title, current_time * 1000))
+        print("{:<40} {:10.1f}x".format("speedup", legacy_time / current_time))
+
+
+if __name__ == "__main__":
+    main()
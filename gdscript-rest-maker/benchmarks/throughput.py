@@ -0,0 +1,139 @@
+"""
+Times each stage of a gdscript2rest run on synthetic references of several
+sizes: loading the JSON, building the GDScriptClasses, rendering the documents
+and saving them.  Results are written as JSON and can be compared with those
+of a previous run.
+
+    PYTHONPATH=src python -m benchmarks.throughput --sizes 100 1000 10000 50000 \
+        --output after.json --compare before.json
+"""
+
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser, Namespace
+from dataclasses import asdict, replace
+from typing import Callable, Dict, List
+
+from gdscript2rest.__main__ import save
+from gdscript2rest.src.config import VERSION
+from gdscript2rest.src.convert_to_restructured import convert_to_restructured
+from gdscript2rest.src.gdscript_objects import GDScriptClasses, ProjectInfo
+
+from .synthetic import ReferenceShape, add_shape_arguments, get_shape, make_reference
+
+STAGES: List[str] = ["json_load", "from_dict_list", "convert_to_restructured", "save"]
+
+
+def run_size(shape: ReferenceShape, repeat: int, jobs: int) -> Dict[str, float]:
+    """Returns the best time of each stage over `repeat` runs, in seconds."""
+    directory: str = tempfile.mkdtemp(prefix="gdscript2rest-bench-")
+    try:
+        path: str = os.path.join(directory, "reference.json")
+        with open(path, "w") as reference_file:
+            json.dump(make_reference(shape), reference_file, indent=2)
+        result: Dict[str, float] = {"reference_bytes": os.path.getsize(path)}
+        arguments: Namespace = Namespace(make_index=True, jobs=jobs)
+
+        for _ in range(repeat):
+            timings: Dict[str, float] = {}
+
+            def timed(stage: str, function: Callable):
+                start: float = time.perf_counter()
+                value = function()
+                timings[stage] = time.perf_counter() - start
+                return value
+
+            def load() -> dict:
+                with open(path, "r") as json_file:
+                    return json.loads(json_file.read())
+
+            data: dict = timed("json_load", load)
+            info: ProjectInfo = ProjectInfo.from_dict(data)
+            classes: GDScriptClasses = timed(
+                "from_dict_list", lambda: GDScriptClasses.from_dict_list(data["classes"])
+            )
+            del data
+            documents = timed(
+                "convert_to_restructured",
+                lambda: convert_to_restructured(classes, arguments, info),
+            )
+            output: str = os.path.join(directory, "output")
+            os.makedirs(output, exist_ok=True)
+            timed("save", lambda: [save(document, output) for document in documents])
+
+            for stage, seconds in timings.items():
+                result[stage] = min(result.get(stage, seconds), seconds)
+        result["total"] = sum(result[stage] for stage in STAGES)
+        return result
+    finally:
+        shutil.rmtree(directory)
+
+
+def compare(results: dict, baseline: dict):
+    """Prints the ratio of each stage time to the baseline, for common sizes."""
+    previous: Dict[int, dict] = {entry["classes"]: entry for entry in baseline["results"]}
+    print("\nCompared with {}".format(baseline["meta"].get("label") or "baseline"))
+    for entry in results["results"]:
+        before: dict = previous.get(entry["classes"])
+        if not before:
+            continue
+        ratios: List[str] = [
+            "{} {:.2f}x".format(stage, entry[stage] / before[stage])
+            for stage in STAGES + ["total"]
+            if before.get(stage)
+        ]
+        print("{:>7} classes: {}".format(entry["classes"], ", ".join(ratios)))
+
+
+def main():
+    parser: ArgumentParser = ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=1, help="Keep the best of N runs.")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes used to render.")
+    parser.add_argument("--output", type=str, default="benchmark.json")
+    parser.add_argument("--compare", type=str, help="Results of a previous run to compare with.")
+    parser.add_argument("--label", type=str, default="", help="Name of this run in the results.")
+    add_shape_arguments(parser)
+    args: Namespace = parser.parse_args()
+    shape: ReferenceShape = get_shape(args)
+
+    results: dict = {
+        "meta": {
+            "label": args.label,
+            "gdscript2rest": VERSION,
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "jobs": args.jobs,
+            "shape": asdict(shape),
+        },
+        "results": [],
+    }
+    print("{:>7} {:>10} {}".format("classes", "MB", " ".join("{:>24}".format(s) for s in STAGES)))
+    for size in args.sizes:
+        entry: dict = {"classes": size}
+        entry.update(run_size(replace(shape, classes=size), args.repeat, args.jobs))
+        results["results"].append(entry)
+        print(
+            "{:>7} {:>10.1f} {}".format(
+                size,
+                entry["reference_bytes"] / 1e6,
+                " ".join("{:>23.3f}s".format(entry[stage]) for stage in STAGES),
+            )
+        )
+
+    with open(args.output, "w") as output:
+        json.dump(results, output, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r") as baseline_file:
+            compare(results, json.load(baseline_file))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,20 +4,34 @@ it to a rest document formatted in the look and feel of the Godot
 API documentation
 """
 
-import json
 import logging
 import os
 import sys
+import time
 from argparse import Namespace
-from itertools import repeat
-from typing import List
+from typing import Dict, Iterator, List, Optional, Union
 
-from .src import command_line
+from .src import command_line, json_decoder, make_restructured
 from .src.config import LOG_LEVELS, LOGGER
-from .src.gdscript_objects import GDScriptClasses, ProjectInfo
-from .src.make_restructured import RestructuredDocument
-from .src.convert_to_restructured import convert_to_restructured
+from .src.gdscript_objects import (ClassSummary, GDScriptClass, GDScriptClasses,
+                                   ProjectInfo)
+from .src.json_stream import (NDJSON_EXTENSIONS, is_ndjson, is_shard_directory,
+                              iter_reference, project_name_from_path)
+from .src.godot_api import GodotAPI
+from .src.make_restructured import (RestructuredDocument, set_godot_api,
+                                    set_sphinx_domain)
+from .src.manifest import Manifest, class_input_key, hash_data, hash_symbols
+from .src.model_cache import ModelCache, get_default_cache_directory
+from .src.gdscript_parser import extract_reference
+from .src.godot_project import find_project_root
+from .src.language_server import (LanguageServerClient, LanguageServerError,
+                                  collect_reference, parse_address)
+from .src.merge import (LoadedReference, build_reference, load_reference,
+                        load_references, merge_references, report_duplicates)
+from .src.profiling import Profiler
+from .src.convert_to_restructured import convert_stream, get_job_count
 from .src.utils import ratify_class_name
+from .src.watch import PollingWatcher, make_watcher
 
 
 def main():
@@ -28,47 +42,415 @@ def main():
         sys.exit()
     
     logging.basicConfig(level = LOG_LEVELS[min(args.verbose, len(LOG_LEVELS) - 1)])
-    json_files: List[str] = [f for f in args.files if f.lower().endswith(".json")]
+    profiler: Profiler = Profiler(
+        args.profile or bool(args.profile_json or args.profile_stats), args.profile_stats
+    )
+    profiler.start()
+    set_godot_api(
+        GodotAPI(args.godot_api) if args.godot_api else GodotAPI.for_version(args.godot_version)
+    )
+    set_sphinx_domain(args.sphinx_domain)
+    json_decoder.set_json_decoder(args.json_decoder)
+    LOGGER.info("Decoding JSON with {}".format(json_decoder.decoder.name))
+    json_files: List[str] = [
+        f
+        for f in args.files
+        if f.lower().endswith((".json",) + NDJSON_EXTENSIONS) or is_shard_directory(f)
+    ]
     LOGGER.info("Processing JSON files: {}".format(json_files))
-    for f in json_files:
-        with open(f,"r") as json_file:
-            data: list = json.loads(json_file.read())
-            
-            if data["version"] == None:
-                LOGGER.info(
-                    "Project has no version number - setting it to {}".format(args.doc_version)
+
+    manifest: Optional[Manifest] = None
+    if not args.dry_run:
+        _make_output_directory(args.path)
+        manifest = Manifest.load(args.path, args.force)
+
+    model_cache: Optional[ModelCache] = None
+    if not args.no_cache:
+        model_cache = ModelCache(args.cache_dir or get_default_cache_directory())
+
+    if args.language_server:
+        _collect_from_language_server(args.files, args, manifest, profiler)
+    elif args.parse_scripts:
+        _parse_projects(args.files, args, manifest, profiler)
+    elif args.watch:
+        _watch_files(json_files, args, manifest, profiler, model_cache)
+    elif args.merge:
+        _merge_files(json_files, args, manifest, profiler, model_cache)
+    else:
+        for f in json_files:
+            if args.stream or is_ndjson(f):
+                _stream_file(f, args, manifest, profiler)
+            else:
+                reference: LoadedReference = load_reference(
+                    f, cache=model_cache, profiler=profiler, jobs=get_job_count(args)
                 )
-                data["version"] = args.doc_version
+                _convert_references([reference], args, manifest, profiler)
+                del reference
+    if manifest and not args.watch:
+        _finish_run(manifest, profiler)
+
+    LOGGER.info(
+        "Link cache: {links} type names, {hits} hits, {misses} misses".format(
+            **make_restructured.link_resolver.get_statistics()
+        )
+    )
+
+    if profiler.enabled:
+        profiler.stop()
+        print(profiler.format_report(), file=sys.stderr)
+        if args.profile_json:
+            profiler.save_report(args.profile_json)
+
+
+def _convert_classes(
+    classes: GDScriptClasses,
+    data_hashes: List[str],
+    sources: List[str],
+    project_info: ProjectInfo,
+    args: Namespace,
+    manifest: Optional[Manifest],
+    profiler: Profiler,
+):
+    """
+    Renders the classes that changed since the last run and saves them.
+    `sources` holds the input file each class was read from.
+    """
+    if args.dry_run:
+        documents: List[RestructuredDocument] = list(
+            profiler.iterate_documents(
+                convert_stream(classes, classes, args, project_info)
+            )
+        )
+        LOGGER.debug("Generated {} reStructured documents.".format(len(documents)))
+        list(map(lambda doc: LOGGER.debug(doc), documents))
+        return
+
+    with profiler.phase("build"):
+        symbols_hash: str = hash_symbols(classes)
+        changed: List[GDScriptClass] = [
+            gdscript
+            for gdscript, data_hash, source in zip(classes, data_hashes, sources)
+            if not _is_unchanged(classes, gdscript, data_hash, symbols_hash, source, manifest)
+        ]
+    LOGGER.info(
+        "Saving {} changed reStructured files to {}".format(len(changed), args.path)
+    )
+    _save_documents(
+        convert_stream(classes, changed, args, project_info), manifest, profiler
+    )
+
+
+def _merge_files(
+    paths: List[str],
+    args: Namespace,
+    manifest: Optional[Manifest],
+    profiler: Profiler,
+    model_cache: Optional[ModelCache],
+):
+    """
+    Loads every file concurrently and renders their classes as one project,
+    with a single class index so links and inheritance work across files.
 
-            project_info: ProjectInfo = ProjectInfo.from_dict(data)
+    The files are read, decoded and built in worker processes, which the
+    profiler counts as decoding.
+    """
+    with profiler.phase("decode"):
+        references: List[LoadedReference] = load_references(
+            paths, get_job_count(args), model_cache
+        )
+    _convert_references(references, args, manifest, profiler)
 
-            classes: GDScriptClasses = GDScriptClasses.from_dict_list(data["classes"])
-            classes_count: int = len(classes)
 
+def _convert_references(
+    references: List[LoadedReference],
+    args: Namespace,
+    manifest: Optional[Manifest],
+    profiler: Profiler,
+):
+    """
+    Renders the loaded references, merged into one project with --merge or
+    each on its own otherwise.
+    """
+    if not references:
+        return
+    if not args.merge:
+        for reference in references:
+            classes: GDScriptClasses = GDScriptClasses(reference.classes)
+            project_info: ProjectInfo = _get_project_info(dict(reference.project), args)
             LOGGER.info(
                 "Project {}, version {}".format(project_info.name, project_info.version)
             )
-
             LOGGER.info(
-                "Processing {} classes in {}".format(classes_count, os.path.basename(f))
+                "Processing {} classes in {}".format(
+                    len(classes), os.path.basename(reference.path)
+                )
             )
-
-            documents: List[RestructuredDocument] = convert_to_restructured(
-                classes, args, project_info
+            _convert_classes(
+                classes,
+                reference.data_hashes,
+                [reference.path] * len(classes),
+                project_info,
+                args,
+                manifest,
+                profiler,
             )
+        return
 
-            if args.dry_run:
-                LOGGER.debug("Generated {} reStructured documents.".format(len(documents)))
-                list(map(lambda doc: LOGGER.debug(doc), documents))
-            else:
-                if not os.path.exists(args.path):
-                    LOGGER.info("Creating directory " + args.path)
-                    os.mkdir(args.path)
-                
-                LOGGER.info(
-                    "Saving {} reStructured files to {}".format(len(documents), args.path)
+    with profiler.phase("build"):
+        classes, data_hashes, sources, duplicates = merge_references(references)
+    report_duplicates(duplicates)
+
+    project_info = _get_project_info(dict(references[0].project), args)
+    LOGGER.info(
+        "Project {}, version {}".format(project_info.name, project_info.version)
+    )
+    LOGGER.info(
+        "Processing {} classes merged from {} files".format(
+            len(classes), len(references)
+        )
+    )
+    _convert_classes(classes, data_hashes, sources, project_info, args, manifest, profiler)
+
+
+def _collect_from_language_server(
+    paths: List[str], args: Namespace, manifest: Optional[Manifest], profiler: Profiler
+):
+    """
+    Collects the reference of each Godot project in `paths` from a running
+    editor over one connection to its language server, then renders it.
+    """
+    references: List[LoadedReference] = []
+    try:
+        host, port = parse_address(args.language_server)
+        with LanguageServerClient(host, port) as client:
+            for path in paths:
+                project_root: str = find_project_root(path)
+                with profiler.phase("read"):
+                    project, entries = collect_reference(
+                        client, project_root, args.directory, args.refresh
+                    )
+                project["name"] = project["name"] or os.path.basename(
+                    os.path.abspath(project_root)
                 )
-                list(map(save, documents, repeat(args.path)))
+                with profiler.phase("build"):
+                    references.append(build_reference(project_root, project, entries))
+    except (LanguageServerError, OSError) as error:
+        LOGGER.error(str(error))
+        sys.exit(1)
+    _convert_references(references, args, manifest, profiler)
+
+
+def _parse_projects(
+    paths: List[str], args: Namespace, manifest: Optional[Manifest], profiler: Profiler
+):
+    """Builds the reference of each Godot project in `paths` from its scripts, then renders it."""
+    references: List[LoadedReference] = []
+    try:
+        for path in paths:
+            project_root: str = find_project_root(path)
+            with profiler.phase("read"):
+                project, entries = extract_reference(
+                    project_root, args.directory, get_job_count(args)
+                )
+            project["name"] = project["name"] or os.path.basename(os.path.abspath(project_root))
+            with profiler.phase("build"):
+                references.append(build_reference(project_root, project, entries))
+    except OSError as error:
+        LOGGER.error(str(error))
+        sys.exit(1)
+    _convert_references(references, args, manifest, profiler)
+
+
+def _watch_files(
+    paths: List[str],
+    args: Namespace,
+    manifest: Optional[Manifest],
+    profiler: Profiler,
+    model_cache: Optional[ModelCache],
+):
+    """
+    Renders the files, then renders them again whenever one of them changes,
+    until interrupted.
+
+    The classes of every file stay in memory: only the files that changed are
+    decoded again, and only their classes whose data changed are built again.
+    The manifest is carried from one run to the next in
+    memory, so only the classes whose input changed are rendered.  A file that
+    cannot be loaded, for example while it is being regenerated, keeps its
+    previous classes.
+    """
+    with profiler.phase("decode"):
+        references: Dict[str, LoadedReference] = {
+            reference.path: reference
+            for reference in load_references(paths, get_job_count(args), model_cache)
+        }
+    _convert_references(list(references.values()), args, manifest, profiler)
+    if manifest:
+        _finish_run(manifest, profiler)
+
+    watcher: PollingWatcher = make_watcher(paths, args.watch_poll)
+    print(
+        "Watching {} files for changes, press Ctrl+C to stop".format(len(paths)),
+        file=sys.stderr,
+    )
+    try:
+        while True:
+            changed: List[str] = watcher.wait()
+            start: float = time.perf_counter()
+            for path in changed:
+                with profiler.phase("decode"):
+                    reference: Optional[LoadedReference] = _reload_reference(path, references.get(path))
+                if reference:
+                    references[path] = reference
+            manifest = manifest.next_run() if manifest else None
+            _convert_references(
+                [references[path] for path in paths if path in references],
+                args,
+                manifest,
+                profiler,
+            )
+            if manifest:
+                _finish_run(manifest, profiler)
+            print(
+                "Rendered {} in {:.2f} seconds{}".format(
+                    ", ".join(os.path.basename(path) for path in changed),
+                    time.perf_counter() - start,
+                    ": {} files written".format(manifest.written) if manifest else "",
+                ),
+                file=sys.stderr,
+            )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
+def _reload_reference(
+    path: str, previous: Optional[LoadedReference]
+) -> Optional[LoadedReference]:
+    """
+    Loads a changed file again, reusing the classes of its previous load.  The
+    model cache is not used, as hashing and pickling the whole model would cost
+    more than building the few classes that changed.
+    """
+    try:
+        return load_reference(path, previous)
+    except (OSError, ValueError, KeyError) as error:
+        LOGGER.warning(
+            "Could not load {}, keeping its previous classes: {}".format(path, error)
+        )
+        return None
+
+
+def _finish_run(manifest: Manifest, profiler: Profiler):
+    with profiler.phase("write"):
+        manifest.remove_stale()
+        manifest.save()
+    LOGGER.info(
+        "Skipped {} unchanged classes, wrote {} files".format(
+            manifest.skipped, manifest.written
+        )
+    )
+
+
+def _save_documents(
+    documents: Iterator[RestructuredDocument], manifest: Manifest, profiler: Profiler
+):
+    for document in profiler.iterate_documents(documents):
+        with profiler.phase("write"):
+            manifest.save_document(document)
+
+
+def _stream_file(
+    path: str, args: Namespace, manifest: Optional[Manifest], profiler: Profiler
+):
+    """
+    Converts the reference file at `path` one class at a time.
+
+    The file is read twice: the first pass only keeps a summary of each class
+    to build the class index, the second pass builds, renders and saves each
+    class before moving to the next one.  Classes the manifest reports as
+    unchanged are not built at all in the second pass.
+
+    Reading and decoding are interleaved, so the profiler counts both as
+    decoding.
+    """
+    data: dict = {"name": project_name_from_path(path), "description": "", "version": None}
+    summaries: List[ClassSummary] = []
+    data_hashes: List[str] = []
+    for key, value in profiler.iterate("decode", iter_reference(path)):
+        if key != "classes":
+            data[key] = value
+        elif value["name"] != "":
+            with profiler.phase("build"):
+                data_hashes.append(hash_data(value))
+                summaries.append(ClassSummary.from_class(GDScriptClass.from_dict(value)))
+
+    project_info: ProjectInfo = _get_project_info(data, args)
+    classes: GDScriptClasses = GDScriptClasses(summaries)
+    symbols_hash: str = hash_symbols(classes)
+
+    LOGGER.info(
+        "Project {}, version {}".format(project_info.name, project_info.version)
+    )
+    LOGGER.info(
+        "Streaming {} classes in {}".format(len(classes), os.path.basename(path))
+    )
+
+    def get_entries() -> Iterator[GDScriptClass]:
+        values: Iterator[dict] = (
+            value
+            for key, value in profiler.iterate("decode", iter_reference(path))
+            if key == "classes" and value["name"] != ""
+        )
+        for summary, data_hash, value in zip(classes, data_hashes, values):
+            with profiler.phase("build"):
+                if manifest and _is_unchanged(
+                    classes, summary, data_hash, symbols_hash, path, manifest
+                ):
+                    continue
+                gdscript: GDScriptClass = GDScriptClass.from_dict(value)
+            yield gdscript
+
+    documents: Iterator[RestructuredDocument] = convert_stream(
+        classes, get_entries(), args, project_info
+    )
+
+    if args.dry_run:
+        list(map(lambda doc: LOGGER.debug(doc), profiler.iterate_documents(documents)))
+    else:
+        LOGGER.info("Saving reStructured files to {}".format(args.path))
+        _save_documents(documents, manifest, profiler)
+
+
+def _is_unchanged(
+    classes: GDScriptClasses,
+    gdscript: Union[GDScriptClass, ClassSummary],
+    data_hash: str,
+    symbols_hash: str,
+    source: str,
+    manifest: Manifest,
+) -> bool:
+    input_key: str = class_input_key(
+        data_hash, gdscript.get_extends_tree(classes), symbols_hash
+    )
+    return manifest.is_unchanged(gdscript.name, input_key, source)
+
+
+def _get_project_info(data: dict, args: Namespace) -> ProjectInfo:
+    if data["version"] == None:
+        LOGGER.info(
+            "Project has no version number - setting it to {}".format(args.doc_version)
+        )
+        data["version"] = args.doc_version
+
+    return ProjectInfo.from_dict(data)
+
+
+def _make_output_directory(dirpath: str):
+    if not os.path.exists(dirpath):
+        LOGGER.info("Creating directory " + dirpath)
+        os.mkdir(dirpath)
 
 
 def save(
@@ -78,7 +460,7 @@ def save(
     path: str = os.path.join(dirpath, document.get_filename())
     with open(path, "w") as file_out:
         LOGGER.debug("Saving reStructured file " + path)
-        file_out.write(document.as_string())
+        document.write_to(file_out)
 
             
 if __name__== "__main__":
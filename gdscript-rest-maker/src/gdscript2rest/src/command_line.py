@@ -2,6 +2,9 @@
 import sys
 from argparse import ArgumentParser, Namespace
 
+from .godot_api import DEFAULT_GODOT_VERSION, GODOT_VERSIONS
+from .json_decoder import DECODER_CHOICES, DEFAULT_DECODER
+
 
 def parse(args=sys.argv) -> Namespace:
     parser: ArgumentParser = ArgumentParser(
@@ -13,12 +16,31 @@ def parse(args=sys.argv) -> Namespace:
 
     args.pop(0)  # we dont want the file list polluted with the program name.
 
-    parser.add_argument("files", type=str, nargs="+", help="A list of paths to JSON files.")
+    parser.add_argument("files", type=str, nargs="+", help="A list of paths to JSON files, or to Godot project directories with --language-server or --parse-scripts.")
     parser.add_argument("-p", "--path", type=str, default="export", help="Path to the output directory.")
     parser.add_argument("-i", "--make-index", action="store_true", default=False, help="If this flag is present, create and index.rst page with a table of contents.")
     parser.add_argument("-v", "--verbose", action="count", default=0, help="Set the verbosity level. For example -vv sets verbosity to level 2. Default: 0.")
     parser.add_argument("--dry-run", action="store_true", help="Run the script at max verbosity without creating files.  For debugging purposes.")
     parser.add_argument("-V", "--version", action="store_true", help="Print the version number and exit,")
+    parser.add_argument("--stream", action="store_true", default=False, help="Decode the JSON files one class at a time to keep memory use bounded on large projects. Always used for newline-delimited JSON (.ndjson, .jsonl) files.")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Number of worker processes used to render the classes. 0 uses one per CPU. Default: 1.")
+    parser.add_argument("--merge", action="store_true", default=False, help="Render all the files as one project with a single class index, so classes can link to and extend classes of other files. The files are loaded concurrently on --jobs worker processes. Classes defined in several files are reported and only the first one is rendered.")
+    parser.add_argument("--watch", action="store_true", default=False, help="Keep running after rendering the files and render them again whenever they change. The classes stay in memory and only those whose input changed are rendered again. Stop with Ctrl+C.")
+    parser.add_argument("--watch-poll", type=float, default=0.0, metavar="SECONDS", help="With --watch, check the files for changes every SECONDS instead of using filesystem notifications. Polling every 0.5 seconds is used when the watchdog package is not installed.")
+    parser.add_argument("--cache-dir", type=str, default="", help="Directory where the classes built from each reference file are cached, so an unchanged file is not decoded again. Default: $XDG_CACHE_HOME/gdscript2rest, or ~/.cache/gdscript2rest. Not used with --stream.")
+    parser.add_argument("--no-cache", action="store_true", default=False, help="Neither read nor write the cache of the classes built from the reference files.")
+    parser.add_argument("--language-server", type=str, default="", metavar="ADDRESS", help="Collect the reference from the GDScript language server of a running Godot editor instead of reading JSON files. ADDRESS is HOST:PORT, HOST or PORT, with an IPv6 HOST in brackets before a port as in [::1]:6008, the editor listens on 127.0.0.1:6008 by default. The files are then the Godot project directories.")
+    parser.add_argument("--parse-scripts", action="store_true", default=False, help="Build the reference by parsing the GDScript files of the Godot project directories given as files, without running Godot. The scripts are parsed concurrently on --jobs worker processes.")
+    parser.add_argument("-d", "--directory", type=str, action="append", default=[], help="With --language-server or --parse-scripts, a directory of the project to collect scripts from, like res://addons. Can be repeated. Default: the whole project.")
+    parser.add_argument("--refresh", action="store_true", default=False, help="With --language-server, have the editor parse every script again before collecting its symbols.")
+    parser.add_argument("--sphinx-domain", action="store_true", default=False, help="Write the pages with the directives and roles of the gdscript Sphinx domain (docs/source/_extensions/gdscript_domain.py) instead of plain labels and :ref: links, so Sphinx indexes every class and symbol as a typed object and writes them to objects.inv.")
+    parser.add_argument("--json-decoder", choices=DECODER_CHOICES, default=DEFAULT_DECODER, help="Module used to decode the JSON files, which are memory-mapped and passed to it as bytes. orjson and ujson are faster than the standard library's json but must be installed, auto uses the fastest one installed. Falls back to json when the module is not installed or rejects a file. Default: {}.".format(DEFAULT_DECODER))
+    parser.add_argument("--force", action="store_true", default=False, help="Render every class, even those whose input did not change since the last run.")
+    parser.add_argument("--godot-version", choices=GODOT_VERSIONS, default=DEFAULT_GODOT_VERSION, help="Major version of Godot whose built-in classes are linked to the Godot documentation. Default: {}.".format(DEFAULT_GODOT_VERSION))
+    parser.add_argument("--godot-api", type=str, help="Path to a custom index of the Godot built-in classes, either a text file with one class name per line or a JSON list or dictionary of class names. Overrides --godot-version.")
+    parser.add_argument("--profile", action="store_true", default=False, help="Print the wall time of each phase of the run, the peak memory of the process so far when each phase ended, and the classes that were slowest to render.")
+    parser.add_argument("--profile-json", type=str, default="", help="Path to a JSON file to save the --profile report to. Implies --profile.")
+    parser.add_argument("--profile-stats", type=str, default="", help="Path to a .pstats file to save cProfile statistics of the run to. Implies --profile.")
     parser.add_argument("--doc-version", type=str, default="0.0.0", help="Set the document version number if there is no version set in the JSON file. Defaults to 0.0.0")
 
     namespace: Namespace = parser.parse_args(args)
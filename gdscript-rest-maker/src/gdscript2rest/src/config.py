@@ -1,5 +1,7 @@
 import logging
 
+VERSION = "0.4.0"
+
 LOGGER = logging.getLogger("GDScript rest maker")
 LOG_LEVELS = [logging.INFO, logging.DEBUG]
 LOG_LEVELS = [None] + sorted(LOG_LEVELS, reverse=True)
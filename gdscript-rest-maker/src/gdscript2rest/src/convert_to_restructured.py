@@ -4,19 +4,28 @@ data to output the reStructuredText documents
 """
 
 import json
-import re
+import os
+import time
 from argparse import Namespace
-from typing import List
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Deque, Iterable, Iterator, List, Set, Union
 
+from . import make_restructured
 from .config import LOGGER
 from .gdscript_objects import (Element, GDScriptClass, GDScriptClasses,
                                ProjectInfo)
-from .make_restructured import (RestructuredDocument, RestructuredSection,
-                                make_bold, make_code_block, make_comment,
-                                make_heading, make_link, make_table_header,
-                                make_table_row, surround_with_html,
-                                wrap_in_newlines, make_prop_table,
-                                make_element, make_func_table)
+from .godot_api import GodotAPI
+from .make_restructured import (ReferenceResolver, RestructuredDocument,
+                                RestructuredSection, make_bold,
+                                make_class_label, make_code_block,
+                                make_comment, make_directive, make_heading,
+                                make_link,
+                                make_table_header, make_table_row,
+                                surround_with_html, wrap_in_newlines,
+                                make_prop_table, make_element,
+                                make_func_table)
 from .utils import ratify_class_name
 
 
@@ -28,21 +37,149 @@ def convert_to_restructured(
     and  converts it to reStructuredText.  It returns a list of
     reStructuredText documents.
     """
-    restructured: List[RestructuredDocument] = []
+    return list(convert_stream(classes, classes, arguments, info))
+
+
+def convert_stream(
+    classes: GDScriptClasses,
+    entries: Iterable[GDScriptClass],
+    arguments: Namespace,
+    info: ProjectInfo,
+) -> Iterator[RestructuredDocument]:
+    """
+    Lazily converts each GDScript class in `entries` to reStructuredText,
+    yielding one document at a time.
+
+    `classes` is only used to look up ancestors and symbols, so it may hold
+    ClassSummary objects standing in for the full classes.
+    """
     if arguments.make_index:
-        restructured.append(_write_index_page(classes, info))
-    for entry in classes:
-        restructured.append(_as_restructured(classes, entry, arguments))
-    return restructured
+        yield _write_index_page(classes, info)
+    if isinstance(entries, list):
+        make_restructured.link_resolver.resolve_all(get_type_names(entries))
+    jobs: int = get_job_count(arguments)
+    if jobs > 1:
+        yield from _convert_parallel(classes, entries, arguments, jobs)
+    else:
+        resolver: ReferenceResolver = ReferenceResolver(classes)
+        for entry in entries:
+            yield _as_restructured(classes, entry, arguments, resolver)
+
+
+def get_type_names(classes: Iterable[GDScriptClass]) -> Set[str]:
+    """
+    Returns the distinct type names the pages of the classes link to.
+    """
+    names: Set[str] = set()
+    for gdscript in classes:
+        names.add(gdscript.extends)
+        names.update(member.type for member in gdscript.members)
+        for function in gdscript.functions:
+            names.add(function.return_type)
+            names.update(argument.type for argument in function.arguments)
+        names.update(get_type_names(gdscript.sub_classes))
+    names.discard("")
+    return names
+
+
+# Number of classes sent to a worker process in one task.
+BATCH_SIZE: int = 32
+
+# Read-only state shared with the worker processes, set once per worker by
+# _init_worker so it isn't pickled again with every task.
+_worker_classes: GDScriptClasses = None
+_worker_arguments: Namespace = None
+_worker_resolver: ReferenceResolver = None
+
+
+def get_job_count(arguments: Namespace) -> int:
+    """
+    Returns the number of worker processes requested by the --jobs option,
+    where 0 means one per CPU.
+    """
+    jobs: int = getattr(arguments, "jobs", 1)
+    return jobs if jobs > 0 else os.cpu_count() or 1
+
+
+def _convert_parallel(
+    classes: GDScriptClasses,
+    entries: Iterable[GDScriptClass],
+    arguments: Namespace,
+    jobs: int,
+) -> Iterator[RestructuredDocument]:
+    """
+    Renders the classes in `entries` on a pool of `jobs` worker processes,
+    yielding the documents in the same order as the serial path.
+
+    When `entries` is `classes` itself, the workers already hold every class
+    and only receive indices.  Otherwise entries are sent in batches, with at
+    most a few batches in flight so streamed input stays bounded in memory.
+    """
+    tasks: Iterable[Union[int, GDScriptClass]] = (
+        range(len(classes)) if entries is classes else entries
+    )
+    tasks = iter(tasks)
+    pending: Deque[Future] = deque()
+    LOGGER.info("Rendering classes with {} worker processes".format(jobs))
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(
+            classes, arguments, make_restructured.api_ref, make_restructured.sphinx_domain
+        ),
+    ) as executor:
+        while True:
+            batch: list = list(islice(tasks, BATCH_SIZE))
+            if not batch:
+                break
+            pending.append(executor.submit(_render_batch, batch))
+            if len(pending) >= jobs * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _init_worker(
+    classes: GDScriptClasses, arguments: Namespace, api_ref: GodotAPI, sphinx_domain: bool
+):
+    global _worker_classes, _worker_arguments, _worker_resolver
+    make_restructured.set_sphinx_domain(sphinx_domain)
+    _worker_classes = classes
+    _worker_arguments = arguments
+    _worker_resolver = ReferenceResolver(classes)
+    make_restructured.set_godot_api(api_ref)
+    if classes and isinstance(classes[0], GDScriptClass):
+        make_restructured.link_resolver.resolve_all(get_type_names(classes))
+
+
+def _render_batch(
+    batch: List[Union[int, GDScriptClass]]
+) -> List[RestructuredDocument]:
+    """Renders the classes, recording the time each one took in the worker."""
+    documents: List[RestructuredDocument] = []
+    for entry in batch:
+        start: float = time.perf_counter()
+        document: RestructuredDocument = _as_restructured(
+            _worker_classes,
+            _worker_classes[entry] if isinstance(entry, int) else entry,
+            _worker_arguments,
+            _worker_resolver,
+        )
+        document.render_seconds = time.perf_counter() - start
+        documents.append(document)
+    return documents
 
 def _as_restructured(
-    classes: GDScriptClasses, gdscript: GDScriptClass, arguments: Namespace
+    classes: GDScriptClasses,
+    gdscript: GDScriptClass,
+    arguments: Namespace,
+    resolver: ReferenceResolver,
 ) -> RestructuredDocument:
     """
     Converts the data from a GDScript class into reStructuredText.
     """
 
-    content: List[str] = []
+    content: List[Union[str, RestructuredSection]] = []
 
     name: str = gdscript.name
 
@@ -62,23 +199,26 @@ def _as_restructured(
     ]
 
     content += [*make_heading(name, 1)]
+    if make_restructured.sphinx_domain:
+        content += make_directive("class", gdscript.name, [], [])
     if gdscript.extends:
         extends_list: List[str] = gdscript.get_extends_tree(classes)
         extends_links = [make_link(entry) for entry in extends_list]
         content += [make_bold("Extends:") + " " + " < ".join(extends_links)]
-        description = _replace_references(classes, gdscript, gdscript.description)
-        content += [*RestructuredSection("Description", 2, [description]).as_text()]
+        description = resolver.resolve(gdscript.description, gdscript.name)
+        content.append(RestructuredSection("Description", 2, [description]))
 
-    content += _write_class(classes, gdscript, 2)
+    content += _write_class(classes, gdscript, 2, resolver)
     # if gdscript.signals:
     #     content += RestructuredSection(
-    #         "Signals", 2, _write_signals(classes, gdscript)
+    #         "Signals", 2, _write_signals(classes, gdscript, resolver)
     #     ).as_text()
 
     if gdscript.sub_classes:
         content += make_heading("Sub-classes", 2)
     for cls in gdscript.sub_classes:
-        content += _write_class(classes, cls, 3, True)
+        content += ["", ".. _{}:".format(make_class_label(gdscript.name + "." + cls.name))]
+        content += _write_class(classes, cls, 3, resolver, True, gdscript.name + "." + cls.name)
 
     return RestructuredDocument(gdscript.name, doc_ref, content)
 
@@ -88,11 +228,15 @@ def _write_class(
     classes: GDScriptClasses,
     gdscript: GDScriptClass,
     heading_level: int,
+    resolver: ReferenceResolver,
     is_inner_class: bool = False,
-) -> List[str]:
-    restructured: List[str] = []
+    full_name: str = "",
+) -> List[Union[str, RestructuredSection]]:
+    restructured: List[Union[str, RestructuredSection]] = []
     if is_inner_class:
         restructured += make_heading(gdscript.name, heading_level)
+        if make_restructured.sphinx_domain:
+            restructured += make_directive("class", full_name, [], [])
     for attribute, title, table in [
         ("members", "Properties", True),
         ("functions", "Methods", True),
@@ -104,11 +248,13 @@ def _write_class(
     ]:
         if not getattr(gdscript, attribute):
             continue
-        restructured += RestructuredSection(
-            title,
-            heading_level + 1 if is_inner_class else heading_level,
-            _write(attribute, classes, gdscript, table),
-        ).as_text()
+        restructured.append(
+            RestructuredSection(
+                title,
+                heading_level + 1 if is_inner_class else heading_level,
+                _write(attribute, classes, gdscript, table, resolver, full_name),
+            )
+        )
     return restructured
 
 
@@ -127,6 +273,8 @@ def _write(
     classes: GDScriptClasses,
     gdscript:GDScriptClass,
     table: bool,
+    resolver: ReferenceResolver,
+    full_name: str = "",
     heading_level: int = 3
 ) -> List[str]:
     assert hasattr(gdscript, attribute)
@@ -135,27 +283,29 @@ def _write(
     element = getattr(gdscript, attribute)
     if table:
         if attribute == "members":
-            restructured.extend(make_prop_table(element, gdscript.name))
+            restructured.extend(make_prop_table(element, gdscript.name, full_name))
         else:
-            restructured.extend(make_func_table(element, gdscript.name))
+            restructured.extend(make_func_table(element, gdscript.name, full_name))
     else:
-        restructured.extend(make_element(attribute, element, gdscript.name))
+        restructured.extend(make_element(attribute, element, gdscript.name, resolver, full_name))
         # for element in getattr(gdscript, attribute):
         #     # restructured.extend(make_heading(element.get_heading_as_string(), heading_level))
         #     restructured.extend([make_code_block(element.signature), ""])
         #     restructured.extend(element.get_unique_attributes_as_restructured())
         #     restructured.append("")
-        #     description: str = _replace_references(classes, gdscript, element.description)
+        #     description: str = resolver.resolve(element.description, gdscript.name)
         #     restructured.append(description)
 
     return restructured
 
-def _write_signals(classes:GDScriptClasses, gdscript: GDScriptClass) -> List[str]:
+def _write_signals(
+    classes:GDScriptClasses, gdscript: GDScriptClass, resolver: ReferenceResolver
+) -> List[str]:
     return wrap_in_newlines(
         [
             "- **{}**\n\n{}".format(
                 s.signature.split(' ', 1)[1],
-                _replace_references(classes, gdscript, s.description)
+                resolver.resolve(s.description, gdscript.name)
             )
             for s in gdscript.signals
         ]
@@ -165,9 +315,9 @@ def _write_signals(classes:GDScriptClasses, gdscript: GDScriptClass) -> List[str
 def _write_index_page(classes: GDScriptClasses, info: ProjectInfo) -> RestructuredDocument:
     title: str = "{}".format(info.name)
     version: str = "Version: {}".format(info.version)
-    content: List[str] =[
-        *RestructuredSection(title, 1, [version] + [""] + [info.description]).as_text(),
-        *RestructuredSection("Contents", 2, _write_table_of_contents(classes)).as_text()
+    content: List[RestructuredSection] =[
+        RestructuredSection(title, 1, [version] + [""] + [info.description]),
+        RestructuredSection("Contents", 2, _write_table_of_contents(classes))
     ]
     return RestructuredDocument("index", "", content)
 
@@ -187,54 +337,3 @@ def _write_table_of_contents(classes: GDScriptClasses) -> List[str]:
 
     return toc
 
-
-def _replace_references(
-    classes: GDScriptClasses, gdscript: GDScriptClass, description: str
-) -> str:
-    """
-    Finds and replaces references to other classes or methods in the description.
-    """
-    ERROR_MESSAGE = {
-        "class": "Class {} not found in the class index.",
-        "member": "Symbol {} not found in {}.  The name might be incorrect.",
-    }
-    ERROR_TAIL = "The name might be incorrect."
-
-    references: re.Match = re.findall(r"\[,+\]", description)
-    for reference in references:
-        # Matches [ClassName], [symbol] and [ClassName.symbol]
-        match: re.Match = re.match(
-            r"\[([A-Z][a-zA-Z0-9]*)?\.?([a-z0-9_]+)?\]", reference
-        )
-        if not match:
-            continue
-
-        class_name, member = match[1], match[2]
-
-        if class_name and class_name not in classes.class_index:
-            LOGGER.warning(ERROR_MESSAGE["class"].format(class_name) + ERROR_TAIL)
-            continue
-
-        if member and class_name:
-            if member not in classes.class_index[class_name]:
-                LOGGER.warning(
-                    ERROR_MESSAGE["member"].format(member, gdscript.name) +ERROR_TAIL
-                )
-                continue
-
-        display_text, path = "", "../"
-        if class_name:
-            display_text, path = class_name, class_name
-        if class_name and member:
-            display_text+= "."
-            path += "/"
-        if member:
-            display_text += member
-            path += "#" + member.replace("_", "-")
-
-        link: str = make_link(display_text, path)
-        description = description.replace(reference,link, 1)
-    return description
-
-
-
@@ -10,8 +10,8 @@ import re
 from dataclasses import dataclass
 from enum import Enum
 from operator import itemgetter
-from sys import version
-from typing import List, Tuple
+from sys import intern, version
+from typing import Dict, List, Optional, Tuple
 import logging
 
 from .make_restructured import (make_bold, make_code_inline, make_list,
@@ -48,44 +48,108 @@ LOGGER = logging.getLogger()
 class Metadata:
     """ Container for metadata for Elements """
 
+    __slots__ = ("tags", "category")
+
     tags: List[str]
     category: str
 
 
+_EMPTY_METADATA: Metadata = Metadata([], "")
+
+# Matches a tags or category line once it has been stripped and lower cased.
+_METADATA_PATTERN = re.compile(
+    "|".join(
+        build_re_pattern(tag_name).replace("(.+)", "(?P<{}>.+)".format(tag_name), 1)
+        for tag_name in ("tags", "category")
+    )
+)
+# Normalized descriptions keyed by the raw description.  Filled by
+# extract_metadata_batch so the elements built right after it, and repeated
+# descriptions, are not normalized again.
+_normalized_descriptions: Dict[str, Tuple[str, Metadata]] = {}
+_NORMALIZED_DESCRIPTIONS_LIMIT = 4096
+
+
 def extract_metadata(description: str) -> Tuple[str, Metadata]:
     """
     Finds metadata keys in the provided description and returns the description
     without the corresponding lines, as we as the metadata.  In the source text,
     Metadata should be of the form key: value, e.g. category: CategoryNmae
     """
+    normalized: Tuple[str, Metadata] = _normalized_descriptions.get(description)
+    if normalized is None:
+        normalized = _normalize_description(description)
+        _remember_description(description, normalized)
+    text, metadata = normalized
+    return text, Metadata(list(metadata.tags), metadata.category)
+
+
+def extract_metadata_batch(descriptions: List[str]) -> List[Tuple[str, Metadata]]:
+    """
+    Same as calling extract_metadata on each description, but normalizes each
+    distinct description only once and keeps the results for the elements
+    built from these descriptions.
+    """
+    for description in dict.fromkeys(descriptions):
+        if description not in _normalized_descriptions:
+            _remember_description(description, _normalize_description(description))
+    return [extract_metadata(description) for description in descriptions]
 
+
+def _normalize_description(description: str) -> Tuple[str, Metadata]:
     tags: List[str] = []
     category: str = ""
 
     lines: List[str] = description.split("\n")
-    description_trimmed: List[str] = []
-    pattern_tags = build_re_pattern("tags")
-    pattern_category = build_re_pattern("category")
-
-    for _, line in enumerate(lines):
-        line_stripped: str = line.strip().lower()
-
-        match_tags = re.match(pattern_tags, line_stripped)
-        match_category = re.match(pattern_category, line_stripped)
-        if match_tags:
-            tags = match_tags.group(1).split(",")
-            tags = list(map(lambda t: t.strip(), tags))
-        elif match_category:
-            category = match_category.group(1)
+    if "@" in description:
+        description_trimmed: List[str] = []
+        for line in lines:
+            line_stripped: str = line.strip().lower()
+            match = (
+                _METADATA_PATTERN.match(line_stripped)
+                if line_stripped.startswith("@")
+                else None
+            )
+            if not match:
+                description_trimmed.append(line)
+            elif line_stripped.startswith("@tags"):
+                tags = [tag.strip() for tag in (match.group("tags") or "").split(",")]
+            else:
+                category = match.group("category")
+        lines = description_trimmed
+
+    return _join_lines(
+        [(line[1:] if line[:1] == " " else line).rstrip() for line in lines]
+    ), Metadata(tags, category)
+
+
+def _join_lines(lines: List[str]) -> str:
+    """
+    Joins the lines of a paragraph with spaces and keeps the line breaks of
+    runs of empty lines, the same as joining the lines with line breaks and
+    then replacing each single line break with a space.
+    """
+    pieces: List[str] = []
+    groups: List[Tuple[bool, List[str]]] = [
+        (is_text, list(group)) for is_text, group in itertools.groupby(lines, bool)
+    ]
+    last: int = len(groups) - 1
+    for index, (is_text, group) in enumerate(groups):
+        if is_text:
+            pieces.append(" ".join(group))
         else:
-            description_trimmed.append(re.sub('^ ', '', line).rstrip())
-    
-    metadata: Metadata = Metadata(tags, category)
+            # A run of empty lines is preceded and followed by a line break,
+            # unless it starts or ends the description.
+            breaks: int = len(group) + 1 - (index == 0) - (index == last)
+            pieces.append("\n" * breaks if breaks != 1 else " ")
+    return "".join(pieces)
+
 
-    rebuilt_description: str = "\n".join(description_trimmed)
-    description_double_breaks_only: str = re.sub(r"(?<!\n)\n(?!\n)", " ", rebuilt_description)
+def _remember_description(description: str, normalized: Tuple[str, Metadata]):
+    if len(_normalized_descriptions) >= _NORMALIZED_DESCRIPTIONS_LIMIT:
+        _normalized_descriptions.clear()
+    _normalized_descriptions[description] = normalized
 
-    return description_double_breaks_only, metadata
 
 class FunctionTypes(Enum):
     METHOD = 1
@@ -95,6 +159,8 @@ class FunctionTypes(Enum):
 
 @dataclass
 class ProjectInfo:
+    __slots__ = ("name", "description", "version")
+
     name: str
     description: str
     version: str
@@ -108,14 +174,23 @@ class ProjectInfo:
 class Element:
     """ Base type for all main GDScript symbol types.  Contains properties common
     to Signals, Functions, Member variables, etc.
+
+    Elements and classes use __slots__, as large projects have hundreds of
+    thousands of them.
     """
 
+    __slots__ = ("signature", "name", "description", "metadata")
+
     signature: str
     name: str
     description: str
 
     def __post_init__(self) -> str:
-        _description, self.matadata = extract_metadata(self.description)
+        _description, metadata = extract_metadata(self.description)
+        # Most elements have no metadata, they share one empty instance.
+        self.metadata: Metadata = (
+            metadata if metadata.tags or metadata.category else _EMPTY_METADATA
+        )
         self.description = _description.strip("\n")
 
     
@@ -141,12 +216,17 @@ class Element:
 
 @dataclass
 class Signal(Element):
+    __slots__ = ("arguments",)
+
     arguments: List[str]
 
     @staticmethod
     def from_dict(data: dict) -> "Signal":
         return Signal(
-            data["signature"], data["name"], data["description"], data["arguments"],
+            data["signature"],
+            data["name"],
+            data["description"],
+            [intern(argument) for argument in data["arguments"]],
         )
 
 @dataclass
@@ -155,6 +235,8 @@ class Argument:
     Container for function arguments
     """
 
+    __slots__ = ("name", "type", "default")
+
     name: str
     type: str
     default: str
@@ -162,6 +244,8 @@ class Argument:
 
 @dataclass
 class Function(Element):
+    __slots__ = ("kind", "return_type", "arguments", "rpc_mode")
+
     kind: FunctionTypes
     return_type: str
     arguments: List[Argument]
@@ -170,7 +254,7 @@ class Function(Element):
     def __post_init__(self):
         super().__post_init__()
         self.signature = self.signature.replace("-> null", "-> void", 1)
-        self.return_type = self.return_type.replace("null", "void")
+        self.return_type = intern(self.return_type.replace("null", "void"))
 
     def summarize(self) ->List[str]:
         return[self.return_type, self.signature]
@@ -188,11 +272,13 @@ class Function(Element):
         return heading
 
     @staticmethod
-    def from_dict(data: dict) -> "Function":
+    def from_dict(
+        data: dict, is_virtual: bool = False, is_static: bool = False
+    ) -> "Function":
         kind: FunctionTypes = FunctionTypes.METHOD
-        if data["is_static"]:
+        if is_static:
             kind = FunctionTypes.STATIC
-        elif data["is_virtual"]:
+        elif is_virtual:
             kind = FunctionTypes.VIRTUAL
 
         return Function(
@@ -207,12 +293,14 @@ class Function(Element):
 
     @staticmethod
     def _get_arguments(data: List[dict]) -> List[Argument]:
-        args: List[Argument] = []
-        for entry in data:
-            if not "default_value" in entry:
-                entry["default_value"] = ""
-            args.append(Argument(entry["name"], entry["type"], entry["default_value"]))
-        return args
+        return [
+            Argument(
+                intern(entry["name"]),
+                intern(entry["type"]),
+                _intern_value(entry.get("default_value", "")),
+            )
+            for entry in data
+        ]
 
 @dataclass
 class Enumeration(Element):
@@ -220,12 +308,17 @@ class Enumeration(Element):
     Represents an enum with its constants.
     """
 
+    __slots__ = ("values",)
+
     values: dict
 
     @staticmethod
     def from_dict(data: dict) -> "Enumeration":
         return Enumeration(
-            data["signature"], data["name"], data["description"], data["value"],
+            data["signature"],
+            data["name"],
+            data["description"],
+            {intern(name): value for name, value in data["value"].items()},
         )
 
 
@@ -235,6 +328,8 @@ class Member(Element):
     Represents a property of member varialble
     """
 
+    __slots__ = ("type", "default_value", "is_exported", "setter", "getter")
+
     type: str
     default_value: str
     is_exported: bool
@@ -261,11 +356,11 @@ class Member(Element):
             data["signature"],
             data["name"],
             data["description"],
-            data["data_type"],
-            data["default_value"],
+            intern(data["data_type"]),
+            _intern_value(data["default_value"]),
             data["export"],
-            data["setter"],
-            data["getter"],
+            intern(data["setter"]),
+            intern(data["getter"]),
         )
 
 
@@ -275,6 +370,8 @@ class Constant(Element):
     Represents a constant
     """
 
+    __slots__ = ("type", "default_value")
+
     type: str
     default_value: str
 
@@ -287,13 +384,18 @@ class Constant(Element):
             data["signature"],
             data["name"],
             data["description"],
-            data["data_type"],
-            data["value"],
+            intern(data["data_type"]),
+            _intern_value(data["value"]),
         )                                                                        
 
 
 @dataclass
 class GDScriptClass:
+    __slots__ = (
+        "name", "extends", "description", "path", "functions", "members",
+        "constants", "signals", "enums", "sub_classes", "metadata", "symbols",
+    )
+
     name: str
     extends: str
     description: str
@@ -309,14 +411,27 @@ class GDScriptClass:
         description, self.metadata = extract_metadata(self.description)
         self.description = description.strip("\n")
 
-        elements = self.functions + self.members + self.signals + self.enums
-        self.symbols = {element.name for element in elements}
+        # Maps the name of each symbol to its kind, as used in the labels of
+        # the generated pages.
+        self.symbols: Dict[str, str] = {}
+        for constant in self.constants:
+            self.symbols[constant.name] = "constant"
+        for enum in self.enums:
+            self.symbols.update(dict.fromkeys(enum.values, "constant"))
+            self.symbols[enum.name] = "enum"
+        for kind, elements in (
+            ("signal", self.signals),
+            ("property", self.members),
+            ("method", self.functions),
+        ):
+            self.symbols.update((element.name, kind) for element in elements)
 
     @staticmethod
     def from_dict(data: dict):
-        # the extends_class field is a list in json even though it only
-        # has one class
-        extends: str = data["extends_class"][0] if data["extends_class"] else ""
+        extract_metadata_batch(_get_descriptions(data))
+        # the extends_class field is a list in json: the class, or the outer
+        # and inner class of `extends Outer.Inner`
+        extends: str = intern(".".join(data["extends_class"]))
         return GDScriptClass(
             data["name"],
             extends,
@@ -339,19 +454,44 @@ class GDScriptClass:
     def get_extends_tree(self, classes: "GDScriptClasses") -> List[str]:
         """
         returns the list of ancestor classes, starting
-        from self.extends.
+        from self.extends.  Inner classes are named Outer.Inner, the name
+        their section is labelled with.
 
         Arguments:
 
         - classes: a GDScriptClasses list of GDScriptClasses this object is part of.
 
         """
-        extends: str = self.extends
-        extends_tree: List[str] = []
-        while extends != "":
-            extends_tree.append(extends)
-            extends = next((cls.extends for cls in classes if cls.name == extends), "")
-        return extends_tree
+        if not self.extends:
+            return []
+        return [classes.get_full_name(name) for name in classes.get_ancestry(self.extends)]
+
+
+@dataclass
+class ClassSummary:
+    """
+    Lightweight stand-in for a GDScriptClass that only keeps what is needed
+    to index it: its name, the class it extends and its symbols.
+    """
+
+    __slots__ = ("name", "extends", "symbols", "sub_classes")
+
+    name: str
+    extends: str
+    symbols: Dict[str, str]
+    sub_classes: List["ClassSummary"]
+
+    @staticmethod
+    def from_class(gdscript_class: GDScriptClass) -> "ClassSummary":
+        return ClassSummary(
+            gdscript_class.name,
+            gdscript_class.extends,
+            gdscript_class.symbols,
+            [ClassSummary.from_class(cls) for cls in gdscript_class.sub_classes],
+        )
+
+    def get_extends_tree(self, classes: "GDScriptClasses") -> List[str]:
+        return GDScriptClass.get_extends_tree(self, classes)
 
 
 class GDScriptClasses(list):
@@ -366,15 +506,95 @@ class GDScriptClasses(list):
         self.class_index = {
             gdscript_class.name: gdscript_class.symbols for gdscript_class in self
         }
+        self._classes_by_name: Dict[str, GDScriptClass] = {}
+        self._full_names: Dict[str, str] = {}
+        # Top level classes are indexed first so an inner class never takes
+        # the place of a top level class with the same name.
+        for gdscript_class in self:
+            self._classes_by_name.setdefault(gdscript_class.name, gdscript_class)
+        for gdscript_class in self:
+            self._index_sub_classes(gdscript_class)
+        self._ancestries: Dict[str, Tuple[str, ...]] = {}
+
+    def _index_sub_classes(self, gdscript_class: GDScriptClass):
+        """
+        Indexes the inner classes of the class as Outer.Inner, and by their own
+        name when no top level class or earlier inner class has it.
+        """
+        for sub_class in gdscript_class.sub_classes:
+            full_name: str = gdscript_class.name + "." + sub_class.name
+            self._classes_by_name.setdefault(full_name, sub_class)
+            if self._classes_by_name.setdefault(sub_class.name, sub_class) is sub_class:
+                self._full_names[sub_class.name] = full_name
+            self._index_sub_classes(sub_class)
+
+    def get_class(self, name: str) -> Optional[GDScriptClass]:
+        """Returns the class or inner class called `name`, or None."""
+        return self._classes_by_name.get(name)
+
+    def get_full_name(self, name: str) -> str:
+        """Returns Outer.Inner if `name` is found as an inner class, else `name`."""
+        return self._full_names.get(name, name)
+
+    def get_ancestry(self, name: str) -> Tuple[str, ...]:
+        """
+        Returns `name` followed by the names of its ancestors.  A class that is
+        not part of the project, such as a Godot built-in class, ends the chain.
+
+        Chains are computed once per class and memoized.  A cyclic chain is
+        reported and cut where it loops back.
+        """
+        ancestry: Optional[Tuple[str, ...]] = self._ancestries.get(name)
+        if ancestry is not None:
+            return ancestry
+
+        path: List[str] = []
+        seen: set = set()
+        current: str = name
+        tail: Tuple[str, ...] = ()
+        while current:
+            if current in self._ancestries:
+                tail = self._ancestries[current]
+                break
+            if current in seen:
+                LOGGER.warning(
+                    "Cyclic inheritance: {} extends {}".format(
+                        " < ".join(path), current
+                    )
+                )
+                return self._set_cyclic_ancestries(name, path, path.index(current))
+            seen.add(current)
+            path.append(current)
+            gdscript_class: Optional[GDScriptClass] = self._classes_by_name.get(current)
+            current = gdscript_class.extends if gdscript_class else ""
+
+        for entry in reversed(path):
+            tail = (entry,) + tail
+            self._ancestries[entry] = tail
+        return tail
+
+    def _set_cyclic_ancestries(
+        self, name: str, path: List[str], cycle_start: int
+    ) -> Tuple[str, ...]:
+        """
+        Memoizes the chains of a path that loops back to path[cycle_start].  The
+        chain of each class in the loop goes around it once.
+        """
+        for index, entry in enumerate(path):
+            loop: List[str] = path[cycle_start:index] if index > cycle_start else []
+            self._ancestries[entry] = tuple(path[index:] + loop)
+        return self._ancestries[name]
 
     def _get_grouped_by(self, attribute: str) -> List[List[GDScriptClass]]:
+        # if not self or self[0].metadata.category == None:
+        if not self or not hasattr(self[0], attribute):
+            return []
+        LOGGER.info(
+         "GDScriptClasses._get_grouped_by checking: {}".format(type(self[0].metadata.category))
+        )
         LOGGER.info(
-         "GDScriptClasses._get_grouped_by checking: {}".format(type(self[0].__dict__["metadata"].category)),
          "GDScriptClassese._get_grouped_by attribuete: {}".format(attribute) 
         )
-        # if not self or self[0].__dict__["metadata"].category == None:
-        if not self or attribute not in self[0].__dict__:
-            return []
 
         groups = []
         get_attribute = operator.attrgetter(attribute)
@@ -397,6 +617,22 @@ class GDScriptClasses(list):
         )
 
 
+def _get_descriptions(data: dict) -> List[str]:
+    """
+    Returns the descriptions of a class and of all its elements, excluding
+    those of its sub-classes.
+    """
+    descriptions: List[str] = [data["description"]]
+    for key in ("methods", "static_functions", "members", "constants", "signals"):
+        descriptions.extend(entry["description"] for entry in data[key])
+    return descriptions
+
+
+def _intern_value(value):
+    """Interns string values, such as the default values shared by many symbols."""
+    return intern(value) if isinstance(value, str) else value
+
+
 def _get_signals(data: List[dict]) -> List[Signal]:
     return [Signal.from_dict(entry) for entry in data]
 
@@ -424,11 +660,7 @@ def _get_functions(data: List[dict], is_static: bool = False) -> List[Function]:
         if is_private:
             continue
 
-        function_data: dict = entry
-        function_data["is_virtual"] = is_virtual
-        function_data["is_static"] = is_static
-
-        functions.append(Function.from_dict(function_data))
+        functions.append(Function.from_dict(entry, is_virtual, is_static))
     return functions
 
 
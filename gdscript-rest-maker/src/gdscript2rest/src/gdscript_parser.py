@@ -0,0 +1,706 @@
+"""
+Extracts the symbols of GDScript files without Godot, for the --parse-scripts
+option, which builds the reference of a project straight from its sources.
+
+    python -m gdscript2rest.src.gdscript_parser PROJECT [-d res://addons] [-o reference.json]
+
+Each script gives the same entry as `workspace/generate_script_api` in Godot 3:
+the class name, what it extends, its functions, static functions, variables,
+constants, enums, signals and inner classes.  Descriptions are read the way
+the editor reads them: the comment lines right above a symbol, followed by the
+comment at the end of its line.  The description of a script is the block of
+comment lines at its top, after the `tool`, `extends` and `class_name` lines.
+Comments starting with `##` keep their second `#`, as in Godot 3.
+
+The scripts are not compiled, so only default values made of literals, like
+`5`, `"text"`, `[1, 2]` or `Vector2(0, 1)`, are known.  Other default values
+of variables are null, as Godot reports for expressions it cannot reduce to a
+constant.  Other default values of function arguments, like `Vector2.ZERO` or
+`SPEED * 2`, are given as their source text, where Godot gives the value it
+computed, so the rendered signature still shows the argument as optional.
+Constants are ordered by name, as Godot orders them.
+"""
+
+import ast
+import json
+import os
+import re
+import sys
+from argparse import ArgumentParser, Namespace
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .config import LOGGER
+from .godot_project import find_project_root, find_scripts, read_project_settings, to_local_path
+
+# Number of scripts parsed by a worker process per task.
+SCRIPTS_PER_TASK: int = 64
+
+# Remote procedure call keywords and the MultiplayerAPI.RPCMode they set.
+RPC_MODES: Dict[str, int] = {
+    "remote": 1,
+    "master": 2,
+    "puppet": 3,
+    "slave": 3,
+    "remotesync": 4,
+    "sync": 4,
+    "mastersync": 5,
+    "puppetsync": 6,
+}
+
+_IDENTIFIER: str = r"[A-Za-z_][A-Za-z_0-9]*"
+_TYPE: str = r"[A-Za-z_][A-Za-z_0-9.]*"
+_FUNCTION_PATTERN = re.compile(
+    r"(?P<prefix>(?:\w+\s+)*)func\s+(?P<name>{})\s*\((?P<arguments>.*)$".format(_IDENTIFIER),
+    re.DOTALL,
+)
+_VARIABLE_PATTERN = re.compile(
+    r"(?P<prefix>(?:(?:@?\w+\s*(?:\(.*?\))?)\s+)*)var\s+(?P<name>{})(?P<rest>.*)$".format(
+        _IDENTIFIER
+    ),
+    re.DOTALL,
+)
+_CONSTANT_PATTERN = re.compile(
+    r"const\s+(?P<name>{})\s*(?::\s*(?P<type>{})?)?\s*=(?P<value>.*)$".format(_IDENTIFIER, _TYPE),
+    re.DOTALL,
+)
+_ENUM_PATTERN = re.compile(
+    r"enum\s*(?P<name>{})?\s*\{{(?P<values>.*)\}}$".format(_IDENTIFIER), re.DOTALL
+)
+_SIGNAL_PATTERN = re.compile(
+    r"signal\s+(?P<name>{})\s*(?:\((?P<arguments>.*)\))?$".format(_IDENTIFIER), re.DOTALL
+)
+_CLASS_PATTERN = re.compile(
+    r"class\s+(?P<name>{})\s*(?:extends\s+(?P<extends>.+?))?\s*:$".format(_IDENTIFIER), re.DOTALL
+)
+_CLASS_NAME_PATTERN = re.compile(
+    r"class_name\s+(?P<name>{})\s*(?:,\s*(?P<icon>\".*?\"|'.*?'))?".format(_IDENTIFIER)
+)
+_EXTENDS_PATTERN = re.compile(r"extends\s+(?P<extends>(?:\".*?\"|'.*?')?[A-Za-z_0-9.]*)")
+_ROOT_HEADER_PATTERN = re.compile(r"(@?tool|extends|class_name)\b")
+
+_CONSTRUCTORS: Dict[str, int] = {"Vector2": 2, "Vector3": 3, "Color": 4}
+
+
+class _Statement:
+    __slots__ = ("line", "indent", "code")
+
+    def __init__(self, line: int, indent: int, code: str):
+        """
+        A logical line of code, which may span several lines of the file.
+
+        Keyword Arguments:
+        line: int    -- the index of the first line of the statement
+        indent: int  -- the number of indentation characters of that line
+        code: str    -- the code of the statement, without comments
+        """
+        self.line: int = line
+        self.indent: int = indent
+        self.code: str = code
+
+
+def parse_script(text: str, path: str) -> dict:
+    """
+    Returns the reference entry of the GDScript `text`, as Godot's
+    generate_script_api would.
+
+    Keyword Arguments:
+    text: str  -- the source code of the script
+    path: str  -- the res:// path of the script
+    """
+    lines: List[str] = text.splitlines()
+    root: dict = _make_class("", path)
+    classes: List[Tuple[int, dict]] = [(-1, root)]
+
+    statements: List[_Statement] = list(_iter_statements(lines))
+    index: int = 0
+    while index < len(statements):
+        statement: _Statement = statements[index]
+        index += 1
+        while statement.indent <= classes[-1][0]:
+            classes.pop()
+        gdscript: dict = classes[-1][1]
+        code: str = statement.code
+
+        match = _CLASS_PATTERN.match(code)
+        if match:
+            sub_class: dict = _make_class(match.group("name"), path)
+            _set_extends(sub_class, match.group("extends") or "")
+            sub_class["signature"] = "class " + sub_class["name"]
+            sub_class["description"] = _get_documentation(lines, statement.line)
+            gdscript["sub_classes"].append(sub_class)
+            classes.append((statement.indent, sub_class))
+            continue
+
+        match = _FUNCTION_PATTERN.match(code)
+        if match:
+            _add_function(gdscript, match, lines, statement.line)
+            while index < len(statements) and statements[index].indent > statement.indent:
+                index += 1
+            continue
+
+        _parse_header(gdscript, code)
+        match = _VARIABLE_PATTERN.match(code)
+        if match:
+            gdscript["members"].append(_make_member(match, lines, statement.line))
+            continue
+        match = _CONSTANT_PATTERN.match(code)
+        if match:
+            value: str = match.group("value").strip()
+            gdscript["constants"].append(
+                _make_constant(match.group("name"), match.group("type"), value, lines, statement.line)
+            )
+            continue
+        match = _ENUM_PATTERN.match(code)
+        if match:
+            gdscript["constants"].extend(_make_enum(match, lines, statement.line))
+            continue
+        match = _SIGNAL_PATTERN.match(code)
+        if match:
+            gdscript["signals"].append(_make_signal(match, lines, statement.line))
+
+    root["signature"] = "class " + (root["name"] or path.rpartition("/")[2])
+    root["description"] = _get_root_documentation(lines)
+    _sort_constants(root)
+    return root
+
+
+def _sort_constants(gdscript: dict):
+    """Orders the constants of the class and its inner classes by name, as Godot does."""
+    gdscript["constants"].sort(key=lambda constant: constant["name"])
+    for sub_class in gdscript["sub_classes"]:
+        _sort_constants(sub_class)
+
+
+def _make_class(name: str, path: str) -> dict:
+    return {
+        "name": name,
+        "path": path,
+        "extends_class": [],
+        "extends_file": "",
+        "icon": "",
+        "signature": "",
+        "description": "",
+        "sub_classes": [],
+        "constants": [],
+        "members": [],
+        "signals": [],
+        "methods": [],
+        "static_functions": [],
+    }
+
+
+def _parse_header(gdscript: dict, code: str):
+    """Reads the class_name and extends statements of the script or inner class."""
+    match = _CLASS_NAME_PATTERN.match(code)
+    if match:
+        gdscript["name"] = match.group("name")
+        if match.group("icon"):
+            gdscript["icon"] = match.group("icon")[1:-1]
+        code = code[match.end():].strip()
+    match = _EXTENDS_PATTERN.match(code)
+    if match:
+        _set_extends(gdscript, match.group("extends"))
+        code = code[match.end():].strip()
+        match = _CLASS_NAME_PATTERN.match(code)
+        if match:
+            _parse_header(gdscript, code)
+
+
+def _set_extends(gdscript: dict, extends: str):
+    """Splits `extends Node`, `extends "res://a.gd"` and `extends "res://a.gd".Inner`."""
+    extends = extends.strip()
+    if extends[:1] in ("'", '"'):
+        end: int = extends.index(extends[0], 1)
+        gdscript["extends_file"] = extends[1:end]
+        extends = extends[end + 1:].lstrip(".")
+    gdscript["extends_class"] = [name for name in extends.split(".") if name]
+
+
+def _add_function(gdscript: dict, match, lines: List[str], line: int):
+    keywords: List[str] = match.group("prefix").split()
+    arguments_text, _, rest = _split_closing(match.group("arguments"))
+    return_type: str = ""
+    rest = rest.strip()
+    if rest.startswith("->"):
+        return_type = rest[2:].split(":", 1)[0].strip()
+
+    arguments: List[dict] = []
+    details: List[str] = []
+    for argument in _split_top_level(arguments_text, ","):
+        if not argument.strip():
+            continue
+        name, type_name, default, has_default = _split_declaration(argument)
+        entry: dict = {"name": name, "type": type_name or "var"}
+        detail: str = name + (": " + type_name if type_name else "")
+        if has_default:
+            entry["default_value"] = default
+            detail += " = " + _print_json(default)
+        elif "=" in argument:
+            entry["default_value"] = argument.partition("=")[2].strip()
+            detail += " = " + entry["default_value"]
+        arguments.append(entry)
+        details.append(detail)
+
+    signature: str = "func {}({})".format(match.group("name"), ", ".join(details))
+    if return_type:
+        signature += " -> " + return_type
+    function: dict = {
+        "name": match.group("name"),
+        "return_type": _get_type_name(return_type),
+        "rpc_mode": next((RPC_MODES[word] for word in keywords if word in RPC_MODES), 0),
+        "signature": signature,
+        "description": _get_documentation(lines, line),
+        "arguments": arguments,
+    }
+    gdscript["static_functions" if "static" in keywords else "methods"].append(function)
+
+
+def _make_member(match, lines: List[str], line: int) -> dict:
+    prefix: str = match.group("prefix")
+    declaration, _, setget = _partition_top_level(match.group("rest"), "setget")
+    setter, _, getter = setget.partition(",")
+    name, type_name, default, _ = _split_declaration(match.group("name") + declaration)
+
+    signature: str = "var " + name
+    if type_name:
+        signature += ": " + type_name
+    if default is not None:
+        signature += " = " + _print_json(default)
+    return {
+        "name": name,
+        "data_type": type_name or "var",
+        "default_value": default,
+        "setter": setter.strip(),
+        "getter": getter.strip(),
+        "export": re.search(r"(^|\s)@?export", prefix) is not None,
+        "signature": signature,
+        "description": _get_documentation(lines, line),
+    }
+
+
+def _make_constant(
+    name: str, type_name: Optional[str], expression: str, lines: List[str], line: int
+) -> dict:
+    is_constant, value, value_type = _evaluate(expression)
+    data_type: str = type_name or (value_type if is_constant else "")
+    signature: str = "const " + name
+    if data_type:
+        signature += ": " + data_type
+    signature += " = " + _print_json(value)
+    return {
+        "name": name,
+        "value": value,
+        "data_type": data_type or "var",
+        "signature": signature,
+        "description": _get_documentation(lines, line),
+    }
+
+
+def _make_enum(match, lines: List[str], line: int) -> List[dict]:
+    """Named enums are a Dictionary constant, unnamed ones one int constant per value."""
+    values: Dict[str, Any] = {}
+    next_value: int = 0
+    for item in _split_top_level(match.group("values"), ","):
+        key, _, expression = item.partition("=")
+        key = key.strip()
+        if not key:
+            continue
+        if expression.strip():
+            is_constant, value, _ = _evaluate(expression)
+            next_value = value if is_constant and isinstance(value, int) else next_value
+        values[key] = next_value
+        next_value += 1
+
+    if match.group("name"):
+        return [_make_constant_entry(match.group("name"), values, "Dictionary", lines, line)]
+    return [_make_constant_entry(key, value, "int", lines, line) for key, value in values.items()]
+
+
+def _make_constant_entry(name: str, value: Any, data_type: str, lines: List[str], line: int) -> dict:
+    return {
+        "name": name,
+        "value": value,
+        "data_type": data_type,
+        "signature": "const {}: {} = {}".format(name, data_type, _print_json(value)),
+        "description": _get_documentation(lines, line),
+    }
+
+
+def _make_signal(match, lines: List[str], line: int) -> dict:
+    arguments: List[str] = [
+        argument.split(":")[0].strip()
+        for argument in _split_top_level(match.group("arguments") or "", ",")
+        if argument.strip()
+    ]
+    return {
+        "name": match.group("name"),
+        "arguments": arguments,
+        "signature": "signal {}({})".format(match.group("name"), ", ".join(arguments)),
+        "description": _get_documentation(lines, line),
+    }
+
+
+def _split_declaration(text: str) -> Tuple[str, str, Any, bool]:
+    """
+    Splits `name`, `name: Type`, `name = value`, `name: Type = value` and
+    `name := value` into the name, the type, the constant default value or
+    None, and whether a constant default value was found.
+    """
+    head, equals, expression = text.partition("=")
+    name, colon, type_name = head.partition(":")
+    type_name = type_name.strip()
+    is_constant, value, value_type = _evaluate(expression) if equals else (False, None, "")
+    if colon and not type_name and is_constant:
+        type_name = value_type
+    return name.strip(), type_name, value if is_constant else None, is_constant
+
+
+def _evaluate(expression: str) -> Tuple[bool, Any, str]:
+    """
+    Returns whether `expression` is made of literals, its value as Godot
+    prints it to JSON and the name of its type.
+    """
+    expression = expression.strip()
+    try:
+        value: Any = _evaluate_node(ast.parse(expression, mode="eval").body)
+    except (SyntaxError, ValueError, TypeError, ZeroDivisionError):
+        return False, None, ""
+    return True, value[0], value[1]
+
+
+def _evaluate_node(node: ast.AST) -> Tuple[Any, str]:
+    if isinstance(node, ast.Constant):
+        value: Any = node.value
+        if isinstance(value, bool) or value is None:
+            raise ValueError("not a GDScript literal")
+        if isinstance(value, str):
+            return value, "String"
+        if isinstance(value, int):
+            return value, "int"
+        if isinstance(value, float):
+            return _to_json_number(value), "float"
+        raise ValueError("not a GDScript literal")
+    if isinstance(node, ast.Name):
+        if node.id in ("true", "false"):
+            return node.id == "true", "bool"
+        if node.id == "null":
+            return None, "null"
+        raise ValueError("not a constant: " + node.id)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        value, type_name = _evaluate_node(node.operand)
+        if type_name not in ("int", "float"):
+            raise ValueError("not a number")
+        return (-value if isinstance(node.op, ast.USub) else value), type_name
+    if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Sub, ast.Mult, ast.Div)):
+        left, left_type = _evaluate_node(node.left)
+        right, right_type = _evaluate_node(node.right)
+        if left_type not in ("int", "float") or right_type not in ("int", "float"):
+            raise ValueError("not a number")
+        type_name: str = "int" if left_type == right_type == "int" else "float"
+        if isinstance(node.op, ast.Div):
+            value = int(left / right) if type_name == "int" else left / right
+        else:
+            value = {ast.Add: left + right, ast.Sub: left - right, ast.Mult: left * right}[
+                type(node.op)
+            ]
+        return (_to_json_number(value) if type_name == "float" else value), type_name
+    if isinstance(node, ast.List):
+        return [_evaluate_node(item)[0] for item in node.elts], "Array"
+    if isinstance(node, ast.Dict):
+        return {
+            _print_key(_evaluate_node(key)[0]): _evaluate_node(value)[0]
+            for key, value in zip(node.keys, node.values)
+        }, "Dictionary"
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id in _CONSTRUCTORS
+        and not node.keywords
+    ):
+        numbers: List[Any] = [_evaluate_node(argument) for argument in node.args]
+        if any(type_name not in ("int", "float") for _, type_name in numbers):
+            raise ValueError("not a number")
+        return _print_constructor(node.func.id, [number for number, _ in numbers]), node.func.id
+    raise ValueError("not a constant expression")
+
+
+def _print_constructor(type_name: str, numbers: List[Any]) -> str:
+    """Returns the text Godot converts a Vector2, Vector3 or Color to in JSON."""
+    if type_name == "Color":
+        if len(numbers) not in (3, 4):
+            raise ValueError("invalid Color")
+        numbers = numbers + [1] * (4 - len(numbers))
+        return ", ".join(_print_number(number) for number in numbers)
+    if len(numbers) != _CONSTRUCTORS[type_name]:
+        raise ValueError("invalid " + type_name)
+    return "({})".format(", ".join(_print_number(number) for number in numbers))
+
+
+def _print_number(number: Any) -> str:
+    return "{:.14g}".format(number) if isinstance(number, float) else str(number)
+
+
+def _to_json_number(number: float) -> Any:
+    """Godot prints floats without a fraction as integers."""
+    return int(number) if number.is_integer() else number
+
+
+def _print_key(key: Any) -> str:
+    return key if isinstance(key, str) else _print_json(key)
+
+
+def _print_json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _get_type_name(type_name: str) -> str:
+    if not type_name:
+        return "var"
+    return "null" if type_name == "void" else type_name
+
+
+def _get_documentation(lines: List[str], line: int) -> str:
+    """
+    Returns the comment lines right above `line` followed by the comment at
+    the end of it, one per line, like the Godot language server.
+    """
+    documentation: List[str] = []
+    for index in range(line - 1, -1, -1):
+        text: str = lines[index].lstrip()
+        if not text.startswith("#"):
+            break
+        documentation.append(text[1:])
+    documentation.reverse()
+    comment: str = _find_comment(lines[line]) if line < len(lines) else ""
+    if len(comment) > 1:
+        documentation.append(comment[1:])
+    return "".join(text + "\n" for text in documentation)
+
+
+def _get_root_documentation(lines: List[str]) -> str:
+    documentation: List[str] = []
+    index: int = 0
+    while index < len(lines) and _ROOT_HEADER_PATTERN.match(lines[index].strip()):
+        index += 1
+    for text in lines[index:]:
+        text = text.lstrip()
+        if not text.startswith("#"):
+            break
+        documentation.append(text[1:])
+    return "".join(text + "\n" for text in documentation)
+
+
+def _find_comment(line: str) -> str:
+    """Returns the comment at the end of `line`, stripped, with its leading #."""
+    quote: str = ""
+    index: int = 0
+    while index < len(line):
+        character: str = line[index]
+        if quote:
+            if character == "\\":
+                index += 1
+            elif line.startswith(quote, index):
+                index += len(quote) - 1
+                quote = ""
+        elif line.startswith('"""', index):
+            quote = '"""'
+            index += 2
+        elif character in "\"'":
+            quote = character
+        elif character == "#":
+            return line[index:].strip()
+        index += 1
+    return ""
+
+
+def _iter_statements(lines: List[str]) -> Iterator[_Statement]:
+    """
+    Yields the statements of the script, joining the lines of expressions
+    that span several of them and dropping comments and blank lines.
+    """
+    statement: Optional[_Statement] = None
+    parts: List[str] = []
+    depth: int = 0
+    quote: str = ""
+    for number, line in enumerate(lines):
+        code: List[str] = []
+        index: int = 0
+        while index < len(line):
+            character: str = line[index]
+            if quote:
+                if character == "\\":
+                    code.append(line[index:index + 2])
+                    index += 2
+                    continue
+                if line.startswith(quote, index):
+                    code.append(quote)
+                    index += len(quote)
+                    quote = ""
+                    continue
+            elif line.startswith('"""', index):
+                quote = '"""'
+                code.append(quote)
+                index += 3
+                continue
+            elif character in "\"'":
+                quote = character
+            elif character == "#":
+                break
+            elif character in "([{":
+                depth += 1
+            elif character in ")]}":
+                depth = max(depth - 1, 0)
+            code.append(character)
+            index += 1
+        text: str = "".join(code).rstrip()
+
+        if statement is None:
+            if not text.strip():
+                continue
+            statement = _Statement(number, len(line) - len(line.lstrip()), "")
+        continued: bool = text.endswith("\\")
+        parts.append(text[:-1] if continued else text)
+        if depth > 0 or continued or (quote == '"""'):
+            continue
+        statement.code = " ".join(part.strip() for part in parts)
+        yield statement
+        statement = None
+        parts = []
+        quote = ""
+    if statement is not None:
+        statement.code = " ".join(part.strip() for part in parts)
+        yield statement
+
+
+def _split_top_level(text: str, separator: str) -> List[str]:
+    """Splits `text` on `separator` outside of brackets and strings."""
+    parts: List[str] = []
+    depth: int = 0
+    quote: str = ""
+    start: int = 0
+    index: int = 0
+    while index < len(text):
+        character: str = text[index]
+        if quote:
+            if character == "\\":
+                index += 1
+            elif character == quote:
+                quote = ""
+        elif character in "\"'":
+            quote = character
+        elif character in "([{":
+            depth += 1
+        elif character in ")]}":
+            depth -= 1
+        elif depth == 0 and text.startswith(separator, index):
+            parts.append(text[start:index])
+            start = index + len(separator)
+            index = start
+            continue
+        index += 1
+    parts.append(text[start:])
+    return parts
+
+
+def _partition_top_level(text: str, keyword: str) -> Tuple[str, str, str]:
+    """Partitions `text` on the word `keyword` outside of brackets and strings."""
+    parts: List[str] = _split_top_level(text, " " + keyword)
+    if len(parts) == 1 or not parts[1][:1].isspace():
+        return text, "", ""
+    return parts[0], keyword, (" " + keyword).join(parts[1:])
+
+
+def _split_closing(text: str) -> Tuple[str, str, str]:
+    """Partitions `text` on the parenthesis closing the one opened before it."""
+    depth: int = 1
+    quote: str = ""
+    index: int = 0
+    while index < len(text):
+        character: str = text[index]
+        if quote:
+            if character == "\\":
+                index += 1
+            elif character == quote:
+                quote = ""
+        elif character in "\"'":
+            quote = character
+        elif character in "([{":
+            depth += 1
+        elif character in ")]}":
+            depth -= 1
+            if depth == 0:
+                return text[:index], ")", text[index + 1:]
+        index += 1
+    return text, "", ""
+
+
+def _parse_scripts(project_root: str, paths: List[str]) -> List[dict]:
+    entries: List[dict] = []
+    for path in paths:
+        try:
+            with open(to_local_path(project_root, path), "r", encoding="utf-8") as script_file:
+                text: str = script_file.read()
+            entry: dict = parse_script(text, path)
+        except (OSError, UnicodeDecodeError, ValueError) as error:
+            LOGGER.warning("Could not parse {}: {}".format(path, error))
+            continue
+        if entry["name"] == "":
+            entry["name"] = path.rpartition("/")[2]
+        entries.append(entry)
+    return entries
+
+
+def extract_reference(
+    project_root: str, directories: List[str], jobs: int = 1
+) -> Tuple[dict, List[dict]]:
+    """
+    Returns the project information and the reference entry of each script of
+    the project, as the Godot collector would write them.
+
+    Keyword Arguments:
+    project_root: str       -- the directory holding project.godot
+    directories: List[str]  -- directories of the project to parse, all of it
+                               if empty
+    jobs: int               -- number of worker processes parsing the scripts
+    """
+    scripts: List[str] = find_scripts(project_root, directories)
+    LOGGER.info("Parsing {} scripts".format(len(scripts)))
+    batches: List[List[str]] = [
+        scripts[start:start + SCRIPTS_PER_TASK] for start in range(0, len(scripts), SCRIPTS_PER_TASK)
+    ]
+    entries: List[dict] = []
+    if jobs <= 1 or len(batches) <= 1:
+        for batch in batches:
+            entries.extend(_parse_scripts(project_root, batch))
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(batches))) as executor:
+            for batch_entries in executor.map(
+                _parse_scripts, [project_root] * len(batches), batches
+            ):
+                entries.extend(batch_entries)
+    return read_project_settings(project_root), entries
+
+
+def main():
+    parser: ArgumentParser = ArgumentParser(description=__doc__)
+    parser.add_argument("project", type=str, help="Path to the Godot project directory.")
+    parser.add_argument("-d", "--directory", type=str, action="append", default=[], help="A directory of the project to parse, like res://addons. Can be repeated.")
+    parser.add_argument("-o", "--output", type=str, default="", help="Path to the JSON file to write. Default: standard output.")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Number of worker processes. 0 uses one per CPU.")
+    args: Namespace = parser.parse_args()
+    project_root: str = find_project_root(args.project)
+    project, entries = extract_reference(
+        project_root, args.directory, args.jobs or os.cpu_count() or 1
+    )
+    project["classes"] = entries
+    text: str = json.dumps(project, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            output_file.write(text)
+    else:
+        sys.stdout.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
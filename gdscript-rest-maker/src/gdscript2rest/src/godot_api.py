@@ -0,0 +1,102 @@
+"""
+Index of the classes of the Godot built-in API, used to link types to the
+Godot documentation instead of to the project's own pages.
+
+The index of each supported Godot version ships with the package as a sorted
+text file holding one lower case class name per line.  It is only read the
+first time a name is looked up, and lookups are set membership tests.
+
+Running this module rebuilds an index file from a Godot source checkout's
+doc/classes directory or from a JSON file of class names:
+
+    python -m gdscript2rest.src.godot_api SOURCE OUTPUT
+"""
+
+import hashlib
+import json
+import os
+import sys
+from typing import FrozenSet, Iterable, List, Optional
+
+from .config import LOGGER
+
+DATA_DIRECTORY: str = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data"
+)
+
+GODOT_VERSIONS: List[str] = ["3", "4"]
+DEFAULT_GODOT_VERSION: str = "3"
+
+
+class GodotAPI:
+    def __init__(self, path: str):
+        """
+        Represents the index of the Godot built-in classes stored at `path`.
+
+        Keyword Arguments:
+        path: str -- a text index, or a JSON list or dictionary of class names
+        """
+        self.path: str = path
+        self._classes: Optional[FrozenSet[str]] = None
+
+    @staticmethod
+    def for_version(version: str) -> "GodotAPI":
+        """Returns the index shipped with the package for a Godot major version."""
+        return GodotAPI(os.path.join(DATA_DIRECTORY, "godot{}_classes.txt".format(version)))
+
+    def __contains__(self, name: str) -> bool:
+        return name.lower() in self.classes
+
+    def __iter__(self):
+        return iter(self.classes)
+
+    def __len__(self) -> int:
+        return len(self.classes)
+
+    @property
+    def classes(self) -> FrozenSet[str]:
+        if self._classes is None:
+            self._classes = frozenset(_read_index(self.path))
+            LOGGER.debug(
+                "Loaded {} Godot classes from {}".format(len(self._classes), self.path)
+            )
+        return self._classes
+
+    def fingerprint(self) -> str:
+        """Returns a hash of the content of the index."""
+        return hashlib.sha256("\n".join(sorted(self.classes)).encode("utf-8")).hexdigest()
+
+
+def _read_index(path: str) -> Iterable[str]:
+    with open(path, "r") as index_file:
+        if path.lower().endswith(".json"):
+            # dictionaries are keyed by class name, as in godot_api_calls.json
+            return [name.lower() for name in json.loads(index_file.read())]
+        return [line.strip() for line in index_file if line.strip()]
+
+
+def write_index(names: Iterable[str], path: str):
+    """Writes the class names to `path` in the text index format."""
+    with open(path, "w") as index_file:
+        index_file.write("\n".join(sorted({name.lower() for name in names})) + "\n")
+
+
+def _read_class_names(source: str) -> List[str]:
+    """
+    Returns the class names found in a Godot doc/classes directory, where each
+    class is documented in a <ClassName>.xml file, or in a JSON file.
+    """
+    if os.path.isdir(source):
+        return [
+            os.path.splitext(filename)[0]
+            for filename in os.listdir(source)
+            if filename.endswith(".xml")
+        ]
+    return list(_read_index(source))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print(__doc__)
+        sys.exit(1)
+    write_index(_read_class_names(sys.argv[1]), sys.argv[2])
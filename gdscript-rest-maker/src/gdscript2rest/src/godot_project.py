@@ -0,0 +1,78 @@
+"""
+Finds the scripts and settings of a Godot project on disk, for the options
+that collect the reference of a project without the Godot collector scripts.
+"""
+
+import json
+import os
+from typing import Any, List, Tuple
+
+PROJECT_FILENAME: str = "project.godot"
+
+# Scripts of the collector itself, skipped like Collector.find_files does.
+COLLECTOR_SCRIPTS: Tuple[str, ...] = ("Collector.gd", "ReferenceCollectorCLI.gd")
+
+
+def find_project_root(path: str) -> str:
+    """Returns the directory holding the project.godot file in or under `path`."""
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames.sort()
+        if PROJECT_FILENAME in filenames:
+            return dirpath
+    raise FileNotFoundError("Could not find a {} file in {}".format(PROJECT_FILENAME, path))
+
+
+def find_scripts(project_root: str, directories: List[str]) -> List[str]:
+    """
+    Returns the res:// paths of the GDScript files in `directories`, relative
+    to the project, or in the whole project if `directories` is empty.  Hidden
+    files and directories are skipped.
+    """
+    scripts: List[str] = []
+    for directory in directories or [""]:
+        top: str = os.path.join(project_root, directory.replace("res://", "", 1))
+        for dirpath, dirnames, filenames in os.walk(top):
+            dirnames[:] = sorted(name for name in dirnames if not name.startswith("."))
+            for filename in sorted(filenames):
+                if (
+                    filename.endswith(".gd")
+                    and not filename.startswith(".")
+                    and filename not in COLLECTOR_SCRIPTS
+                ):
+                    relative_path: str = os.path.relpath(
+                        os.path.join(dirpath, filename), project_root
+                    )
+                    scripts.append("res://" + relative_path.replace(os.sep, "/"))
+    return scripts
+
+
+def read_project_settings(project_root: str) -> dict:
+    """
+    Returns the name, description and version of the project from the
+    application section of its project.godot file, as Collector.get_reference
+    reads them from the ProjectSettings.
+    """
+    project: dict = {"name": "", "description": "", "version": None}
+    section: str = ""
+    with open(os.path.join(project_root, PROJECT_FILENAME), "r") as project_file:
+        for line in project_file:
+            line = line.strip()
+            if line.startswith("[") and line.endswith("]"):
+                section = line[1:-1]
+            elif section == "application" and line.startswith("config/"):
+                key, _, value = line[len("config/"):].partition("=")
+                if key in project:
+                    project[key] = _parse_setting(value)
+    return project
+
+
+def _parse_setting(value: str) -> Any:
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def to_local_path(project_root: str, path: str) -> str:
+    """Returns the path on disk of a res:// path of the project."""
+    return os.path.join(project_root, *path[len("res://"):].split("/"))
@@ -0,0 +1,159 @@
+"""
+Decodes the JSON reference files with a configurable decoder, for the
+--json-decoder option.
+
+The files are memory-mapped.  Decoders that read bytes get the mapping itself,
+the others a single string decoded from it, instead of the bytes read into
+a buffer and then decoded to a string.  The standard
+library's json module is used by default.  orjson and ujson are faster, and
+are used when asked for and installed.  "auto" picks the fastest installed
+one.  A decoder that is not installed falls back to the standard library.  A
+document a faster decoder rejects, for example one with an integer wider than
+64 bits or NaN, is decoded again with the standard library.
+"""
+
+import json
+import mmap
+from importlib import import_module
+from typing import Any, Callable, Dict, List, Optional
+
+from .config import LOGGER
+
+# Decoders the --json-decoder option accepts.  "auto" tries them in order.
+DECODERS: List[str] = ["orjson", "ujson", "json"]
+DECODER_CHOICES: List[str] = ["auto"] + DECODERS
+DEFAULT_DECODER: str = "json"
+
+
+class JSONDecoder:
+    def __init__(self, name: str, loads: Callable[[Any], Any], copies: bool):
+        """
+        A JSON decoding function and how to pass a file to it.
+
+        Keyword Arguments:
+        name: str         -- the name of the module providing `loads`
+        loads: Callable   -- decodes a JSON document
+        copies: bool      -- if True, `loads` needs a str or bytes: the mapped
+                             file is decoded to one str and unmapped before
+                             `loads` runs, so it is never held twice.
+                             Otherwise `loads` reads the mapping through a
+                             memoryview
+        """
+        self.name: str = name
+        self.loads: Callable[[Any], Any] = loads
+        self.copies: bool = copies
+
+    def decode(self, data: Any) -> Any:
+        try:
+            return self.loads(data)
+        except (ValueError, OverflowError):
+            if self.name == "json":
+                raise
+            LOGGER.debug("{} could not decode the document, using json".format(self.name))
+            return json.loads(data if isinstance(data, (str, bytes)) else bytes(data))
+
+    def open(self, path: str) -> "JSONFile":
+        """
+        Memory-maps the file at `path` and reads it into the form the decoder
+        takes.  For a decoder reading the mapping, the pages are only
+        requested ahead and may still be loaded while decoding.
+        """
+        with open(path, "rb") as json_file:
+            try:
+                mapped: mmap.mmap = mmap.mmap(json_file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped.
+                return JSONFile(self, json_file.read())
+        if self.copies:
+            with mapped:
+                return JSONFile(self, str(mapped, "utf-8"))
+        if hasattr(mmap, "MADV_WILLNEED"):
+            mapped.madvise(mmap.MADV_WILLNEED)
+        return JSONFile(self, memoryview(mapped), mapped)
+
+    def read(self, path: str) -> Any:
+        """Memory-maps the file at `path` and decodes it."""
+        with self.open(path) as json_file:
+            return json_file.decode()
+
+
+class JSONFile:
+    def __init__(self, decoder: JSONDecoder, content: Any, mapped: Optional[mmap.mmap] = None):
+        """
+        The content of a JSON file as a decoder takes it, see JSONDecoder.open.
+
+        Keyword Arguments:
+        decoder: JSONDecoder  -- the decoder the content is for
+        content: Any          -- a str, bytes, or a memoryview of `mapped`
+        mapped: mmap          -- the mapping of the file, closed with this
+        """
+        self.decoder: JSONDecoder = decoder
+        self.content: Any = content
+        self.mapped: Optional[mmap.mmap] = mapped
+
+    def __enter__(self) -> "JSONFile":
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def decode(self) -> Any:
+        return self.decoder.decode(self.content)
+
+    def close(self):
+        if self.mapped is not None:
+            self.content.release()
+            self.mapped.close()
+            self.mapped = None
+        self.content = None
+
+
+def _load_decoder(name: str) -> Optional[JSONDecoder]:
+    if name == "json":
+        return JSONDecoder("json", json.loads, True)
+    try:
+        module = import_module(name)
+    except ImportError:
+        return None
+    # orjson reads any buffer, ujson only str and bytes.
+    return JSONDecoder(name, module.loads, name != "orjson")
+
+
+_decoders: Dict[str, JSONDecoder] = {}
+
+
+def get_decoder(name: str = DEFAULT_DECODER) -> JSONDecoder:
+    """
+    Returns the decoder called `name`, the fastest installed one for "auto",
+    or the standard library if `name` is not installed.
+    """
+    if name in _decoders:
+        return _decoders[name]
+    decoder: Optional[JSONDecoder] = None
+    for candidate in DECODERS if name == "auto" else [name]:
+        decoder = _load_decoder(candidate)
+        if decoder:
+            break
+    if decoder is None:
+        LOGGER.warning("The {} module is not installed, decoding JSON with json".format(name))
+        decoder = _load_decoder("json")
+    _decoders[name] = decoder
+    return decoder
+
+
+decoder: JSONDecoder = get_decoder()
+
+
+def set_json_decoder(name: str):
+    global decoder
+    decoder = get_decoder(name)
+
+
+def open_json(path: str) -> JSONFile:
+    """Reads the JSON file at `path` for the configured decoder."""
+    return decoder.open(path)
+
+
+def read_json(path: str) -> Any:
+    """Decodes the JSON file at `path` with the configured decoder."""
+    return decoder.read(path)
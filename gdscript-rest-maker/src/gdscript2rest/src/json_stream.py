@@ -0,0 +1,196 @@
+"""
+Incremental readers for the JSON reference dumped by Godot.
+
+The reference is decoded one class at a time instead of loading the whole
+document, so memory use stays bounded by the size of the largest class rather
+than the size of the project.  Two input layouts are supported:
+
+- a regular reference.json, whose top level object holds the project
+  information and a `classes` array;
+- newline-delimited JSON (.ndjson or .jsonl), with one class per line.  An
+  optional line of the form {"project": {"name": ..., "description": ...,
+  "version": ...}} provides the project information;
+- a shard directory written by the Godot collector, with one compact JSON file
+  per class and a project.json manifest holding the project information and
+  the list of shards, in order, under `shards`.
+"""
+
+import json
+import os
+from typing import IO, Any, Iterator, List, Optional, Tuple
+
+from .json_decoder import read_json
+
+CHUNK_SIZE: int = 1 << 16
+
+NDJSON_EXTENSIONS: Tuple[str, ...] = (".ndjson", ".jsonl")
+
+# Name of the manifest of a shard directory.
+SHARD_MANIFEST: str = "project.json"
+
+_WHITESPACE: str = " \t\n\r"
+
+
+def is_ndjson(path: str) -> bool:
+    """Returns True if the path names a newline-delimited JSON file."""
+    return path.lower().endswith(NDJSON_EXTENSIONS)
+
+
+def is_shard_directory(path: str) -> bool:
+    """Returns True if the path names a shard directory."""
+    return os.path.isfile(os.path.join(path, SHARD_MANIFEST))
+
+
+def read_shard_manifest(path: str) -> Tuple[dict, List[str]]:
+    """
+    Returns the project information of the shard directory at `path` and the
+    paths of its shards, in order.
+    """
+    with open(os.path.join(path, SHARD_MANIFEST), "r") as manifest_file:
+        project: dict = json.loads(manifest_file.read())
+    shards: List[str] = project.pop("shards")
+    return project, [os.path.join(path, shard) for shard in shards]
+
+
+def get_reference_files(path: str) -> List[str]:
+    """Returns the files the reference at `path` is read from."""
+    if not is_shard_directory(path):
+        return [path]
+    return [os.path.join(path, SHARD_MANIFEST)] + read_shard_manifest(path)[1]
+
+
+def get_stamp(path: str) -> Optional[Tuple[int, int]]:
+    """Returns the modification time and size of a file, None if it does not exist."""
+    try:
+        stat: os.stat_result = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def read_shard(path: str) -> dict:
+    return read_json(path)
+
+
+def iter_reference(path: str) -> Iterator[Tuple[str, Any]]:
+    """
+    Lazily decodes the reference file or shard directory at `path`.
+
+    Yields a `("classes", class_data)` pair for every class in the file and a
+    `(key, value)` pair for every other top level entry, such as the project
+    name, description and version.
+    """
+    if is_shard_directory(path):
+        project, shards = read_shard_manifest(path)
+        yield from project.items()
+        for shard in shards:
+            yield "classes", read_shard(shard)
+        return
+
+    with open(path, "r") as json_file:
+        if is_ndjson(path):
+            yield from _iter_ndjson(json_file)
+        else:
+            yield from _iter_document(_Buffer(json_file))
+
+
+def _iter_ndjson(json_file: IO[str]) -> Iterator[Tuple[str, Any]]:
+    for line in json_file:
+        if not line.strip():
+            continue
+        entry: dict = json.loads(line)
+        if "project" in entry:
+            yield from entry["project"].items()
+        else:
+            yield "classes", entry
+
+
+def _iter_document(buffer: "_Buffer") -> Iterator[Tuple[str, Any]]:
+    buffer.expect("{")
+    if buffer.peek() == "}":
+        return
+    while True:
+        key: str = buffer.decode()
+        buffer.expect(":")
+        if key == "classes" and buffer.peek() == "[":
+            buffer.expect("[")
+            if buffer.peek() == "]":
+                buffer.expect("]")
+            else:
+                while True:
+                    yield key, buffer.decode()
+                    if buffer.expect(",]") == "]":
+                        break
+        else:
+            yield key, buffer.decode()
+        if buffer.expect(",}") == "}":
+            return
+
+
+class _Buffer:
+    """
+    A window over a text file that hands out complete JSON values.
+
+    Values are decoded with `json.JSONDecoder.raw_decode`.  When a value runs
+    past the end of the window, the window grows geometrically so a large
+    value is only re-scanned a logarithmic number of times.
+    """
+
+    def __init__(self, json_file: IO[str]):
+        self.file: IO[str] = json_file
+        self.text: str = ""
+        self.pos: int = 0
+        self.eof: bool = False
+        self.decoder: json.JSONDecoder = json.JSONDecoder()
+
+    def _fill(self, size: int = 0) -> bool:
+        """Appends up to `size` characters to the window, returns False at EOF."""
+        if self.eof:
+            return False
+        chunk: str = self.file.read(size or CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.text = self.text[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skips whitespace and returns the next character, or "" at EOF."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, characters: str) -> str:
+        """Consumes and returns the next character, which must be one of `characters`."""
+        character: str = self.peek()
+        if not character or character not in characters:
+            raise json.JSONDecodeError(
+                "Expecting one of '{}'".format(characters), self.text, self.pos
+            )
+        self.pos += 1
+        return character
+
+    def decode(self) -> Any:
+        """Decodes and consumes the next JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.text, self.pos)
+                # A number that ends with the window may continue in the file.
+                if end < len(self.text) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill(max(CHUNK_SIZE, len(self.text) - self.pos))
+
+
+def project_name_from_path(path: str) -> str:
+    """Returns the file name of `path` without its extension."""
+    return os.path.splitext(os.path.basename(os.path.normpath(path)))[0]
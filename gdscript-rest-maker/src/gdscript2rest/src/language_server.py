@@ -0,0 +1,235 @@
+"""
+Collects the reference of a Godot project from the GDScript language server of
+a running Godot editor, for the --language-server option.
+
+The editor listens on 127.0.0.1:6008 by default.  Its language server forwards
+the requests of the `workspace/` scope to the same GDScriptWorkspace object the
+Godot collector scripts use, so `workspace/generate_script_api` returns the
+exact entries the collector writes to reference.json, without starting an
+editor for every run.
+
+Messages use the JSON-RPC framing of the Language Server Protocol: a
+`Content-Length` header, a blank line and the JSON body.  The client keeps one
+connection open and pipelines requests, as the editor only handles one message
+per frame.
+"""
+
+import json
+import os
+import socket
+from collections import deque
+from typing import IO, Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .config import LOGGER
+from .godot_project import find_scripts, read_project_settings
+
+DEFAULT_HOST: str = "127.0.0.1"
+DEFAULT_PORT: int = 6008
+
+# Seconds to wait for a response before giving up.
+DEFAULT_TIMEOUT: float = 30.0
+
+# Number of requests sent ahead of the responses read.
+PIPELINE_SIZE: int = 32
+
+
+class LanguageServerError(Exception):
+    """Raised when the language server cannot be reached or returns an error."""
+
+
+def parse_address(address: str) -> Tuple[str, int]:
+    """
+    Returns the host and port of an address given as HOST:PORT, HOST or PORT.
+    An IPv6 host is written in brackets when a port follows, as in [::1]:6008.
+    """
+    if address.startswith("["):
+        host, bracket, port = address[1:].partition("]")
+        if not bracket or port and not (port[:1] == ":" and port[1:].isdigit()):
+            raise LanguageServerError(
+                "Invalid language server address {}, expected [HOST]:PORT".format(address)
+            )
+        port = port[1:]
+    elif address.count(":") > 1:
+        # An IPv6 host without a port.
+        host, port = address, ""
+    else:
+        host, _, port = address.rpartition(":") if ":" in address else ("", "", address)
+        if not port.isdigit():
+            host, port = address, ""
+    return host or DEFAULT_HOST, int(port) if port else DEFAULT_PORT
+
+
+class LanguageServerClient:
+    def __init__(
+        self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, timeout: float = DEFAULT_TIMEOUT
+    ):
+        """
+        A connection to a GDScript language server.
+
+        Keyword Arguments:
+        host: str       -- the host the editor listens on
+        port: int       -- the port the editor listens on
+        timeout: float  -- seconds to wait for the server before giving up
+        """
+        self.host: str = host
+        self.port: int = port
+        self.timeout: float = timeout
+        self._socket: Optional[socket.socket] = None
+        self._reader: Optional[IO[bytes]] = None
+        self._next_id: int = 1
+
+    def __enter__(self) -> "LanguageServerClient":
+        self.connect()
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def connect(self):
+        try:
+            self._socket = socket.create_connection((self.host, self.port), self.timeout)
+        except OSError as error:
+            raise LanguageServerError(
+                "Could not connect to the language server at {}:{}: {}".format(
+                    self.host, self.port, error
+                )
+            )
+        self._reader = self._socket.makefile("rb")
+        LOGGER.info("Connected to the language server at {}:{}".format(self.host, self.port))
+
+    def close(self):
+        if self._reader:
+            self._reader.close()
+            self._reader = None
+        if self._socket:
+            self._socket.close()
+            self._socket = None
+
+    def initialize(self, project_root: str) -> dict:
+        """Performs the initialize handshake for the project and returns the server capabilities."""
+        root_uri: str = "file://" + os.path.abspath(project_root).replace(os.sep, "/")
+        result: dict = self.request(
+            "initialize",
+            {"processId": os.getpid(), "rootUri": root_uri, "capabilities": {}},
+        )
+        self.notify("initialized", {})
+        return result or {}
+
+    def request(self, method: str, params: Any) -> Any:
+        """Sends a request and returns the result of its response."""
+        return next(self.request_all(method, [params]))
+
+    def request_all(self, method: str, params_list: Iterable[Any]) -> Iterator[Any]:
+        """
+        Sends one request per item of `params_list`, with up to PIPELINE_SIZE
+        requests in flight, and yields the results in order.
+        """
+        pending: Deque[int] = deque()
+        params_iterator: Iterator[Any] = iter(params_list)
+        responses: Dict[int, dict] = {}
+        while True:
+            for params in params_iterator:
+                pending.append(self._send(method, params, self._take_id()))
+                if len(pending) >= PIPELINE_SIZE:
+                    break
+            if not pending:
+                return
+            request_id: int = pending.popleft()
+            while request_id not in responses:
+                message: dict = self._receive()
+                if "id" in message and ("result" in message or "error" in message):
+                    responses[message["id"]] = message
+            response: dict = responses.pop(request_id)
+            if "error" in response:
+                raise LanguageServerError(
+                    "{} failed: {}".format(method, response["error"].get("message", response["error"]))
+                )
+            yield response.get("result")
+
+    def notify(self, method: str, params: Any):
+        self._send(method, params, None)
+
+    def _take_id(self) -> int:
+        request_id: int = self._next_id
+        self._next_id += 1
+        return request_id
+
+    def _send(self, method: str, params: Any, request_id: Optional[int]) -> Optional[int]:
+        message: dict = {"jsonrpc": "2.0", "method": method, "params": params}
+        if request_id is not None:
+            message["id"] = request_id
+        try:
+            self._socket.sendall(encode_message(message))
+        except OSError as error:
+            raise LanguageServerError("Could not send {}: {}".format(method, error))
+        return request_id
+
+    def _receive(self) -> dict:
+        try:
+            message: Optional[dict] = read_message(self._reader)
+        except (OSError, ValueError) as error:
+            raise LanguageServerError("Could not read from the language server: {}".format(error))
+        if message is None:
+            raise LanguageServerError("The language server closed the connection")
+        return message
+
+
+def encode_message(message: dict) -> bytes:
+    body: bytes = json.dumps(message).encode("utf-8")
+    return "Content-Length: {}\r\n\r\n".format(len(body)).encode("ascii") + body
+
+
+def read_message(reader: IO[bytes]) -> Optional[dict]:
+    """Reads one framed message, returns None if the stream ended before it."""
+    length: int = -1
+    while True:
+        line: bytes = reader.readline()
+        if not line:
+            return None
+        line = line.strip()
+        if not line:
+            break
+        name, _, value = line.decode("ascii").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    if length < 0:
+        raise ValueError("message without a Content-Length header")
+    body: bytes = reader.read(length)
+    if len(body) < length:
+        return None
+    return json.loads(body.decode("utf-8"))
+
+
+def collect_reference(
+    client: LanguageServerClient,
+    project_root: str,
+    directories: List[str],
+    refresh: bool = False,
+) -> Tuple[dict, List[dict]]:
+    """
+    Returns the project information and the reference entry of each script of
+    the project, as the Godot collector would write them.
+
+    Keyword Arguments:
+    client: LanguageServerClient  -- a connected client
+    project_root: str             -- the directory holding project.godot
+    directories: List[str]        -- directories of the project to collect,
+                                     all of it if empty
+    refresh: bool                 -- if True, ask the editor to parse each
+                                     script again first
+    """
+    scripts: List[str] = find_scripts(project_root, directories)
+    LOGGER.info("Requesting the symbols of {} scripts".format(len(scripts)))
+    client.initialize(project_root)
+    if refresh:
+        list(client.request_all("workspace/parse_local_script", scripts))
+
+    entries: List[dict] = []
+    for script, entry in zip(scripts, client.request_all("workspace/generate_script_api", scripts)):
+        if not entry:
+            LOGGER.warning("The language server returned no symbols for " + script)
+            continue
+        if entry["name"] == "":
+            entry["name"] = script.rpartition("/")[2]
+        entries.append(entry)
+    return read_project_settings(project_root), entries
@@ -2,42 +2,367 @@
 """
 from argparse import RawDescriptionHelpFormatter
 from os import name
+import io
 import re
-import json
-from dataclasses import dataclass
-from typing import Dict, List, Any
+from dataclasses import dataclass, field
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 import logging
 from .config import LOG_LEVELS, LOGGER
+from .godot_api import DEFAULT_GODOT_VERSION, GodotAPI
 from .utils import ratify_class_name
 
-api_ref = {}
+# The role and target of a link, like ("ref", "class_Player").
+Link = Tuple[str, str]
+
+
+class LinkResolver:
+    def __init__(self, api: GodotAPI, use_domain: bool = False):
+        """
+        Turns type names into links, either to the Godot documentation or to
+        the project's own pages.  Each distinct name is resolved once and the
+        link is memoized, as a project only uses a few hundred type names.
+
+        Keyword Arguments:
+        api: GodotAPI     -- the Godot built-in classes
+        use_domain: bool  -- if True, link the project's classes with the
+                             roles of the gdscript Sphinx domain
+        """
+        self.api: GodotAPI = api
+        self.use_domain: bool = use_domain
+        self.links: Dict[str, str] = {}
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def resolve(self, description: str) -> str:
+        link: str = self.links.get(description)
+        if link is None:
+            self.misses += 1
+            link = self.links[description] = self._make_link(description)
+        else:
+            self.hits += 1
+        return link
+
+    def resolve_all(self, descriptions: Iterable[str]):
+        """Resolves every name that is not resolved yet."""
+        for description in descriptions:
+            if description not in self.links:
+                self.resolve(description)
+
+    def get_statistics(self) -> Dict[str, int]:
+        return {"links": len(self.links), "hits": self.hits, "misses": self.misses}
+
+    def _make_link(self, description: str) -> str:
+        if description == "var" or description == 'void':
+            return description
+
+        api_key: str = description.lower()
+        if api_key in self.api:
+            LOGGER.info(
+                "found ref, link is {}".format(api_key)
+            )
+            return ":godot_class:`{} <{}>`".format(description, description.lower())
+        elif self.use_domain:
+            return ":gdscript:class:`{}`".format(description)
+        else:
+            link_target = make_class_label(description)
+            return ":ref:`{} <{}>`".format(description, link_target)
+
+
+# Matches [Name], [Name.name], [Outer.Inner.name]... but not indexing such as
+# array[index], where the bracket follows a word.
+REFERENCE_PATTERN: re.Pattern = re.compile(
+    r"(?<!\w)\[([A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)*)\]"
+)
+
+REFERENCE_ERROR_TAIL: str = "  The name might be incorrect."
+
+# BBCode tags of Godot's documentation, which look like references but are not.
+BBCODE_TAGS: Set[str] = {
+    "b", "i", "u", "s", "br", "lb", "rb", "code", "codeblock", "codeblocks", "center",
+    "kbd", "url", "img", "indent", "sup", "sub", "table", "cell", "color", "font",
+    "gdscript", "csharp",
+}
+
+
+class ReferenceResolver:
+    def __init__(self, classes: Iterable):
+        """
+        Turns the references written in descriptions, [ClassName], [symbol]
+        and [ClassName.symbol], into links to the generated pages.  The labels
+        of every class, inner class and symbol are indexed once, and each
+        description is rewritten in a single pass.
+
+        Keyword Arguments:
+        classes: GDScriptClasses -- the classes of the project, or their summaries
+        """
+        self.classes = classes
+        self.class_labels: Dict[str, Link] = {}
+        self.symbol_labels: Dict[str, Dict[str, Link]] = {}
+        # Top level classes are indexed first so an inner class never takes
+        # the place of a top level class with the same name.
+        for gdscript in classes:
+            self._index_class(gdscript, "")
+        for gdscript in classes:
+            for sub_class in gdscript.sub_classes:
+                self._index_class(sub_class, gdscript.name)
+
+    def _index_class(self, gdscript, outer_name: str):
+        """
+        Indexes the class under its own name and, for inner classes, under
+        Outer.Inner.  The first class with a given name wins.  Only the inner
+        classes of top level classes have their own section in the pages.
+        """
+        full_name: str = outer_name + "." + gdscript.name if outer_name else gdscript.name
+        labels: Dict[str, Link] = {
+            symbol: get_symbol_link(gdscript.name, kind, symbol, full_name)
+            for symbol, kind in gdscript.symbols.items()
+        }
+        for name in (full_name, gdscript.name):
+            self.class_labels.setdefault(name, get_class_link(full_name))
+            self.symbol_labels.setdefault(name, labels)
+
+    def resolve(self, description: str, class_name: str) -> str:
+        """
+        Returns the description with its references replaced by links.  Symbols
+        without a class are looked up in `class_name` and its ancestors.
+        References that can't be resolved are reported and left as they are.
+        """
+        if "[" not in description:
+            return description
+        return REFERENCE_PATTERN.sub(
+            lambda match: self._make_link(match.group(1), class_name) or match.group(0),
+            description,
+        )
+
+    def _make_link(self, reference: str, class_name: str) -> Optional[str]:
+        if reference in BBCODE_TAGS:
+            return None
+        if "." not in reference:
+            label: Optional[Link] = self._find_symbol(class_name, reference)
+            if label is None:
+                label = self.class_labels.get(reference)
+            if label is not None:
+                return format_link(reference, label)
+            if reference in api_ref:
+                return make_link(reference)
+            LOGGER.warning(
+                "Reference [{}] in {} matches no class or symbol.".format(
+                    reference, class_name
+                ) + REFERENCE_ERROR_TAIL
+            )
+            return None
+
+        if reference in self.class_labels:
+            return format_link(reference, self.class_labels[reference])
+        owner, symbol = reference.rsplit(".", 1)
+        if owner not in self.class_labels:
+            LOGGER.warning(
+                "Class {} not found in the class index.".format(owner) + REFERENCE_ERROR_TAIL
+            )
+            return None
+        label = self._find_symbol(owner, symbol)
+        if label is None:
+            LOGGER.warning(
+                "Symbol {} not found in {}.".format(symbol, owner) + REFERENCE_ERROR_TAIL
+            )
+            return None
+        return format_link(reference, label)
+
+    def _find_symbol(self, class_name: str, symbol: str) -> Optional[Link]:
+        """
+        Returns the label of `symbol` in the class or in the closest ancestor
+        defining it.
+        """
+        if class_name not in self.class_labels:
+            return None
+        ancestry: Tuple[str, ...] = self.classes.get_ancestry(class_name)
+        for name in ancestry:
+            labels: Optional[Dict[str, Link]] = self.symbol_labels.get(name)
+            if labels is None:
+                break
+            if symbol in labels:
+                return labels[symbol]
+        return None
+
+
+def make_class_label(name: str) -> str:
+    """Returns the label of a class page, or of an Outer.Inner class section."""
+    return "class_" + name.replace(".", "_")
+
+
+def make_symbol_label(class_name: str, kind: str, symbol: str) -> str:
+    """Returns the label put before the description of a symbol of a class."""
+    if kind == "enum":
+        return "enum_{}_{}".format(class_name, symbol)
+    return "class_{}_{}_{}".format(class_name, kind, symbol)
+
+
+# Roles of the gdscript Sphinx domain by kind of symbol.
+DOMAIN_ROLES: Dict[str, str] = {
+    "property": "prop",
+    "method": "meth",
+    "signal": "signal",
+    "enum": "enum",
+    "constant": "const",
+}
+
+
+def get_class_link(full_name: str) -> Link:
+    """Returns the link to a class page, or to an Outer.Inner class section."""
+    if sphinx_domain:
+        return "gdscript:class", full_name
+    return "ref", make_class_label(full_name)
+
+
+def get_symbol_link(class_name: str, kind: str, symbol: str, full_name: str = "") -> Link:
+    """
+    Returns the link to the description of a symbol of a class.  The domain
+    names the symbols of an inner class after its `full_name`, Outer.Inner.
+    """
+    if sphinx_domain:
+        return "gdscript:" + DOMAIN_ROLES[kind], (full_name or class_name) + "." + symbol
+    return "ref", make_symbol_label(class_name, kind, symbol)
+
+
+def format_link(text: str, link: Link) -> str:
+    return ":{}:`{} <{}>`".format(link[0], text, link[1])
+
+
+# The Godot built-in classes, loaded on the first lookup.
+api_ref: GodotAPI = GodotAPI.for_version(DEFAULT_GODOT_VERSION)
+
+# Whether the pages use the directives and roles of the gdscript Sphinx
+# domain instead of plain labels and :ref: links.
+sphinx_domain: bool = False
+
+link_resolver: LinkResolver = LinkResolver(api_ref)
+
+
+def set_godot_api(api: GodotAPI):
+    """
+    Sets the index of Godot built-in classes used to resolve links, which
+    resets the memoized links.
+    """
+    global api_ref, link_resolver
+    api_ref = api
+    link_resolver = LinkResolver(api, sphinx_domain)
+
+
+def set_sphinx_domain(enabled: bool):
+    """
+    Sets whether the pages use the gdscript Sphinx domain, which resets the
+    memoized links.
+    """
+    global sphinx_domain, link_resolver
+    sphinx_domain = enabled
+    link_resolver = LinkResolver(api_ref, enabled)
+
+
+def make_directive(
+    name: str, argument: str, options: List[Tuple[str, str]], content: List[str]
+) -> List[str]:
+    """
+    Returns the lines of a directive of the gdscript Sphinx domain, with its
+    options and its content indented below it.
+    """
+    lines: List[str] = [".. gdscript:{}:: {}".format(name, argument)]
+    lines.extend("   :{}:{}".format(option, " " + value if value else "") for option, value in options)
+    lines.append("")
+    for line in content:
+        lines.extend("   " + text if text.strip() else "" for text in line.split("\n"))
+    lines.append("")
+    return lines
+
+
+class BlankLineWriter:
+    def __init__(self, file: IO[str]):
+        """
+        Writes lines to a text file, collapsing runs of empty lines into one
+        as it goes, so that documents never have to be joined into a string.
+        The output is the same as joining the lines with newlines and
+        replacing every run of two or more newlines with two.
+
+        Keyword Arguments:
+        file: IO[str] -- the file written to
+        """
+        self.file: IO[str] = file
+        self._newlines: int = 0
+        self._started: bool = False
+
+    def write_line(self, line: str):
+        if self._started:
+            self._newlines += 1
+        self._started = True
+        stripped: str = line.strip("\n")
+        if not stripped:
+            self._newlines += len(line)
+            return
+        leading: int = len(line) - len(line.lstrip("\n"))
+        self.file.write("\n" * min(self._newlines + leading, 2))
+        self.file.write(
+            re.sub(r"\n\n+", "\n\n", stripped) if "\n\n" in stripped else stripped
+        )
+        self._newlines = len(line) - leading - len(stripped)
+
+    def write_lines(self, lines: Iterable[str]):
+        for line in lines:
+            self.write_line(line)
+
+    def close(self):
+        """Writes the pending newlines at the end of the document."""
+        self.file.write("\n" * min(self._newlines, 2))
+        self._newlines = 0
+
 
-with open("godot_api_calls.json", "r") as api_json:
-    api_ref: list = json.loads(api_json.read())
-    LOGGER.debug(
-        "api_ref is {}".format(type(api_ref))
-    )
-    
 @dataclass
 class RestructuredDocument:
     title: str
     doc_ref: str
-    content: List[str]
+    # lines, or sections which are written line by line
+    content: List[Union[str, "RestructuredSection"]]
+    # seconds a worker process took to render the document, for --profile
+    render_seconds: Optional[float] = field(default=None, compare=False)
 
     def get_filename(self):
-        return ratify_class_name(self.title) + ".rst"
+        return RestructuredDocument.filename_for(self.title)
+
+    @staticmethod
+    def filename_for(title: str) -> str:
+        """Returns the name of the file a document with this title is saved to."""
+        return ratify_class_name(title) + ".rst"
+
+    def get_lines(self) -> Iterator[str]:
+        for entry in self.content:
+            if isinstance(entry, RestructuredSection):
+                yield from entry.as_text()
+            else:
+                yield entry
+
+    def write_to(self, file: IO[str]):
+        """
+        Writes the document to a text file section by section, removing
+        duplicate empty lines.
+        """
+        writer: BlankLineWriter = BlankLineWriter(file)
+        for entry in self.content:
+            if isinstance(entry, RestructuredSection):
+                entry.write_to(writer)
+            else:
+                writer.write_line(entry)
+        writer.close()
 
     def as_string(self) -> str:
         """
         Removes duplicate empty lines from the document and returns it as a
         string.
         """
-        text: str = "\n".join(self.content)
-        return re.sub(r"\n\n+", "\n\n", text)
+        buffer: io.StringIO = io.StringIO()
+        self.write_to(buffer)
+        return buffer.getvalue()
 
     def __repr__(self):
         return "RestructuredDocument(title={}, doc_ref={} content={})".format(
-            self.title, self.doc_ref,  "\\n".join(self.content)[:120] + "..."
+            self.title, self.doc_ref,  "\\n".join(self.get_lines())[:120] + "..."
         )
 
 
@@ -60,6 +385,11 @@ class RestructuredSection:
     def as_text(self) -> List[str]:
         return self.title + self.content if not self.is_empty() else []
 
+    def write_to(self, writer: BlankLineWriter):
+        if not self.is_empty():
+            writer.write_lines(self.title)
+            writer.write_lines(self.content)
+
 
 def wrap_in_newlines(restructured: List[str] = []) -> List[str]:
     return ["", *restructured, ""]
@@ -126,18 +456,7 @@ def make_code_block(text: str, language: str = "gdscript") -> str:
 
 
 def make_link(description: str) -> str:
-    if description == "var" or description == 'void':
-        return description
-
-    api_key: str = description.lower()
-    if api_key in api_ref:
-        LOGGER.info(
-            "found ref, link is {}".format(api_ref[api_key])
-        )
-        return ":godot_class:`{} <{}>`".format(description, description.lower())
-    else:
-        link_target = "class_" + description
-        return ":ref:`{} <{}>`".format(description, link_target)
+    return link_resolver.resolve(description)
 
 
 def make_list(
@@ -160,12 +479,56 @@ def make_table_row(cells: List[str]) -> str:
     return " | ".join(cells)
 
 
-def make_prop_table(props: List[str], class_name: str) -> List[str]:
-    table_items: List[Dict] = []
-    exp_length: int = 0
-    type_length: int = 0
-    name_length: int = 0
-    default_length: int = 7
+class GridTable:
+    def __init__(
+        self, min_widths: Tuple[int, ...], rows: Optional[List[Tuple[str, ...]]] = None
+    ):
+        """
+        Builds a reStructuredText grid table with a separator after every row.
+        The width of each column is measured over all its cells in one pass
+        when rendering, and each row is padded with a single format call.
+
+        Keyword Arguments:
+        min_widths: Tuple[int, ...] -- the minimum width of the cells of each
+                                       column, without the space around them
+        rows: List[Tuple[str, ...]] -- the first rows of the table
+        """
+        self.min_widths: Tuple[int, ...] = min_widths
+        self.rows: List[Tuple[str, ...]] = rows if rows is not None else []
+
+    def add_row(self, cells: Tuple[str, ...]):
+        self.rows.append(cells)
+
+    def get_widths(self) -> Tuple[int, ...]:
+        """Returns the width of the cells of each column."""
+        if not self.rows:
+            return self.min_widths
+        return tuple(map(max, self.min_widths, *[map(len, row) for row in self.rows]))
+
+    def render(self) -> List[str]:
+        separator, row_format = _get_table_layout(self.get_widths())
+        table: List[str] = [separator] * (2 * len(self.rows) + 1)
+        table[1::2] = [row_format % row for row in self.rows]
+        return table
+
+
+# Separator and row format of the tables, by cell widths.
+_table_layouts: Dict[Tuple[int, ...], Tuple[str, str]] = {}
+
+
+def _get_table_layout(widths: Tuple[int, ...]) -> Tuple[str, str]:
+    layout: Optional[Tuple[str, str]] = _table_layouts.get(widths)
+    if layout is None:
+        layout = _table_layouts[widths] = (
+            "+" + "+".join(["-" * (width + 2) for width in widths]) + "+",
+            # one format spec per column pads all the cells of a row at once
+            "| " + " | ".join(["%-{}s".format(width) for width in widths]) + " |",
+        )
+    return layout
+
+
+def make_prop_table(props: List[str], class_name: str, full_name: str = "") -> List[str]:
+    table: GridTable = GridTable((0, 0, 0, 5))
     for prop in props:
         prop_exported = "**export**" if prop.is_exported else ""
         prop_type: str = make_link(prop.type)
@@ -174,43 +537,18 @@ def make_prop_table(props: List[str], class_name: str) -> List[str]:
                                                             class_name,
                                                             prop.name.lower()
                                                         )
-        prop_def: str = "``{}``".format(prop.default_value) if prop.default_value else ""
-        table_items.append({"exported": prop_exported, "type": prop_type, "name": prop_name, "default": prop_def})
-    
-    for item in table_items:
-        e_len = len(item["exported"]) +2
-        t_len = len(item["type"]) + 2
-        n_len = len(item["name"]) + 2
-        d_len = len(item["default"]) + 2
-        if e_len > exp_length: exp_length = e_len
-        if t_len > type_length: type_length = t_len
-        if n_len > name_length: name_length = n_len
-        if d_len > default_length: default_length = d_len
-
-    table_separator: str = "+{}+{}+{}+{}+".format(
-        "-" * exp_length, "-" * name_length, "-" * type_length, "-" * default_length
-        )
-    
-    table: List[str] =[]
-    table.append(table_separator)
-    for row in table_items:
-        item_row: str = "| {} | {} | {} | {} |".format(
-                row["exported"] + " " * (exp_length - len(row["exported"]) - 2),
-                row["name"] + " " * (name_length - len(row["name"]) - 2),
-                (row["type"] + " " * (type_length - len(row["type"]) - 2)) if row["type"] is not "var " else " var ",
-                row["default"] + " " * (default_length - len(row["default"]) - 2)
+        if sphinx_domain:
+            prop_name = ":gdscript:prop:`{} <{}.{}>`".format(
+                prop.name.lower(), full_name or class_name, prop.name
             )
+        prop_def: str = "``{}``".format(prop.default_value) if prop.default_value else ""
+        table.add_row((prop_exported, prop_name, prop_type, prop_def))
 
-        table.append(item_row)
-        table.append(table_separator)
-
-    return table
+    return table.render()
 
 
-def make_func_table(funcs: List[str], class_name: str) -> List[str]:
-    table_items: List[Dict] = []
-    ret_type_len: int = 0
-    func_call_len: int = 0
+def make_func_table(funcs: List[str], class_name: str, full_name: str = "") -> List[str]:
+    table: GridTable = GridTable((0, 0))
 
     for func in funcs:
         ret_type: str = None
@@ -219,7 +557,12 @@ def make_func_table(funcs: List[str], class_name: str) -> List[str]:
         else:
             ret_type = make_link(func.return_type)
         func_call: List[str] = []
-        func_call.append(":ref:`{}<class_{}_method_{}>` **(** ".format(
+        if sphinx_domain:
+            func_call.append(
+                ":gdscript:meth:`{} <{}.{}>` **(** ".format(func.name, full_name or class_name, func.name)
+            )
+        else:
+            func_call.append(":ref:`{}<class_{}_method_{}>` **(** ".format(
                                                     func.name,
                                                     class_name,
                                                     func.name
@@ -227,60 +570,39 @@ def make_func_table(funcs: List[str], class_name: str) -> List[str]:
                                                 )
         if func.arguments:
             func_call.extend(make_arguments(func.arguments))
-            # for arg in func.arguments:
-            #     arg_type: str = None
-            #     arg_default: str = None
-            #     if arg.type == "null" or arg_type == "void":
-            #         arg_type = arg.type
-            #     else:
-            #         arg_type = make_link(arg.type)
-            #     arg_default = " = {}".format(arg.default) if arg.default != "" else arg.default
-            #     argument: str = "{}: {}{}".format(arg.name, arg_type, arg_default)
-
-            #     func_call.append(argument)
-            #     func_call.append(", ")
-            # func_call.pop() # get rid of the last comma        
         func_call.append(" **)**")
 
-        table_items.append({"func_call": ''.join(func_call), "ret_type": ret_type})
-
-    for item in table_items:
-        c_len = len(item["func_call"]) +2
-        r_len = len(item["ret_type"]) + 2
-        if c_len > func_call_len: func_call_len = c_len
-        if r_len > ret_type_len: ret_type_len = r_len
+        table.add_row((''.join(func_call), ret_type))
 
-    table_separator: str = "+{}+{}+".format(
-        "-" * func_call_len, "-" * ret_type_len
-        )
-    
-    table: List[str] =[]
-    table.append(table_separator)
-    for row in table_items:
-        item_row: str = "| {} | {} |".format(
-                row["func_call"] + " " * (func_call_len - len(row["func_call"]) - 2),
-                row["ret_type"] + " " * (ret_type_len - len(row["ret_type"]) - 2)
-            )
-
-        table.append(item_row)
-        table.append(table_separator)
+    return table.render()
 
-    return table
 
-
-def make_element(attribute: str, element: List[str], class_name: str) -> List[str]:
+def make_element(
+    attribute: str,
+    element: List[str],
+    class_name: str,
+    resolver: ReferenceResolver,
+    full_name: str = "",
+) -> List[str]:
+    """
+    Writes the descriptions of the `attribute` symbols of the class.  With the
+    Sphinx domain, the directives of an inner class are named after its
+    `full_name`, Outer.Inner, the name its class directive is registered under.
+    """
 
     switcher = {
-        "members": lambda : make_members(element, class_name),
-        "functions": lambda : make_functions(element, class_name),
-        "signals": lambda : make_signals(element, class_name),
-        "enums": lambda : make_enums(element, class_name),
-        "constants": lambda : make_constants(element, class_name),
+        "members": lambda : make_members(element, class_name, resolver, full_name),
+        "functions": lambda : make_functions(element, class_name, resolver, full_name),
+        "signals": lambda : make_signals(element, class_name, resolver, full_name),
+        "enums": lambda : make_enums(element, class_name, resolver, full_name),
+        "constants": lambda : make_constants(element, class_name, resolver, full_name),
     }
     return switcher.get(attribute, lambda: List("ERROR: attribute not known"))()
 
 
-def make_members(members: List[str], class_name: str) -> List[str]:
+def make_members(
+    members: List[str], class_name: str, resolver: ReferenceResolver, full_name: str = ""
+) -> List[str]:
     LOGGER.info(
         "Making members for class {}".format(class_name)
     )
@@ -295,11 +617,14 @@ def make_members(members: List[str], class_name: str) -> List[str]:
         no_setter: bool = True if member.setter == '' else False
         member_setter: str = None if no_setter else "{}(val)".format(member.setter)
         member_lines: List[str] = []
-        member_lines.append('.. _class_{}_property_{}:\n'.format(class_name, member.name))
-        member_lines.append('- **{}** : {}\n'.format(
-                                            member.name,
-                                            make_link(member.type)))
+        if not sphinx_domain:
+            member_lines.append('.. _class_{}_property_{}:\n'.format(class_name, member.name))
+            member_lines.append('- **{}** : {}\n'.format(
+                                                member.name,
+                                                make_link(member.type)))
         
+        # These tables have one to three rows, which are formatted directly:
+        # a GridTable costs more to set up than they take to render.
         if not (no_default and no_getter and no_setter):
             def_len = len(member_default) if member_default else 0
             set_len = len(member_setter) if member_setter else 0
@@ -323,7 +648,14 @@ def make_members(members: List[str], class_name: str) -> List[str]:
             member_lines.append('\n')
             
 
-        member_lines.append('{}\n'.format(member.description))
+        member_lines.append('{}\n'.format(resolver.resolve(member.description, class_name)))
+        if sphinx_domain:
+            member_lines = make_directive(
+                "property",
+                "{}.{}".format(full_name or class_name, member.name),
+                [("type", member.type)],
+                member_lines,
+            )
         member_lines.append('----\n')
 
         members_lines.extend(member_lines)
@@ -332,12 +664,18 @@ def make_members(members: List[str], class_name: str) -> List[str]:
     return members_lines
 
 
-def make_functions(functions: List[str], class_name: str) -> List[str]:
+def make_functions(
+    functions: List[str], class_name: str, resolver: ReferenceResolver, full_name: str = ""
+) -> List[str]:
     LOGGER.info(
         "Making functions for class {}".format(class_name)
     )
     function_lines: List[str] =[]
     for function in functions:
+        if sphinx_domain:
+            function_lines.extend(make_function_directive(function, class_name, resolver, full_name))
+            function_lines.append('----\n')
+            continue
         function_lines.append('.. _class_{}_method_{}:\n'.format(class_name, function.name))
         function_line: List[str] = []
         function_line.append('- {} **{}(** '.format(function.kind.name, function.name))
@@ -351,19 +689,54 @@ def make_functions(functions: List[str], class_name: str) -> List[str]:
             function_line.append(' -> {}'.format(make_link(function.return_type)))
         
         function_lines.append('{}\n'.format(''.join(function_line)))
-        function_lines.append('{}\n'.format(function.description))
+        function_lines.append(
+            '{}\n'.format(resolver.resolve(function.description, class_name))
+        )
         function_lines.append('----\n')
 
     function_lines.pop()
     return function_lines
 
-def make_signals(signals: List[str], class_name: str) -> List[str]:
+
+def make_function_directive(
+    function, class_name: str, resolver: ReferenceResolver, full_name: str = ""
+) -> List[str]:
+    arguments: List[str] = [
+        "{}: {}{}".format(
+            argument.name, argument.type, " = {}".format(argument.default) if argument.default != "" else ""
+        )
+        for argument in function.arguments
+    ]
+    signature: str = "{}.{}({})".format(full_name or class_name, function.name, ", ".join(arguments))
+    if function.return_type:
+        signature += " -> " + function.return_type
+    options: List[Tuple[str, str]] = []
+    if function.kind.name != "METHOD":
+        options.append((function.kind.name.lower(), ""))
+    return make_directive(
+        "method", signature, options, [resolver.resolve(function.description, class_name)]
+    )
+
+def make_signals(
+    signals: List[str], class_name: str, resolver: ReferenceResolver, full_name: str = ""
+) -> List[str]:
     LOGGER.info(
         "Making signals for class {}".format(class_name)
     )
 
     signal_lines: List[str] =[]
     for signal in signals:
+        if sphinx_domain:
+            signal_lines.extend(
+                make_directive(
+                    "signal",
+                    "{}.{}({})".format(full_name or class_name, signal.name, ", ".join(signal.arguments)),
+                    [],
+                    [resolver.resolve(signal.description, class_name)],
+                )
+            )
+            signal_lines.append('____\n')
+            continue
         signal_line: List[str] = []
         signal_line.append("_ **{}** **(** ".format( signal.name))
         signal_line.append('')
@@ -381,7 +754,7 @@ def make_signals(signals: List[str], class_name: str) -> List[str]:
         signal_lines.append('')
         signal_lines.append(''.join(signal_line))
         signal_lines.append('')
-        signal_lines.append(signal.description)
+        signal_lines.append(resolver.resolve(signal.description, class_name))
         signal_lines.append('')
         signal_lines.append('____')
 
@@ -390,12 +763,32 @@ def make_signals(signals: List[str], class_name: str) -> List[str]:
     return signal_lines
 
 
-def make_enums(enumerations: List[str], class_name: str) -> List[str]:
+def make_enums(
+    enumerations: List[str], class_name: str, resolver: ReferenceResolver, full_name: str = ""
+) -> List[str]:
     LOGGER.info(
         "Making enums for class {}".format(class_name)
     )
     enum_lines: List[str] = []
     for enums in enumerations:
+        if sphinx_domain:
+            values: List[str] = []
+            for name, value in enums.values.items():
+                values.extend(
+                    make_directive(
+                        "constant",
+                        "{}.{}".format(full_name or class_name, name),
+                        [("value", str(value))],
+                        [],
+                    )
+                )
+            values.append(resolver.resolve(enums.description, class_name))
+            enum_lines.extend(
+                make_directive("enum", "{}.{}".format(full_name or class_name, enums.name), [], values)
+            )
+            enum_lines.append('----')
+            enum_lines.append('')
+            continue
         enum_lines.append('.. _enum_{}_{}:'.format(class_name, enums.name))
         enum_lines.append('')
         for val in enums.values:
@@ -405,7 +798,7 @@ def make_enums(enumerations: List[str], class_name: str) -> List[str]:
         enum_lines.append('')
         for enum in enums.values:
             enum_lines.append('- **{}** = **{}**'.format(enum, enums.values[enum]))
-        enum_lines.append('\n{}'.format(enums.description))
+        enum_lines.append('\n{}'.format(resolver.resolve(enums.description, class_name)))
         enum_lines.append('')
         enum_lines.append('----')
         enum_lines.append('')
@@ -418,15 +811,29 @@ def make_enums(enumerations: List[str], class_name: str) -> List[str]:
 
 
 
-def make_constants(constants: List[str], class_name: str) -> List[str]:
+def make_constants(
+    constants: List[str], class_name: str, resolver: ReferenceResolver, full_name: str = ""
+) -> List[str]:
     LOGGER.info(
         "Making constants for class {}".format(class_name)
     )
     const_lines: List[str] = []
+    if sphinx_domain:
+        for const in constants:
+            const_lines.extend(
+                make_directive(
+                    "constant",
+                    "{}.{}".format(full_name or class_name, const.name),
+                    [("type", const.type), ("value", str(const.default_value))],
+                    [resolver.resolve(const.description, class_name)],
+                )
+            )
+        return const_lines
     for sigs in constants:
         const_lines.append('.. _class_{}_constant_{}:\n'.format(class_name, sigs.name))
     for const in constants:
-       const_lines.append('- **{}** :{} = **{}** --- {}\n'.format(const.name, const.type, const.default_value, const.description.replace('\n', '')))
+       description: str = resolver.resolve(const.description.replace('\n', ''), class_name)
+       const_lines.append('- **{}** :{} = **{}** --- {}\n'.format(const.name, const.type, const.default_value, description))
 
     return const_lines
 
@@ -0,0 +1,233 @@
+"""
+Keeps a manifest of the generated reStructuredText files in the output
+directory so that consecutive runs only redo the work that changed.
+
+The manifest records a hash of the input of each class and a hash of each
+rendered file.  Classes whose input hash did not change are skipped, files
+whose rendered content did not change are not rewritten, so their
+modification time is preserved, and files left over from classes that no
+longer exist are removed.
+
+Each file also records the input it was rendered from, so several reference
+files can share an output directory: a run only removes the files of classes
+that disappeared from the inputs it rendered.
+"""
+
+import hashlib
+import json
+import os
+from typing import IO, Dict, Iterable, List
+
+from . import make_restructured
+from .config import LOGGER, VERSION
+from .make_restructured import RestructuredDocument
+
+MANIFEST_FILENAME: str = ".gdscript2rest-manifest.json"
+
+# Bump when the layout of the manifest file changes.
+MANIFEST_VERSION: int = 2
+
+
+def hash_data(data: dict) -> str:
+    """Returns a hash of the JSON data of a class, independent of key order."""
+    text: str = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def hash_symbols(classes: Iterable) -> str:
+    """
+    Returns a hash of the names, parents and symbols of the classes, which the
+    references in the descriptions of every class are resolved against.
+    """
+    return hash_data([_get_symbol_tree(gdscript) for gdscript in classes])
+
+
+def _get_symbol_tree(gdscript) -> list:
+    return [
+        gdscript.name,
+        gdscript.extends,
+        gdscript.symbols,
+        [_get_symbol_tree(sub_class) for sub_class in gdscript.sub_classes],
+    ]
+
+
+def class_input_key(data_hash: str, extends_tree: List[str], symbols_hash: str) -> str:
+    """
+    Combines the hash of the data of a class with everything else its page
+    depends on into the key stored in the manifest.
+    """
+    text: str = "\n".join([data_hash, symbols_hash] + extends_tree)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class Manifest:
+    def __init__(self, dirpath: str, previous: dict, force: bool = False):
+        """
+        Represents the manifest of an output directory.
+
+        Keyword Arguments:
+        dirpath: str    -- the output directory
+        previous: dict  -- the manifest saved by the previous run
+        force: bool     -- if True, consider every class as changed
+        """
+        self.dirpath: str = dirpath
+        fingerprint: str = _get_fingerprint()
+        is_compatible: bool = previous.get("fingerprint") == fingerprint and not force
+        self.previous_inputs: Dict[str, str] = (
+            previous.get("inputs", {}) if is_compatible else {}
+        )
+        self.previous_outputs: Dict[str, str] = previous.get("outputs", {})
+        self.previous_sources: Dict[str, str] = previous.get("sources", {})
+        self.inputs: Dict[str, str] = {}
+        self.outputs: Dict[str, str] = {}
+        # output file -> the input file its class was read from
+        self.sources: Dict[str, str] = {}
+        self.skipped: int = 0
+        self.written: int = 0
+
+    @staticmethod
+    def load(dirpath: str, force: bool = False) -> "Manifest":
+        path: str = os.path.join(dirpath, MANIFEST_FILENAME)
+        previous: dict = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as manifest_file:
+                    previous = json.loads(manifest_file.read())
+            except (OSError, ValueError) as error:
+                LOGGER.warning("Ignoring unreadable manifest {}: {}".format(path, error))
+        return Manifest(dirpath, previous if isinstance(previous, dict) else {}, force)
+
+    def next_run(self) -> "Manifest":
+        """
+        Returns the manifest of the next run in the same process, which starts
+        from the results of this one without reading them back from disk.
+        """
+        return Manifest(
+            self.dirpath,
+            {
+                "fingerprint": _get_fingerprint(),
+                "inputs": self.inputs,
+                "outputs": self.outputs,
+                "sources": self.sources,
+            },
+        )
+
+    def is_unchanged(self, name: str, input_key: str, source: str) -> bool:
+        """
+        Returns True if the class `name` had the same input key in the previous
+        run and its file still exists, in which case it is carried over.
+        Otherwise records the new input key and returns False.  In both cases
+        `source`, the input file the class was read from, is recorded.
+        """
+        filename: str = RestructuredDocument.filename_for(name)
+        self.sources[filename] = os.path.abspath(source)
+        if (
+            self.previous_inputs.get(name) == input_key
+            and filename in self.previous_outputs
+            and os.path.exists(os.path.join(self.dirpath, filename))
+        ):
+            self.inputs[name] = input_key
+            self.outputs[filename] = self.previous_outputs[filename]
+            self.skipped += 1
+            return True
+
+        self.inputs[name] = input_key
+        return False
+
+    def save_document(self, document: RestructuredDocument):
+        """
+        Writes the document to the output directory unless the file already
+        has the same content.
+
+        The document is streamed to a temporary file while its content is
+        hashed, then moved over the existing file only if the hash changed.
+        """
+        filename: str = document.get_filename()
+        path: str = os.path.join(self.dirpath, filename)
+        temporary_path: str = path + ".tmp"
+        with open(temporary_path, "w") as file_out:
+            hashing_file: _HashingFile = _HashingFile(file_out)
+            document.write_to(hashing_file)
+        content_hash: str = hashing_file.hexdigest()
+        self.outputs[filename] = content_hash
+        if self.previous_outputs.get(filename) == content_hash and os.path.exists(path):
+            LOGGER.debug("Unchanged reStructured file " + path)
+            os.remove(temporary_path)
+            return
+
+        LOGGER.debug("Saving reStructured file " + path)
+        os.replace(temporary_path, path)
+        self.written += 1
+
+    def remove_stale(self) -> List[str]:
+        """
+        Removes the files the previous runs generated from the inputs of this
+        run that were not generated or carried over by this one, and returns
+        their names.  The files of other inputs are kept in the manifest.
+        """
+        rendered_sources: set = set(self.sources.values())
+        names: Dict[str, str] = {
+            RestructuredDocument.filename_for(name): name for name in self.previous_inputs
+        }
+        stale: List[str] = []
+        for filename, content_hash in self.previous_outputs.items():
+            if filename in self.outputs:
+                continue
+            source: str = self.previous_sources.get(filename, "")
+            if source not in rendered_sources:
+                # Carried over, the file belongs to an input this run did not render.
+                self.outputs[filename] = content_hash
+                if source:
+                    self.sources[filename] = source
+                if filename in names:
+                    self.inputs[names[filename]] = self.previous_inputs[names[filename]]
+                continue
+            stale.append(filename)
+            path: str = os.path.join(self.dirpath, filename)
+            if os.path.exists(path):
+                LOGGER.info("Removing stale reStructured file " + path)
+                os.remove(path)
+        return stale
+
+    def save(self):
+        path: str = os.path.join(self.dirpath, MANIFEST_FILENAME)
+        with open(path, "w") as manifest_file:
+            manifest_file.write(
+                json.dumps(
+                    {
+                        "version": MANIFEST_VERSION,
+                        "fingerprint": _get_fingerprint(),
+                        "inputs": self.inputs,
+                        "outputs": self.outputs,
+                        "sources": self.sources,
+                    },
+                    indent=1,
+                    sort_keys=True,
+                )
+            )
+
+
+class _HashingFile:
+    """Forwards the text written to a file and hashes it on the way."""
+
+    def __init__(self, file: IO[str]):
+        self.file: IO[str] = file
+        self.hash = hashlib.sha256()
+
+    def write(self, text: str):
+        self.hash.update(text.encode("utf-8"))
+        self.file.write(text)
+
+    def hexdigest(self) -> str:
+        return self.hash.hexdigest()
+
+
+def _get_fingerprint() -> str:
+    """
+    Returns a string identifying everything besides the class data that the
+    rendered pages depend on.  A change invalidates all recorded inputs.
+    """
+    fingerprint: str = "{}:{}:{}".format(
+        MANIFEST_VERSION, VERSION, make_restructured.api_ref.fingerprint()
+    )
+    return fingerprint + ":gdscript-domain" if make_restructured.sphinx_domain else fingerprint
@@ -0,0 +1,273 @@
+"""
+Loads reference files into GDScript objects, and merges several of them into
+one project for the --merge option.
+
+Projects split into several reference dumps, for example one per addon, are
+merged into a single GDScriptClasses so that the class index, the inheritance
+chains and the links in descriptions span every file.  Files are read,
+decoded and built concurrently in worker processes.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+
+from .config import LOGGER
+from . import json_decoder
+from .gdscript_objects import GDScriptClass, GDScriptClasses
+from .json_stream import (get_stamp, is_ndjson, is_shard_directory,
+                          iter_reference, project_name_from_path, read_shard,
+                          read_shard_manifest)
+from .manifest import hash_data
+from .model_cache import ModelCache
+from .profiling import Profiler
+
+
+# Least number of shards sent to a worker process in one task.
+SHARDS_PER_BATCH: int = 16
+
+
+@dataclass
+class LoadedReference:
+    """
+    The classes built from one reference file and its project information.
+
+    For a shard directory, `shard_stamps` holds the path, modification time
+    and size of the shard of each class.
+    """
+
+    path: str
+    project: dict
+    classes: List[GDScriptClass]
+    data_hashes: List[str]
+    shard_stamps: List[tuple] = field(default_factory=list)
+
+
+def load_reference(
+    path: str,
+    previous: Optional[LoadedReference] = None,
+    cache: Optional[ModelCache] = None,
+    profiler: Optional[Profiler] = None,
+    jobs: int = 1,
+) -> LoadedReference:
+    """
+    Reads a reference file and builds its classes, keeping no reference to the
+    JSON.
+
+    Keyword Arguments:
+    path: str                      -- the reference file or shard directory
+    previous: LoadedReference      -- an earlier load of the file, whose
+                                      classes are reused when their data did
+                                      not change, or for a shard directory
+                                      when their shard was not modified
+    cache: ModelCache              -- if set, the classes are loaded from the
+                                      cache when the file did not change, and
+                                      saved to it otherwise
+    profiler: Profiler             -- times the reading, decoding and building
+    jobs: int                      -- number of worker processes the shards of
+                                      a shard directory are loaded on
+    """
+    profiler = profiler or Profiler()
+    cache_key: str = ""
+    if cache:
+        with profiler.phase("read"):
+            cache_key = cache.key_for_file(path)
+        with profiler.phase("decode"):
+            cached: Optional[LoadedReference] = cache.load(cache_key)
+        if isinstance(cached, LoadedReference):
+            cached.path = path
+            return cached
+
+    project: dict = {"name": project_name_from_path(path), "description": "", "version": None}
+    if is_shard_directory(path):
+        with profiler.phase("read"):
+            shard_project, shards = read_shard_manifest(path)
+        project.update(shard_project)
+        shard_reference: LoadedReference = _load_shards(
+            LoadedReference(path, project, [], []), shards, previous, jobs, profiler
+        )
+        return _save_to_cache(shard_reference, cache, cache_key, profiler)
+
+    entries: List[dict] = []
+    if is_ndjson(path):
+        for key, value in profiler.iterate("decode", iter_reference(path)):
+            if key == "classes":
+                entries.append(value)
+            else:
+                project[key] = value
+    else:
+        with profiler.phase("read"):
+            json_file: json_decoder.JSONFile = json_decoder.open_json(path)
+        with json_file, profiler.phase("decode"):
+            data: dict = json_file.decode()
+        entries = data.pop("classes")
+        project.update(data)
+
+    with profiler.phase("build"):
+        reference: LoadedReference = build_reference(path, project, entries, previous)
+    return _save_to_cache(reference, cache, cache_key, profiler)
+
+
+def build_reference(
+    path: str, project: dict, entries: List[dict], previous: Optional[LoadedReference] = None
+) -> LoadedReference:
+    """
+    Builds the classes of the decoded reference entries, skipping those without
+    a name and reusing the classes of `previous` whose data did not change.
+    """
+    entries = [entry for entry in entries if entry["name"] != ""]
+    data_hashes: List[str] = [hash_data(entry) for entry in entries]
+    built: Dict[str, GDScriptClass] = (
+        dict(zip(previous.data_hashes, previous.classes)) if previous else {}
+    )
+    classes: List[GDScriptClass] = [
+        built.get(data_hash) or GDScriptClass.from_dict(entry)
+        for entry, data_hash in zip(entries, data_hashes)
+    ]
+    return LoadedReference(path, project, classes, data_hashes)
+
+
+def _save_to_cache(
+    reference: LoadedReference,
+    cache: Optional[ModelCache],
+    cache_key: str,
+    profiler: Profiler,
+) -> LoadedReference:
+    if cache:
+        with profiler.phase("write"):
+            cache.save(cache_key, reference)
+    return reference
+
+
+def _load_shards(
+    reference: LoadedReference,
+    shards: List[str],
+    previous: Optional[LoadedReference],
+    jobs: int,
+    profiler: Profiler,
+) -> LoadedReference:
+    """
+    Adds the classes of the shards to `reference`.  Classes whose shard was not
+    modified since `previous` was loaded are reused, the other shards are read,
+    decoded and built, on `jobs` worker processes if there are enough of them.
+    """
+    reused: Dict[tuple, Tuple[str, GDScriptClass]] = (
+        dict(zip(previous.shard_stamps, zip(previous.data_hashes, previous.classes)))
+        if previous
+        else {}
+    )
+    with profiler.phase("read"):
+        stamps: List[tuple] = [(shard, get_stamp(shard)) for shard in shards]
+    modified: List[str] = [shard for shard, stamp in stamps if (shard, stamp) not in reused]
+
+    built: Dict[str, Optional[Tuple[str, GDScriptClass]]] = {}
+    if jobs > 1 and len(modified) >= SHARDS_PER_BATCH * 2:
+        # The workers read, decode and build the shards.
+        with profiler.phase("decode"):
+            built = _build_shards_parallel(modified, jobs)
+    else:
+        for shard in modified:
+            with profiler.phase("decode"):
+                entry: dict = read_shard(shard)
+            with profiler.phase("build"):
+                built[shard] = _build_entry(entry)
+
+    for stamp in stamps:
+        loaded: Optional[Tuple[str, GDScriptClass]] = reused.get(stamp) or built[stamp[0]]
+        if loaded:
+            reference.data_hashes.append(loaded[0])
+            reference.classes.append(loaded[1])
+            reference.shard_stamps.append(stamp)
+    return reference
+
+
+def _build_shards_parallel(
+    shards: List[str], jobs: int
+) -> Dict[str, Optional[Tuple[str, GDScriptClass]]]:
+    batch_size: int = max(SHARDS_PER_BATCH, -(-len(shards) // (jobs * 4)))
+    batches: List[List[str]] = [
+        shards[start:start + batch_size] for start in range(0, len(shards), batch_size)
+    ]
+    LOGGER.info("Loading {} shards with {} worker processes".format(len(shards), jobs))
+    built: Dict[str, Optional[Tuple[str, GDScriptClass]]] = {}
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=json_decoder.set_json_decoder,
+        initargs=(json_decoder.decoder.name,),
+    ) as executor:
+        for batch, results in zip(batches, executor.map(_build_shards, batches)):
+            built.update(zip(batch, results))
+    return built
+
+
+def _build_shards(shards: List[str]) -> List[Optional[Tuple[str, GDScriptClass]]]:
+    return [_build_entry(read_shard(shard)) for shard in shards]
+
+
+def _build_entry(entry: dict) -> Optional[Tuple[str, GDScriptClass]]:
+    """Returns the hash of the data of a class and the class, None if it has no name."""
+    if entry["name"] == "":
+        return None
+    return hash_data(entry), GDScriptClass.from_dict(entry)
+
+
+def load_references(
+    paths: List[str], jobs: int, cache: Optional[ModelCache] = None
+) -> List[LoadedReference]:
+    """
+    Loads the reference files on up to `jobs` worker processes, returning them
+    in the order of `paths`.
+    """
+    if len(paths) == 1 or jobs <= 1:
+        return [load_reference(path, cache=cache, jobs=jobs) for path in paths]
+    jobs = min(jobs, len(paths))
+    LOGGER.info("Loading {} files with {} worker processes".format(len(paths), jobs))
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=json_decoder.set_json_decoder,
+        initargs=(json_decoder.decoder.name,),
+    ) as executor:
+        return list(executor.map(partial(load_reference, cache=cache), paths))
+
+
+def merge_references(
+    references: List[LoadedReference],
+) -> Tuple[GDScriptClasses, List[str], List[str], Dict[str, List[str]]]:
+    """
+    Merges the classes of the references into one GDScriptClasses.
+
+    When several files define a class with the same name, the first one wins,
+    as each class is rendered to a file named after it.  Returns the merged
+    classes, the hash of the data of each class, the file each class was read
+    from and the files defining each duplicated class name.
+    """
+    classes: List[GDScriptClass] = []
+    data_hashes: List[str] = []
+    sources: Dict[str, str] = {}
+    duplicates: Dict[str, List[str]] = {}
+    for reference in references:
+        for gdscript, data_hash in zip(reference.classes, reference.data_hashes):
+            source: str = sources.get(gdscript.name)
+            if source is not None:
+                duplicates.setdefault(gdscript.name, [source]).append(reference.path)
+                continue
+            sources[gdscript.name] = reference.path
+            classes.append(gdscript)
+            data_hashes.append(data_hash)
+    return (
+        GDScriptClasses(classes),
+        data_hashes,
+        [sources[gdscript.name] for gdscript in classes],
+        duplicates,
+    )
+
+
+def report_duplicates(duplicates: Dict[str, List[str]]):
+    for name, paths in sorted(duplicates.items()):
+        LOGGER.warning(
+            "Class {} is defined in {}.  Only the one in {} is rendered.".format(
+                name, ", ".join(os.path.basename(path) for path in paths), paths[0]
+            )
+        )
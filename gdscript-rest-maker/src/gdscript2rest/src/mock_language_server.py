@@ -0,0 +1,136 @@
+"""
+A stand-in for the GDScript language server of the Godot editor, serving the
+entries of a reference.json file, to test --language-server without Godot.
+
+    python -m gdscript2rest.src.mock_language_server reference.json [--port 6008]
+
+Each class of the reference is served by `workspace/generate_script_api` under
+its `path`.  Like the editor, the server sends notifications of its own between
+responses, and handles the messages of a connection one at a time.
+"""
+
+import json
+import socket
+import socketserver
+import sys
+import threading
+from argparse import ArgumentParser, Namespace
+from typing import Any, Dict, List, Optional, Tuple
+
+from .language_server import DEFAULT_HOST, DEFAULT_PORT, encode_message, read_message
+
+METHOD_NOT_FOUND: int = -32601
+
+
+class MockLanguageServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, scripts: Dict[str, dict], host: str = DEFAULT_HOST, port: int = 0):
+        """
+        Serves the reference entries in `scripts`, keyed by their res:// path.
+
+        Keyword Arguments:
+        scripts: Dict[str, dict]  -- the entry returned for each script path
+        host: str                 -- the host to listen on, IPv4 or IPv6
+        port: int                 -- the port to listen on, 0 picks a free one
+        """
+        if ":" in host:
+            self.address_family = socket.AF_INET6
+        super().__init__((host, port), _Handler)
+        self.scripts: Dict[str, dict] = scripts
+        self.requests: List[Tuple[str, Any]] = []
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> str:
+        host, port = self.server_address[:2]
+        return "[{}]:{}".format(host, port) if ":" in host else "{}:{}".format(host, port)
+
+    def start(self) -> "MockLanguageServer":
+        """Serves in a background thread until `stop` is called."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "MockLanguageServer":
+        return self.start()
+
+    def __exit__(self, *exception):
+        self.stop()
+
+    def handle_message(self, message: dict) -> Optional[dict]:
+        """Returns the response to a message, None for a notification."""
+        method: str = message.get("method", "")
+        params: Any = message.get("params")
+        self.requests.append((method, params))
+        if "id" not in message:
+            return None
+        path: Any = params[0] if isinstance(params, list) and params else params
+        if method == "initialize":
+            return _make_response(message["id"], {"capabilities": {}})
+        if method == "workspace/generate_script_api":
+            return _make_response(message["id"], self.scripts.get(path, {}))
+        if method == "workspace/parse_local_script":
+            return _make_response(message["id"], 0)
+        return {
+            "jsonrpc": "2.0",
+            "id": message["id"],
+            "error": {"code": METHOD_NOT_FOUND, "message": "Method not found: " + method},
+        }
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        while True:
+            try:
+                message: Optional[dict] = read_message(self.rfile)
+            except (OSError, ValueError):
+                return
+            if message is None:
+                return
+            response: Optional[dict] = self.server.handle_message(message)
+            if message.get("method") == "initialize":
+                self._send({"jsonrpc": "2.0", "method": "gdscript/capabilities", "params": {}})
+            if response is not None:
+                self._send(response)
+
+    def _send(self, message: dict):
+        self.wfile.write(encode_message(message))
+        self.wfile.flush()
+
+
+def _make_response(request_id: Any, result: Any) -> dict:
+    return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+
+def load_scripts(path: str) -> Dict[str, dict]:
+    """Returns the classes of a reference.json file keyed by their path."""
+    with open(path, "r") as json_file:
+        return {entry["path"]: entry for entry in json.load(json_file)["classes"]}
+
+
+def main():
+    parser: ArgumentParser = ArgumentParser(description=__doc__)
+    parser.add_argument("reference", type=str, help="Path to the reference.json file to serve.")
+    parser.add_argument("--host", type=str, default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args: Namespace = parser.parse_args()
+    server: MockLanguageServer = MockLanguageServer(load_scripts(args.reference), args.host, args.port)
+    print("Serving {} scripts on {}".format(len(server.scripts), server.address), file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Caches the GDScript objects built from a reference file on disk, so a run over
+a file that did not change loads them directly instead of decoding the JSON
+and building the objects again.
+
+Entries are pickled and keyed by a hash of the content of the reference file,
+the version of gdscript2rest and CACHE_FORMAT.  An entry that cannot be read
+back, or was written by another version, is removed and rebuilt.  The cache
+directory belongs to the user: entries are loaded with pickle, so it must not
+be shared with untrusted users.
+"""
+
+import hashlib
+import os
+import pickle
+from typing import Any, List, Optional
+
+from .config import LOGGER, VERSION
+from .json_stream import get_reference_files
+
+# Bump when the layout of the cached GDScript objects changes.
+CACHE_FORMAT: int = 2
+
+# Number of entries kept, the least recently used are removed first.
+MAX_ENTRIES: int = 16
+
+CACHE_EXTENSION: str = ".pickle"
+
+_READ_SIZE: int = 1 << 20
+
+
+def get_default_cache_directory() -> str:
+    """Returns the cache directory of the user, following the XDG convention."""
+    root: str = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(root, "gdscript2rest")
+
+
+class ModelCache:
+    def __init__(self, dirpath: str):
+        """
+        Represents a directory of cached GDScript objects.
+
+        Keyword Arguments:
+        dirpath: str  -- the cache directory, created on the first save
+        """
+        self.dirpath: str = dirpath
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def key_for_file(self, path: str) -> str:
+        """
+        Returns the key of the reference file or shard directory at `path`,
+        from its content.
+        """
+        content_hash = hashlib.sha256(
+            "{}:{}\n".format(CACHE_FORMAT, VERSION).encode("utf-8")
+        )
+        for file_path in get_reference_files(path):
+            with open(file_path, "rb") as reference_file:
+                size: int = os.fstat(reference_file.fileno()).st_size
+                content_hash.update("{}\n".format(size).encode("utf-8"))
+                for chunk in iter(lambda: reference_file.read(_READ_SIZE), b""):
+                    content_hash.update(chunk)
+        return content_hash.hexdigest()
+
+    def load(self, key: str) -> Optional[Any]:
+        """Returns the value saved under `key`, or None if there is no valid entry."""
+        path: str = self._get_path(key)
+        if not os.path.exists(path):
+            self.misses += 1
+            return None
+        try:
+            with open(path, "rb") as cache_file:
+                header: tuple = pickle.load(cache_file)
+                if header != (CACHE_FORMAT, VERSION, key):
+                    raise ValueError("entry written by another version")
+                value: Any = pickle.load(cache_file)
+        except Exception as error:
+            LOGGER.warning("Removing invalid cache entry {}: {}".format(path, error))
+            self._remove(path)
+            self.misses += 1
+            return None
+        # Refresh the modification time, which orders entries for removal.
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        LOGGER.debug("Loaded cache entry " + path)
+        return value
+
+    def save(self, key: str, value: Any):
+        """
+        Saves `value` under `key`.  The entry is written to a temporary file and
+        moved in place, so an interrupted run never leaves a truncated entry.
+        """
+        path: str = self._get_path(key)
+        temporary_path: str = "{}.{}.tmp".format(path, os.getpid())
+        try:
+            os.makedirs(self.dirpath, exist_ok=True)
+            with open(temporary_path, "wb") as cache_file:
+                pickle.dump((CACHE_FORMAT, VERSION, key), cache_file, pickle.HIGHEST_PROTOCOL)
+                pickle.dump(value, cache_file, pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, path)
+        except (OSError, pickle.PicklingError) as error:
+            LOGGER.warning("Could not save cache entry {}: {}".format(path, error))
+            self._remove(temporary_path)
+            return
+        LOGGER.debug("Saved cache entry " + path)
+        self._prune()
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self.dirpath, key + CACHE_EXTENSION)
+
+    def _prune(self):
+        """Removes the least recently used entries beyond MAX_ENTRIES."""
+        entries: List[str] = [
+            os.path.join(self.dirpath, filename)
+            for filename in os.listdir(self.dirpath)
+            if filename.endswith(CACHE_EXTENSION)
+        ]
+        if len(entries) <= MAX_ENTRIES:
+            return
+        entries.sort(key=_get_modification_time, reverse=True)
+        for path in entries[MAX_ENTRIES:]:
+            self._remove(path)
+
+    def _remove(self, path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _get_modification_time(path: str) -> float:
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0.0
@@ -0,0 +1,185 @@
+"""
+Measures where a gdscript2rest run spends its time, for the --profile option.
+
+The run is split into phases: reading the files, decoding the JSON, building
+the GDScript objects, rendering the documents and writing them.  Phases nest,
+and the time of an inner phase is not counted in the outer one, so the lazy
+pipelines of the streaming mode, where a class is decoded and built while the
+previous document is being written, are still attributed correctly.
+
+Memory is the peak resident memory of the process, which only grows.  Each
+phase reports it as it was when the phase last ended, a high-water mark of
+the run so far rather than the memory the phase itself used.
+"""
+
+import cProfile
+import json
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from . import json_decoder
+from .config import VERSION
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+PHASES: List[str] = ["read", "decode", "build", "render", "write"]
+
+# Number of classes listed in the report, slowest to render first.
+SLOWEST_CLASSES: int = 10
+
+
+def get_peak_memory() -> Optional[int]:
+    """Returns the peak resident memory of the process in bytes, if known."""
+    if resource is None:
+        return None
+    peak: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class Profiler:
+    def __init__(self, enabled: bool = False, stats_path: str = ""):
+        """
+        Collects the wall time of each phase of a run, and the peak memory of
+        the process so far when each phase ends.
+
+        Keyword Arguments:
+        enabled: bool     -- if False, every method is a no-op
+        stats_path: str   -- if set, also run cProfile and dump its stats there
+        """
+        self.enabled: bool = enabled
+        self.stats_path: str = stats_path
+        self.seconds: Dict[str, float] = {phase: 0.0 for phase in PHASES}
+        self.max_rss: Dict[str, Optional[int]] = {phase: None for phase in PHASES}
+        self.render_times: List[Tuple[str, float]] = []
+        self._stack: List[List] = []
+        self._started: float = 0.0
+        self._total: float = 0.0
+        self._profile: Optional[cProfile.Profile] = None
+
+    def start(self):
+        if not self.enabled:
+            return
+        self._started = time.perf_counter()
+        if self.stats_path:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def stop(self):
+        if not self.enabled:
+            return
+        if self._profile:
+            self._profile.disable()
+            self._profile.dump_stats(self.stats_path)
+        self._total = time.perf_counter() - self._started
+
+    @contextmanager
+    def phase(self, name: str):
+        """Attributes the time spent in the block to the phase `name`."""
+        if not self.enabled:
+            yield
+            return
+        now: float = time.perf_counter()
+        if self._stack:
+            outer: List = self._stack[-1]
+            self.seconds[outer[0]] += now - outer[1]
+        self._stack.append([name, now])
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self.seconds[name] += now - self._stack.pop()[1]
+            if self._stack:
+                self._stack[-1][1] = now
+            self.max_rss[name] = get_peak_memory()
+
+    def iterate(self, name: str, iterable: Iterable) -> Iterator:
+        """Yields the items of `iterable`, attributing the time to produce each to `name`."""
+        iterator: Iterator = iter(iterable)
+        while True:
+            with self.phase(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def iterate_documents(self, documents: Iterable) -> Iterator:
+        """
+        Yields the rendered documents, timing the rendering of each one.  Time
+        spent in nested phases, like building lazily decoded classes, is not
+        counted.  Documents rendered by worker processes carry the time the
+        worker took, which is used instead of the time spent waiting for them.
+        """
+        iterator: Iterator = iter(documents)
+        while True:
+            start: float = self.seconds["render"]
+            with self.phase("render"):
+                try:
+                    document = next(iterator)
+                except StopIteration:
+                    return
+            if self.enabled:
+                seconds: float = (
+                    document.render_seconds
+                    if document.render_seconds is not None
+                    else self.seconds["render"] - start
+                )
+                self.render_times.append((document.title, seconds))
+            yield document
+
+    def report(self) -> dict:
+        slowest: List[Tuple[str, float]] = sorted(
+            self.render_times, key=lambda entry: entry[1], reverse=True
+        )[:SLOWEST_CLASSES]
+        return {
+            "version": VERSION,
+            "total_seconds": self._total,
+            "peak_memory": get_peak_memory(),
+            "phases": {
+                phase: {"seconds": self.seconds[phase], "max_rss_so_far": self.max_rss[phase]}
+                for phase in PHASES
+            },
+            "documents": len(self.render_times),
+            "slowest": [{"name": name, "seconds": seconds} for name, seconds in slowest],
+            "json_decoder": json_decoder.decoder.name,
+            "stats": self.stats_path or None,
+        }
+
+    def format_report(self) -> str:
+        report: dict = self.report()
+        lines: List[str] = ["Profile:", "  {:<8} {:>10} {:>14}".format("phase", "seconds", "max RSS so far")]
+        for phase, values in report["phases"].items():
+            lines.append(
+                "  {:<8} {:>10.3f} {:>14}".format(
+                    phase, values["seconds"], _format_bytes(values["max_rss_so_far"])
+                )
+            )
+        lines.append(
+            "  {:<8} {:>10.3f} {:>14}".format(
+                "total", report["total_seconds"], _format_bytes(report["peak_memory"])
+            )
+        )
+        lines.append("JSON decoder: " + report["json_decoder"])
+        if report["slowest"]:
+            lines.append("Slowest documents to render:")
+            lines.extend(
+                "  {:>8.4f}s {}".format(entry["seconds"], entry["name"])
+                for entry in report["slowest"]
+            )
+        if self.stats_path:
+            lines.append("cProfile statistics written to " + self.stats_path)
+        return "\n".join(lines)
+
+    def save_report(self, path: str):
+        with open(path, "w") as report_file:
+            report_file.write(json.dumps(self.report(), indent=2))
+
+
+def _format_bytes(size: Optional[int]) -> str:
+    return "-" if size is None else "{:.1f} MB".format(size / 1e6)
@@ -0,0 +1,157 @@
+"""
+Watches the reference files for changes, for the --watch option.
+
+Changes are reported by the watchdog package through the notification API of
+the operating system when it is installed, otherwise the files are polled.
+Both watchers wait for a changed file to settle before reporting it, so a file
+still being written by generate_reference is not read half way.  A shard
+directory is watched through its manifest, which the collector writes last.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from .config import LOGGER
+from .json_stream import SHARD_MANIFEST, get_stamp
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # optional dependency, fall back to polling
+    FileSystemEventHandler = object
+    Observer = None
+
+# Seconds between two checks of the files when polling.
+POLL_INTERVAL: float = 0.5
+
+# Seconds a changed file must stay untouched before it is reported.
+SETTLE_DELAY: float = 0.1
+
+
+def _get_watched_file(path: str) -> str:
+    if os.path.isdir(path):
+        path = os.path.join(path, SHARD_MANIFEST)
+    return os.path.abspath(path)
+
+
+class PollingWatcher:
+    def __init__(self, paths: List[str], interval: float = POLL_INTERVAL):
+        """
+        Detects changes to files by comparing their modification time and size.
+
+        Keyword Arguments:
+        paths: List[str]  -- the files to watch, as given on the command line
+        interval: float   -- seconds between two checks of the files
+        """
+        self.paths: Dict[str, str] = {_get_watched_file(path): path for path in paths}
+        self.interval: float = interval
+        self._stamps: Dict[str, Optional[Tuple[int, int]]] = {
+            path: get_stamp(path) for path in self.paths
+        }
+
+    def poll(self) -> List[str]:
+        """Returns the files that changed since the last call, without waiting."""
+        changed: List[str] = []
+        for path, stamp in self._stamps.items():
+            current: Optional[Tuple[int, int]] = get_stamp(path)
+            if current != stamp:
+                self._stamps[path] = current
+                changed.append(path)
+        return [self.paths[path] for path in changed]
+
+    def wait(self, timeout: Optional[float] = None) -> List[str]:
+        """
+        Blocks until files change and have settled, then returns them.  Returns
+        an empty list if nothing changed within `timeout` seconds.
+        """
+        deadline: Optional[float] = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed: List[str] = self.poll()
+            if changed:
+                return self._settle(changed)
+            if deadline is not None and time.monotonic() >= deadline:
+                return []
+            time.sleep(self.interval)
+
+    def close(self):
+        pass
+
+    def _settle(self, changed: List[str]) -> List[str]:
+        """Waits until no file changed for SETTLE_DELAY and returns them all."""
+        while True:
+            time.sleep(SETTLE_DELAY)
+            more: List[str] = self.poll()
+            if not more:
+                return changed
+            changed.extend(path for path in more if path not in changed)
+
+
+class NotifyingWatcher(PollingWatcher):
+    def __init__(self, paths: List[str]):
+        """
+        Detects changes to files from the events watchdog reports for their
+        directories, so nothing is checked while the files are left alone.
+
+        The events only mark files to check: the modification time and size
+        still decide whether a file changed, which filters out the events of
+        files that were only read or touched.
+
+        Keyword Arguments:
+        paths: List[str]  -- the files to watch, as given on the command line
+        """
+        super().__init__(paths)
+        self._event: threading.Event = threading.Event()
+        self._observer = Observer()
+        handler: _EventHandler = _EventHandler(set(self.paths), self._event)
+        for directory in sorted({os.path.dirname(path) for path in self.paths}):
+            self._observer.schedule(handler, directory, recursive=False)
+        self._observer.start()
+
+    def wait(self, timeout: Optional[float] = None) -> List[str]:
+        deadline: Optional[float] = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining: Optional[float] = (
+                None if deadline is None else max(0.0, deadline - time.monotonic())
+            )
+            if not self._event.wait(remaining):
+                return []
+            self._event.clear()
+            changed: List[str] = self.poll()
+            if changed:
+                return self._settle(changed)
+
+    def close(self):
+        self._observer.stop()
+        self._observer.join()
+
+
+class _EventHandler(FileSystemEventHandler):
+    """Flags the events of the watched files, including files moved over them."""
+
+    def __init__(self, paths: Set[str], event: threading.Event):
+        super().__init__()
+        self.paths: Set[str] = paths
+        self.event: threading.Event = event
+
+    def on_any_event(self, event):
+        for path in (event.src_path, getattr(event, "dest_path", "")):
+            if path and os.path.abspath(path) in self.paths:
+                self.event.set()
+
+
+def make_watcher(paths: List[str], interval: float = 0.0) -> PollingWatcher:
+    """
+    Returns a watcher using filesystem notifications if watchdog is installed
+    and `interval` is 0, otherwise one polling the files every `interval`
+    seconds, or every POLL_INTERVAL seconds if it is 0.
+    """
+    if interval <= 0 and Observer is not None:
+        LOGGER.info("Watching {} files with filesystem notifications".format(len(paths)))
+        return NotifyingWatcher(paths)
+    if interval <= 0:
+        LOGGER.info("watchdog is not installed, polling the files for changes")
+        interval = POLL_INTERVAL
+    LOGGER.info("Polling {} files every {} seconds".format(len(paths), interval))
+    return PollingWatcher(paths, interval)
@@ -0,0 +1,7 @@
+extends "res://player.gd".Weapon
+
+var owner_name = "nobody"
+
+
+func describe(prefix := "Weapon", count: int = len(owner_name)) -> String:
+	return prefix + owner_name
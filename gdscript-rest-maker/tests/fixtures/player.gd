@@ -0,0 +1,57 @@
+tool
+extends KinematicBody2D
+class_name Player
+# A character moved by the player.
+#
+# Reads the input actions every physics frame.
+
+# Emitted when the player lands on the floor.
+signal landed
+# Emitted when the health changes.
+signal health_changed(previous, current)
+
+enum State {IDLE, RUN, JUMP = 4}
+enum {LEFT, RIGHT}
+
+# The highest speed, in pixels per second.
+const MAX_SPEED := 400.0
+const START := Vector2(0, 1)
+const SCENE = preload("res://player.tscn")
+
+# The health points left.
+export(int, 0, 10) var health := 10 setget set_health, get_health
+var velocity: Vector2 = Vector2.ZERO
+onready var sprite: Sprite = $Sprite
+var _private = [1, "two"]
+
+
+# Moves the player by `direction`.
+func move(direction: Vector2, speed := 100.0, delta: float = MAX_SPEED * 2) -> void:
+	velocity = direction * speed
+
+
+static func clamp_health(value: int) -> int:
+	return int(clamp(value, 0, 10))
+
+
+remote func sync_position(position = Vector2.ZERO):
+	pass
+
+
+func set_health(value):
+	health = value
+
+
+func get_health():
+	return health
+
+
+# A weapon the player holds.
+class Weapon:
+	extends Reference
+
+	# The damage of one hit.
+	var damage := 5
+
+	func hit(target: Node) -> bool:
+		return true
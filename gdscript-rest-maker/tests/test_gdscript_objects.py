@@ -0,0 +1,63 @@
+"""
+Tests of the class index of GDScriptClasses.
+
+    python -m pytest
+"""
+
+from typing import List
+
+from gdscript2rest.src.gdscript_objects import GDScriptClass, GDScriptClasses
+
+
+def make_class(name: str, extends: str, sub_classes: List[dict] = None) -> dict:
+    return {
+        "name": name,
+        "path": "res://{}.gd".format(name.lower()),
+        "extends_class": [extends],
+        "extends_file": "",
+        "icon": "",
+        "signature": "class " + name,
+        "description": "",
+        "methods": [],
+        "static_functions": [],
+        "members": [],
+        "constants": [],
+        "signals": [],
+        "sub_classes": sub_classes or [],
+    }
+
+
+def make_classes(*data: dict) -> GDScriptClasses:
+    return GDScriptClasses([GDScriptClass.from_dict(entry) for entry in data])
+
+
+def test_top_level_class_wins_over_earlier_inner_class():
+    classes: GDScriptClasses = make_classes(
+        make_class("A", "Node", [make_class("Base", "Reference")]),
+        make_class("Base", "Node2D"),
+        make_class("Child", "Base"),
+    )
+    assert classes.get_class("Base").extends == "Node2D"
+    assert classes.get_class("A.Base").extends == "Reference"
+    assert classes[2].get_extends_tree(classes) == ["Base", "Node2D"]
+
+
+def test_inner_class_found_by_its_own_name():
+    classes: GDScriptClasses = make_classes(
+        make_class("A", "Node", [make_class("Inner", "Reference")]),
+        make_class("Child", "Inner"),
+    )
+    assert classes[1].get_extends_tree(classes) == ["A.Inner", "Reference"]
+
+
+def test_inner_class_ancestors_are_named_after_their_outer_class():
+    by_file: dict = make_class("Sword", "Weapon")
+    by_file["extends_file"] = "res://player.gd"
+    by_name: dict = make_class("Axe", "Player")
+    by_name["extends_class"] = ["Player", "Weapon"]
+    classes: GDScriptClasses = make_classes(
+        make_class("Player", "Node", [make_class("Weapon", "Reference")]), by_file, by_name
+    )
+    assert classes[1].get_extends_tree(classes) == ["Player.Weapon", "Reference"]
+    assert classes[2].extends == "Player.Weapon"
+    assert classes[2].get_extends_tree(classes) == ["Player.Weapon", "Reference"]
@@ -0,0 +1,102 @@
+"""
+Tests of the GDScript parser.  The JSON files of the fixtures directory are
+snapshots of the parser's own output for the scripts next to them, written
+in the format of Godot's generate_script_api but not dumped by Godot: they
+catch regressions, and the other tests check the parts that follow Godot.
+
+    python -m pytest
+"""
+
+import json
+import os
+from typing import Any, Dict, List
+
+import pytest
+
+from gdscript2rest.src.gdscript_parser import parse_script
+
+FIXTURES: str = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def parse_fixture(name: str) -> dict:
+    with open(os.path.join(FIXTURES, name + ".gd")) as script_file:
+        return parse_script(script_file.read(), "res://" + name + ".gd")
+
+
+@pytest.mark.parametrize("name", ["player", "helpers"])
+def test_parse_script_matches_snapshot(name: str):
+    with open(os.path.join(FIXTURES, name + ".json")) as snapshot_file:
+        expected: dict = json.load(snapshot_file)
+    assert parse_fixture(name) == expected
+
+
+def test_header_and_inner_class():
+    gdscript: dict = parse_fixture("player")
+    assert (gdscript["name"], gdscript["extends_class"]) == ("Player", ["KinematicBody2D"])
+    assert gdscript["description"] == (
+        " A character moved by the player.\n\n Reads the input actions every physics frame.\n"
+    )
+    weapon: dict = gdscript["sub_classes"][0]
+    assert (weapon["name"], weapon["extends_class"]) == ("Weapon", ["Reference"])
+    assert weapon["description"] == " A weapon the player holds.\n"
+
+    helpers: dict = parse_fixture("helpers")
+    assert helpers["name"] == ""
+    assert helpers["signature"] == "class helpers.gd"
+    assert (helpers["extends_file"], helpers["extends_class"]) == ("res://player.gd", ["Weapon"])
+
+
+def test_constants_are_ordered_by_name():
+    constants: List[dict] = parse_fixture("player")["constants"]
+    assert [constant["name"] for constant in constants] == [
+        "LEFT", "MAX_SPEED", "RIGHT", "SCENE", "START", "State"
+    ]
+    values: Dict[str, Any] = {constant["name"]: constant["value"] for constant in constants}
+    assert values["State"] == {"IDLE": 0, "RUN": 1, "JUMP": 4}
+    assert (values["LEFT"], values["RIGHT"]) == (0, 1)
+    assert values["START"] == "(0, 1)"
+    assert values["SCENE"] is None
+
+
+def test_members():
+    members: Dict[str, dict] = {
+        member["name"]: member for member in parse_fixture("player")["members"]
+    }
+    health: dict = members["health"]
+    assert (health["setter"], health["getter"], health["export"]) == (
+        "set_health", "get_health", True
+    )
+    assert (health["data_type"], health["default_value"]) == ("int", 10)
+    assert health["description"] == " The health points left.\n"
+    assert (members["velocity"]["data_type"], members["velocity"]["default_value"]) == (
+        "Vector2", None
+    )
+    assert members["_private"]["default_value"] == [1, "two"]
+
+
+def test_functions_and_signals():
+    gdscript: dict = parse_fixture("player")
+    methods: Dict[str, dict] = {method["name"]: method for method in gdscript["methods"]}
+    assert "clamp_health" not in methods
+    assert [function["name"] for function in gdscript["static_functions"]] == ["clamp_health"]
+    assert methods["sync_position"]["rpc_mode"] == 1
+    assert methods["move"]["return_type"] == "null"
+    assert methods["move"]["arguments"][1] == {
+        "name": "speed", "type": "float", "default_value": 100
+    }
+    assert [signal["arguments"] for signal in gdscript["signals"]] == [
+        [], ["previous", "current"]
+    ]
+
+
+def test_non_literal_argument_default_is_kept_as_source():
+    gdscript: dict = parse_script(
+        "extends Node\n\nfunc move(offset = Vector2.ZERO, speed: float = SPEED * 2):\n\tpass\n",
+        "res://mover.gd",
+    )
+    method: dict = gdscript["methods"][0]
+    assert [argument["default_value"] for argument in method["arguments"]] == [
+        "Vector2.ZERO",
+        "SPEED * 2",
+    ]
+    assert method["signature"] == "func move(offset = Vector2.ZERO, speed: float = SPEED * 2)"
@@ -0,0 +1,107 @@
+"""
+Tests of the language server client against the mock language server.
+
+    python -m pytest
+"""
+
+import pytest
+
+from gdscript2rest.src.language_server import (LanguageServerClient,
+                                               LanguageServerError,
+                                               collect_reference, parse_address)
+from gdscript2rest.src.mock_language_server import MockLanguageServer
+
+from .test_gdscript_objects import make_class
+
+
+def make_project(tmp_path, names):
+    (tmp_path / "project.godot").write_text(
+        '[application]\nconfig/name="Game"\nconfig/description="A game"\n'
+    )
+    scripts: dict = {}
+    for name in names:
+        (tmp_path / (name.lower() + ".gd")).write_text("extends Node\n")
+        entry: dict = make_class(name, "Node")
+        scripts[entry["path"]] = entry
+    return scripts
+
+
+def connect(server: MockLanguageServer) -> LanguageServerClient:
+    host, port = parse_address(server.address)
+    return LanguageServerClient(host, port, timeout=5)
+
+
+def test_collect_reference(tmp_path):
+    scripts: dict = make_project(tmp_path, ["Player", "Enemy"])
+    with MockLanguageServer(scripts) as server, connect(server) as client:
+        project, entries = collect_reference(client, str(tmp_path), [], refresh=True)
+    assert project == {"name": "Game", "description": "A game", "version": None}
+    assert [entry["name"] for entry in entries] == ["Enemy", "Player"]
+    methods: list = [method for method, _ in server.requests]
+    assert methods[:2] == ["initialize", "initialized"]
+    assert methods.count("workspace/parse_local_script") == 2
+    assert methods.count("workspace/generate_script_api") == 2
+
+
+def test_script_without_symbols_is_skipped(tmp_path):
+    scripts: dict = make_project(tmp_path, ["Player"])
+    (tmp_path / "unknown.gd").write_text("extends Node\n")
+    with MockLanguageServer(scripts) as server, connect(server) as client:
+        _, entries = collect_reference(client, str(tmp_path), [])
+    assert [entry["name"] for entry in entries] == ["Player"]
+
+
+def test_pipelined_requests_keep_their_order(tmp_path):
+    scripts: dict = make_project(tmp_path, ["Class{}".format(index) for index in range(100)])
+    paths: list = sorted(scripts)
+    with MockLanguageServer(scripts) as server, connect(server) as client:
+        results: list = list(client.request_all("workspace/generate_script_api", paths))
+    assert [result["path"] for result in results] == paths
+
+
+def test_error_response_raises(tmp_path):
+    with MockLanguageServer({}) as server, connect(server) as client:
+        with pytest.raises(LanguageServerError):
+            client.request("workspace/unknown", {})
+
+
+def test_unreachable_server_raises():
+    with MockLanguageServer({}) as server:
+        host, port = parse_address(server.address)
+    with pytest.raises(LanguageServerError):
+        LanguageServerClient(host, port, timeout=1).connect()
+
+
+@pytest.mark.parametrize(
+    "address, expected",
+    [
+        ("", ("127.0.0.1", 6008)),
+        ("6010", ("127.0.0.1", 6010)),
+        ("localhost", ("localhost", 6008)),
+        ("localhost:6010", ("localhost", 6010)),
+        ("::1", ("::1", 6008)),
+        ("[::1]", ("::1", 6008)),
+        ("[::1]:6010", ("::1", 6010)),
+        ("[fe80::1%eth0]:6010", ("fe80::1%eth0", 6010)),
+    ],
+)
+def test_parse_address(address: str, expected: tuple):
+    assert parse_address(address) == expected
+
+
+@pytest.mark.parametrize("address", ["[::1", "[::1]6010", "[::1]:port"])
+def test_parse_invalid_ipv6_address_raises(address: str):
+    with pytest.raises(LanguageServerError):
+        parse_address(address)
+
+
+def test_collect_reference_over_ipv6(tmp_path):
+    scripts: dict = make_project(tmp_path, ["Player"])
+    try:
+        server: MockLanguageServer = MockLanguageServer(scripts, "::1")
+    except OSError:
+        pytest.skip("IPv6 is not available")
+    with server, connect(server) as client:
+        assert server.address.startswith("[::1]:")
+        _, entries = collect_reference(client, str(tmp_path), [])
+    assert [entry["name"] for entry in entries] == ["Player"]
@@ -0,0 +1,81 @@
+"""
+Tests of the resolution of the references written in descriptions and of
+the names of the Sphinx domain directives.
+
+    python -m pytest
+"""
+
+import logging
+from argparse import Namespace
+from io import StringIO
+
+from gdscript2rest.src import make_restructured
+from gdscript2rest.src.convert_to_restructured import _as_restructured
+from gdscript2rest.src.gdscript_objects import GDScriptClasses
+from gdscript2rest.src.gdscript_parser import parse_script
+from gdscript2rest.src.make_restructured import ReferenceResolver, RestructuredDocument
+
+from .test_gdscript_objects import make_class, make_classes
+
+
+def test_reference_links_top_level_class_over_inner_class():
+    resolver: ReferenceResolver = ReferenceResolver(
+        make_classes(
+            make_class("A", "Node", [make_class("Base", "Reference")]),
+            make_class("Base", "Node2D"),
+        )
+    )
+    assert resolver.resolve("See [Base].", "A") == "See :ref:`Base <class_Base>`."
+    assert resolver.resolve("See [A.Base].", "A") == "See :ref:`A.Base <class_A_Base>`."
+
+
+def test_bbcode_tags_are_left_alone(caplog):
+    resolver: ReferenceResolver = ReferenceResolver(make_classes(make_class("A", "Node")))
+    description: str = "[b]Note:[/b] use [code]move()[/code].[br]"
+    with caplog.at_level(logging.WARNING):
+        assert resolver.resolve(description, "A") == description
+    assert caplog.records == []
+
+
+def test_domain_names_inner_class_symbols_after_outer_class():
+    script: str = (
+        "extends Node\nclass_name A\n\n"
+        "class Inner:\n"
+        "\tsignal hit(damage)\n"
+        "\tenum State {IDLE}\n"
+        "\tvar speed := 1\n"
+        "\tfunc move():\n\t\tpass\n"
+    )
+    classes: GDScriptClasses = make_classes(parse_script(script, "res://a.gd"))
+    make_restructured.set_sphinx_domain(True)
+    try:
+        resolver: ReferenceResolver = ReferenceResolver(classes)
+        document: RestructuredDocument = _as_restructured(
+            classes, classes[0], Namespace(), resolver
+        )
+        output: StringIO = StringIO()
+        document.write_to(output)
+        assert resolver.resolve("[Inner.speed]", "A") == (
+            ":gdscript:prop:`Inner.speed <A.Inner.speed>`"
+        )
+    finally:
+        make_restructured.set_sphinx_domain(False)
+    text: str = output.getvalue()
+    for directive in [
+        "class:: A.Inner",
+        "signal:: A.Inner.hit(damage)",
+        "enum:: A.Inner.State",
+        "constant:: A.Inner.IDLE",
+        "property:: A.Inner.speed",
+        "method:: A.Inner.move()",
+    ]:
+        assert ".. gdscript:" + directive in text
+    assert ":gdscript:prop:`speed <A.Inner.speed>`" in text
+    assert ":gdscript:meth:`move <A.Inner.move>`" in text
+    assert "<Inner." not in text and ":: Inner." not in text
+
+
+def test_inner_class_link_uses_section_label():
+    assert make_restructured.make_link("Player.Weapon") == (
+        ":ref:`Player.Weapon <class_Player_Weapon>`"
+    )
@@ -0,0 +1,52 @@
+"""
+Tests of the manifest of the output directory.
+
+    python -m pytest
+"""
+
+import os
+from typing import IO, List
+
+from gdscript2rest.src.manifest import Manifest
+
+
+class Document:
+    """The part of a RestructuredDocument the manifest uses."""
+
+    def __init__(self, name: str):
+        self.name: str = name
+
+    def get_filename(self) -> str:
+        return self.name + ".rst"
+
+    def write_to(self, file_out: IO[str]):
+        file_out.write(self.name)
+
+
+def run(dirpath: str, source: str, names: List[str]) -> List[str]:
+    """Renders the classes `names` read from `source` and returns the removed files."""
+    manifest: Manifest = Manifest.load(dirpath)
+    for name in names:
+        if not manifest.is_unchanged(name, name + "-key", source):
+            manifest.save_document(Document(name))
+    stale: List[str] = manifest.remove_stale()
+    manifest.save()
+    return stale
+
+
+def test_other_input_keeps_its_files(tmp_path):
+    dirpath: str = str(tmp_path)
+    run(dirpath, "a.json", ["A1", "A2"])
+    assert run(dirpath, "b.json", ["B1"]) == []
+    assert sorted(os.listdir(dirpath)) == [".gdscript2rest-manifest.json", "A1.rst", "A2.rst", "B1.rst"]
+    # The files of a.json are still recorded, so its classes are skipped.
+    manifest: Manifest = Manifest.load(dirpath)
+    assert manifest.is_unchanged("A1", "A1-key", "a.json")
+
+
+def test_class_removed_from_its_input_is_removed(tmp_path):
+    dirpath: str = str(tmp_path)
+    run(dirpath, "a.json", ["A1", "A2"])
+    run(dirpath, "b.json", ["B1"])
+    assert run(dirpath, "a.json", ["A1"]) == ["A2.rst"]
+    assert sorted(os.listdir(dirpath)) == [".gdscript2rest-manifest.json", "A1.rst", "B1.rst"]
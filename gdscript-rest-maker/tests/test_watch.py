@@ -0,0 +1,93 @@
+"""
+Tests of the watchers of the --watch option on a temporary directory.
+
+    python -m pytest
+"""
+
+import os
+import threading
+
+import pytest
+
+from gdscript2rest.src import watch
+from gdscript2rest.src.json_stream import SHARD_MANIFEST
+from gdscript2rest.src.watch import PollingWatcher, make_watcher
+
+
+def write(path: str, text: str, mtime: int):
+    with open(path, "w") as output:
+        output.write(text)
+    os.utime(path, (mtime, mtime))
+
+
+def test_poll_reports_changed_files_once(tmp_path):
+    first: str = str(tmp_path / "a.json")
+    second: str = str(tmp_path / "b.json")
+    write(first, "{}", 1000)
+    write(second, "{}", 1000)
+    watcher: PollingWatcher = PollingWatcher([first, second], 0.01)
+    assert watcher.poll() == []
+    write(second, '{"a": 1}', 2000)
+    assert watcher.poll() == [second]
+    assert watcher.poll() == []
+
+
+def test_poll_reports_created_and_removed_files(tmp_path):
+    path: str = str(tmp_path / "a.json")
+    watcher: PollingWatcher = PollingWatcher([path], 0.01)
+    write(path, "{}", 1000)
+    assert watcher.poll() == [path]
+    os.remove(path)
+    assert watcher.poll() == [path]
+
+
+def test_shard_directory_is_watched_through_its_manifest(tmp_path):
+    write(str(tmp_path / SHARD_MANIFEST), "{}", 1000)
+    watcher: PollingWatcher = PollingWatcher([str(tmp_path)], 0.01)
+    write(str(tmp_path / "shard.json"), "{}", 2000)
+    assert watcher.poll() == []
+    write(str(tmp_path / SHARD_MANIFEST), '{"shards": []}', 2000)
+    assert watcher.poll() == [str(tmp_path)]
+
+
+def test_wait_times_out_without_changes(tmp_path):
+    path: str = str(tmp_path / "a.json")
+    write(path, "{}", 1000)
+    assert PollingWatcher([path], 0.01).wait(timeout=0.05) == []
+
+
+def test_wait_returns_settled_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(watch, "SETTLE_DELAY", 0.01)
+    path: str = str(tmp_path / "a.json")
+    write(path, "{}", 1000)
+    watcher: PollingWatcher = PollingWatcher([path], 0.01)
+    timer: threading.Timer = threading.Timer(0.05, write, (path, '{"a": 1}', 2000))
+    timer.start()
+    try:
+        assert watcher.wait(timeout=5) == [path]
+    finally:
+        timer.join()
+
+
+def test_make_watcher_polls_with_an_interval(tmp_path):
+    watcher: PollingWatcher = make_watcher([str(tmp_path / "a.json")], 0.25)
+    assert type(watcher) is PollingWatcher
+    assert watcher.interval == 0.25
+    watcher.close()
+
+
+def test_make_watcher_without_interval(tmp_path, monkeypatch):
+    monkeypatch.setattr(watch, "SETTLE_DELAY", 0.01)
+    path: str = str(tmp_path / "a.json")
+    write(path, "{}", 1000)
+    watcher: PollingWatcher = make_watcher([path])
+    try:
+        if watch.Observer is None:
+            assert watcher.interval == watch.POLL_INTERVAL
+            pytest.skip("watchdog is not installed")
+        timer: threading.Timer = threading.Timer(0.1, write, (path, '{"a": 1}', 2000))
+        timer.start()
+        assert watcher.wait(timeout=5) == [path]
+        timer.join()
+    finally:
+        watcher.close()
@@ -29,6 +29,9 @@ if %1 == -i            goto help
 if %1 == --make-index  goto help
 if %1 == --dry-run     goto help
 if %1 == --doc-version goto help
+if %1 == --cache-dir   goto help
+if %1 == -s            goto help
+if %1 == --shards      goto help
 if %1 == -V            goto help
 if %1 == --version     goto help
 
@@ -59,7 +62,7 @@ goto tail
 echo.
 echo Creates and parses reference documentation for a GDScript based projects.
 echo.
-echo generate_reference $Path [-p dest] [-v] [--dry-run] [-i] [-V] [--doc-version]
+echo generate_reference $Path [-p dest] [-v] [--dry-run] [-i] [-V] [--doc-version] [--cache-dir dir] [-s]
 echo.
 echo   $Path  The path to the Godot project.    
 echo.
@@ -81,6 +84,15 @@ echo.
 echo   --doc-version       Set the version number shown in the documentation.  Defaults to
 echo                       0.0.0 (currently Godot does not output a version number).
 echo.
+echo   --cache-dir dir     Directory to cache the symbols of each script and the classes
+echo                       built from reference.json in.  Unchanged scripts are not parsed
+echo                       again by Godot on the next run.  Symbols of scripts that are
+echo                       not part of the run are removed.
+echo.
+echo   -s --shards         Save the reference as a directory of compact JSON files, one per
+echo                       script, instead of reference.json.  gdscript2rest decodes the
+echo                       files in parallel.
+echo.
 goto end
 
 :no-godot
@@ -103,6 +115,11 @@ echo Collector failed to produce a reference.json object. Check scripts for erro
 echo.
 goto end
 
+:no-shards
+echo Collector failed to produce %GDSCRIPT2REST_SHARD_DIR%\project.json. Check scripts for errors.
+echo.
+goto end
+
 :tail
 set gdscript_path=godot-scripts
 set gdscript_1=ReferenceCollectorCLI.gd
@@ -113,6 +130,14 @@ set gdscript_2=Collector.gd
 copy /Y "%gdscript_path%\%gdscript_1%" "%project_path%\%gdscript_1%" > nul
 copy /Y "%gdscript_path%\%gdscript_2%" "%project_path%\%gdscript_2%" > nul
 
+::Shards are written straight to the output directory, so unchanged shards
+::keep their modification time from one run to the next
+set GDSCRIPT2REST_SHARD_DIR=
+if defined use_shards (
+   if not exist %output_path% mkdir %output_path%
+   set GDSCRIPT2REST_SHARD_DIR=%output_path:"=%\reference
+)
+
 echo Generating reference...
 
 ::Run godot in editor mode and runs the collector script
@@ -124,6 +149,7 @@ erase /Q "%project_path%\%gdscript_1%"
 erase /Q "%project_path%\%gdscript_2%"
 
 ::Check for json
+if defined use_shards goto check-shards
 if not exist "%project_path%\reference.json" goto no-json
 
 if not exist %output_path% mkdir %output_path%
@@ -132,7 +158,14 @@ echo moving reference.json from %project_path% to %output_path%
 
 :: Don't leave it cluttering the project, move it to the output directory
 move "%project_path%\reference.json" %output_path%\reference.json
+set reference_file=%output_path%\reference.json
+goto generate
 
+:check-shards
+if not exist "%GDSCRIPT2REST_SHARD_DIR%\project.json" goto no-shards
+set reference_file="%GDSCRIPT2REST_SHARD_DIR%"
+
+:generate
 echo Done.
 echo Generating output...
 
@@ -144,7 +177,7 @@ if not [%output_path%] == [] (
 
 echo sending output to !reference_path!
 
-set python_string=python -m gdscript2rest %output_path%\reference.json
+set python_string=python -m gdscript2rest %reference_file%
 
 for /l %%n in (0,1,%param_n%) do (
    if not [!parameters[%%n].option!] == [] (
@@ -174,6 +207,7 @@ goto end
    if %~1 == -p               goto parameterized
    if %~1 == --path           goto parameterized
    if %~1 == --doc-version    goto parameterized
+   if %~1 == --cache-dir      goto parameterized
 
    if %~1 == -i               goto flags
    if %~1 == --make-index     goto flags
@@ -181,6 +215,8 @@ goto end
    if %~1 == -v               goto flags
    if %~1 == -vv              goto flags
    if %~1 == --verbose        goto flags
+   if %~1 == -s               goto shards
+   if %~1 == --shards         goto shards
 
    ::Parameter for parameterized argument
    if %param_arg% == 0 (
@@ -191,6 +227,7 @@ goto end
 
    if !parameters[%param_n%].option! == -p set output_path="%~f1"
    if !parameters[%param_n%].option! == --path set output_path="%~f1"
+   if !parameters[%param_n%].option! == --cache-dir set GDSCRIPT2REST_CACHE_DIR=%~f1
 
    set parameters[!param_n!].param=%~1
    set /A param_n+=1
@@ -236,6 +273,15 @@ goto end
    set /A flag_n+=1
    goto sub_end
 
+   ::Read by this script only, not passed on to gdscript2rest
+   :shards
+   if %param_arg% == 1 (
+      echo Incomplete parameter before %1 flag.
+      goto sub_error
+   )
+   set use_shards=1
+   goto sub_end
+
    :sub_error
    exit /b 1
 
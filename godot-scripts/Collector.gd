@@ -2,6 +2,13 @@ tool
 extends SceneTree
 # Finds and generates a code reference from gdscript files.
 
+# Bump when the format of the cached symbols changes.
+const CACHE_VERSION := 1
+# Extension of the files holding the cached symbols of a script.
+const CACHE_EXTENSION := ".symbols"
+# Name of the manifest of a shard directory.
+const SHARD_MANIFEST := "project.json"
+
 
 # Returns a list of file paths found in the directory.
 #
@@ -74,7 +81,16 @@ func save_text(path := "", content := "") -> void:
 # code reference data.
 #
 # If `refresh_cache` is true, will refresh Godot's cache and get fresh symbols.
-func get_reference(files := PoolStringArray(), refresh_cache := false) -> Dictionary:
+#
+# If `cache_dirpath` is set, the symbols of each script are saved in that
+# directory, and scripts that did not change since a previous run are read back
+# from it instead of being parsed again. It can be outside of the project, for
+# example a directory shared between CI runs. Entries that were not used by the
+# run are removed at the end, so the directory only holds the current scripts:
+# projects sharing a cache should each use their own directory.
+func get_reference(
+	files := PoolStringArray(), refresh_cache := false, cache_dirpath := ""
+) -> Dictionary:
 	var data := {
 		name = ProjectSettings.get_setting("application/config/name"),
 		description = ProjectSettings.get_setting("application/config/description"),
@@ -82,17 +98,196 @@ func get_reference(files := PoolStringArray(), refresh_cache := false) -> Dictio
 		classes = []
 	}
 	var workspace = Engine.get_singleton('GDScriptLanguageProtocol').get_workspace()
+	var cached_count := 0
+	var cache_files := []
 	for file in files:
 		if not file.ends_with(".gd"):
 			continue
-		if refresh_cache:
-			workspace.parse_local_script(file)
-		var symbols: Dictionary = workspace.generate_script_api(file)
+		var cache_path := ""
+		var symbols = null
+		if cache_dirpath:
+			cache_path = cache_dirpath.plus_file(get_cache_key(file) + CACHE_EXTENSION)
+			cache_files.append(cache_path.get_file())
+			symbols = load_cached_symbols(cache_path)
+		if symbols == null:
+			if refresh_cache:
+				workspace.parse_local_script(file)
+			symbols = workspace.generate_script_api(file)
+			if cache_path:
+				save_cached_symbols(cache_path, symbols)
+		else:
+			cached_count += 1
 		if symbols["name"] == "":
 			symbols["name"] = file.get_file()
 		data["classes"].append(symbols)
+	if cache_dirpath:
+		print(
+			"Read %d of %d scripts from the cache in %s"
+			% [cached_count, data["classes"].size(), cache_dirpath]
+		)
+		prune_cached_symbols(cache_dirpath, cache_files)
 	return data
 
 
+# Returns the key of the cached symbols of a script: a hash of its path, its
+# content, the Godot version and the cache format. The symbols Godot generates
+# for a script only depend on the script itself, so nothing else is hashed.
+func get_cache_key(path: String) -> String:
+	var file := File.new()
+	var godot_version: String = Engine.get_version_info()["string"]
+	return (
+		"%s:%s:%s:%d" % [path, file.get_sha256(path), godot_version, CACHE_VERSION]
+	).sha256_text()
+
+
+# Returns the symbols cached at `path`, or null if there is no valid entry.
+func load_cached_symbols(path: String):
+	var file := File.new()
+	if not file.file_exists(path):
+		return null
+	if not file.open(path, File.READ) == OK:
+		printerr("Could not open the cache entry %s" % path)
+		return null
+	var symbols = file.get_var()
+	file.close()
+	if not symbols is Dictionary or not symbols.has("name"):
+		printerr("Ignoring the invalid cache entry %s" % path)
+		return null
+	return symbols
+
+
+# Saves the symbols of a script to `path`. They are written to a temporary file
+# first, so an interrupted run never leaves a truncated entry.
+func save_cached_symbols(path: String, symbols: Dictionary) -> void:
+	var directory := Directory.new()
+	if not directory.dir_exists(path.get_base_dir()):
+		directory.make_dir_recursive(path.get_base_dir())
+
+	var temporary_path := "%s.%d.tmp" % [path, OS.get_process_id()]
+	var file := File.new()
+	if not file.open(temporary_path, File.WRITE) == OK:
+		printerr("Couldn't save the cache entry %s" % path)
+		return
+	file.store_var(symbols)
+	file.close()
+	if not directory.rename(temporary_path, path) == OK:
+		printerr("Couldn't save the cache entry %s" % path)
+		directory.remove(temporary_path)
+
+
+# Removes the cached symbols in `dirpath` that are not in `used_files`. The key
+# of a script changes with each edit, so without this every version of every
+# script would stay in the cache. Only files with the cache extension are removed.
+func prune_cached_symbols(dirpath: String, used_files: Array) -> void:
+	var directory := Directory.new()
+	if not directory.open(dirpath) == OK:
+		return
+	var stale_files := []
+	directory.list_dir_begin(true, true)
+	var file_name := directory.get_next()
+	while file_name != "":
+		if (
+			not directory.current_is_dir()
+			and file_name.ends_with(CACHE_EXTENSION)
+			and not file_name in used_files
+		):
+			stale_files.append(file_name)
+		file_name = directory.get_next()
+	directory.list_dir_end()
+
+	for stale_file in stale_files:
+		directory.remove(stale_file)
+	if not stale_files.empty():
+		print("Removed %d unused entries from the cache in %s" % [stale_files.size(), dirpath])
+
+
 func print_pretty_json(reference: Dictionary) -> String:
 	return JSON.print(reference, "  ")
+
+
+# Saves the reference as a shard directory: one compact JSON file per script,
+# plus a manifest holding the project information and the list of shards in
+# order. gdscript2rest decodes the shards in parallel, and only reads again the
+# shards that changed when watching the directory.
+#
+# Shards whose content did not change are not rewritten, shards of scripts that
+# no longer exist are removed, and the manifest is always written last. Only the
+# shards listed by the previous manifest are ever removed, so other files in the
+# directory are left alone.
+func save_shards(dirpath := "", reference := {}) -> void:
+	var directory := Directory.new()
+	if not directory.dir_exists(dirpath):
+		directory.make_dir_recursive(dirpath)
+	var previous_shards := get_previous_shards(dirpath)
+
+	var manifest := {}
+	for key in reference:
+		if key != "classes":
+			manifest[key] = reference[key]
+	var shards := []
+	var written_count := 0
+	for symbols in reference["classes"]:
+		var shard := get_shard_name(symbols)
+		shards.append(shard)
+		if save_text_if_changed(dirpath.plus_file(shard), JSON.print(symbols)):
+			written_count += 1
+	manifest["shards"] = shards
+
+	for shard in previous_shards:
+		if not shard in shards:
+			directory.remove(dirpath.plus_file(shard))
+
+	save_text(dirpath.plus_file(SHARD_MANIFEST), JSON.print(manifest))
+	print("Wrote %d of %d shards to %s" % [written_count, shards.size(), dirpath])
+
+
+# Returns the shards listed by the manifest in `dirpath`, keeping only plain
+# .json file names so a hand-edited manifest can't point outside the directory.
+func get_previous_shards(dirpath: String) -> Array:
+	var file := File.new()
+	var manifest_path := dirpath.plus_file(SHARD_MANIFEST)
+	if not file.file_exists(manifest_path) or not file.open(manifest_path, File.READ) == OK:
+		return []
+	var parsed := JSON.parse(file.get_as_text())
+	file.close()
+	if not parsed.error == OK or not parsed.result is Dictionary:
+		return []
+	var listed_shards = parsed.result.get("shards", [])
+	if not listed_shards is Array:
+		return []
+	var previous_shards := []
+	for shard in listed_shards:
+		if (
+			shard is String
+			and shard == shard.get_file()
+			and shard.ends_with(".json")
+			and shard != SHARD_MANIFEST
+		):
+			previous_shards.append(shard)
+	return previous_shards
+
+
+# Returns the file name of the shard of a script: its file name followed by a
+# hash of its path, so scripts with the same name in different directories get
+# different shards.
+func get_shard_name(symbols: Dictionary) -> String:
+	var path: String = symbols.get("path", symbols["name"])
+	return "%s-%s.json" % [path.get_file().get_basename(), path.md5_text().substr(0, 8)]
+
+
+# Saves text to a file unless it already has that content, and returns true if
+# the file was written.
+func save_text_if_changed(path: String, content: String) -> bool:
+	var file := File.new()
+	if file.file_exists(path) and file.open(path, File.READ) == OK:
+		var is_unchanged := file.get_as_text() == content
+		file.close()
+		if is_unchanged:
+			return false
+
+	if not file.open(path, File.WRITE) == OK:
+		printerr("Couldn't save %s" % path)
+		return false
+	file.store_string(content)
+	file.close()
+	return true
@@ -20,11 +20,20 @@ var is_recursive: = true
 var patterns := ["*.gd"]
 # Output path to save the class reference.
 var save_path := "res://reference.json"
+# Directory to cache the symbols of each script in, so unchanged scripts are not
+# parsed again on the next run. Leave empty to disable the cache.
+var cache_directory := ""
+# If set, save the reference to this directory as compact per-script JSON
+# shards instead of to `save_path`.
+var shard_directory := ""
 
 
 func _run() -> void:
 	var files := PoolStringArray()
 	for dirpath in directories:
 		files.append_array(Collector.find_files(dirpath, patterns, is_recursive))
-	var json: String = Collector.print_pretty_json(Collector.get_reference(files))
-	Collector.save_text(save_path, json)
+	var reference: Dictionary = Collector.get_reference(files, false, cache_directory)
+	if shard_directory:
+		Collector.save_shards(shard_directory, reference)
+	else:
+		Collector.save_text(save_path, Collector.print_pretty_json(reference))
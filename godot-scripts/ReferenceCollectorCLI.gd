@@ -10,6 +10,14 @@ var directories := ["res://"]
 var is_recursive: = true
 # A list of patterns to filter files.
 var patterns := ["*.gd"]
+# Directory to cache the symbols of each script in, so unchanged scripts are not
+# parsed again. Read from the GDSCRIPT2REST_CACHE_DIR environment variable if
+# empty. Caching is disabled if both are empty.
+var cache_directory := ""
+# Directory to save the reference to as compact per-script JSON shards, instead
+# of res://reference.json. Read from the GDSCRIPT2REST_SHARD_DIR environment
+# variable if empty.
+var shard_directory := ""
 
 
 func _init() -> void:
@@ -18,5 +26,12 @@ func _init() -> void:
 		if dirpath != "res://":
 			dirpath = "res://" + dirpath
 		files.append_array(Collector.find_files(dirpath, patterns, is_recursive))
-	var json: String = Collector.print_pretty_json(Collector.get_reference(files))
-	Collector.save_text("res://reference.json", json)
+	if not cache_directory:
+		cache_directory = OS.get_environment("GDSCRIPT2REST_CACHE_DIR")
+	if not shard_directory:
+		shard_directory = OS.get_environment("GDSCRIPT2REST_SHARD_DIR")
+	var reference: Dictionary = Collector.get_reference(files, false, cache_directory)
+	if shard_directory:
+		Collector.save_shards(shard_directory, reference)
+	else:
+		Collector.save_text("res://reference.json", Collector.print_pretty_json(reference))